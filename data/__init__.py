@@ -1,4 +1,11 @@
+""" Lazy exports: importing a data submodule doesn't pull in the API handlers """
 
-from .api_handlers.open_weather_api import OpenWeatherAPI
 
-__all__ = ['OpenWeatherAPI']
\ No newline at end of file
+def __getattr__(name):
+    if name == 'OpenWeatherAPI':
+        from .api_handlers.open_weather_api import OpenWeatherAPI
+        return OpenWeatherAPI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['OpenWeatherAPI']
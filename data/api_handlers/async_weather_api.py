@@ -0,0 +1,223 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+import aiohttp
+
+from data.gazetteer import get_gazetteer
+from data.api_handlers.current_weather_cache import get_current_weather_cache
+from data.api_handlers.geocode_cache import GEOCODING_URL, get_geocode_cache
+from data.api_handlers.meteo_query import MeteoQuery
+from data.api_handlers.open_meteo_api import HISTORY_DAILY, TREND_DAILY, TREND_PAST_DAYS
+from data.api_handlers.open_weather_api import OpenWeatherAPI
+from data.api_handlers.settings import settings
+from data.api_handlers.rate_limiter import OPENWEATHER, get_rate_limiter, provider_for_url
+from data.api_handlers.circuit_breaker import get_breaker
+
+
+""" Asyncio versions of the OpenWeather/Open-Meteo fetches for many cities at once. Same (data, error) returns as the sync handlers """
+
+DEFAULT_CONCURRENCY = 20
+DEFAULT_TIMEOUT = 10
+
+
+class AsyncWeatherClient:
+    """
+    aiohttp client, use as `async with AsyncWeatherClient() as client:`.
+    cancel: threading.Event that ends every rate limit wait, fetches still waiting return an error
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, cancel=None):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.cancel = cancel
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.max_concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    async def _get_json(self, url, params):
+        """GET under the concurrency limit and the shared rate limiter, returns (status, json or None), status None when rate limited or cancelled"""
+        target = provider_for_url(f"{url}?{urlencode(params)}")
+        if target:
+            provider, api_key, calls = target
+            # Paced like the sync bulk jobs, waiting happens off the event loop
+            if not await asyncio.to_thread(get_rate_limiter().acquire, provider, api_key, calls, cancel=self.cancel):
+                return None, None    # never sent, not a provider answer
+
+        async with self._semaphore:
+            async with self.session.get(url, params=params) as response:
+                if target:
+                    get_rate_limiter().record(provider, api_key, calls)
+                if response.status != 200:
+                    return response.status, None
+                return response.status, await response.json(content_type=None)
+
+    @staticmethod
+    def _query_params(params):
+        """aiohttp wants flat string params, Open-Meteo takes comma separated lists"""
+        return {key: ",".join(str(v) for v in value) if isinstance(value, (list, tuple)) else str(value)
+                for key, value in params.items()}
+
+    async def fetch_current_weather(self, select_city):
+        """
+        OpenWeather current conditions in canonical form (English). Bulk call like
+        OpenWeatherAPI.fetch_open_weather(bulk=True): primary key only, through its circuit breaker
+        """
+        if not select_city or not select_city.strip():
+            return None, "City name cannot be empty"
+        api_key = settings.weather_api_key
+        if not api_key:
+            return None, "Weather API key not configured"
+
+        select_city = select_city.strip()
+        cache = get_current_weather_cache()
+        cached = cache.get(select_city)
+        if cached is not None:
+            return cached, None
+
+        breaker = get_breaker(OPENWEATHER, api_key)
+        if not breaker.allow():
+            return None, "Weather service unavailable. Please try again later."
+
+        outcome = None      # (ok, latency) once the provider answered or failed, as in _request_current
+        started = time.monotonic()
+        try:
+            params = {**OpenWeatherAPI._location_params(select_city), "appid": api_key, "units": "metric"}
+            status, weather_json_data = await self._get_json(settings.weather_url, params)
+            if status is not None:
+                outcome = (status != 401 and status not in (500, 502, 503, 504), time.monotonic() - started)
+
+            if status == 200:
+                if 'main' not in weather_json_data or 'weather' not in weather_json_data:
+                    return None, "Invalid weather data format received"
+                cache.put(select_city, weather_json_data)
+                return weather_json_data, None
+            if status == 404:
+                return None, f"City '{select_city}' not found. Please check the spelling or try a nearby major city."
+            if status is None and self.cancel is not None and self.cancel.is_set():
+                return None, "Cancelled"
+            if status in (None, 429):
+                return None, "API rate limit exceeded. Please try again later."
+            if status == 401:
+                return None, "Weather API key rejected"
+            return None, f"Weather service error (Code: {status}). Please try again later."
+        except asyncio.TimeoutError:
+            outcome = (False, time.monotonic() - started)
+            return None, "Request timed out. Please check your internet connection and try again."
+        except aiohttp.ClientError as e:
+            outcome = (False, time.monotonic() - started)
+            return None, f"Network error occurred: {str(e)}"
+        except Exception as e:
+            return None, f"Unexpected error: {str(e)}"
+        finally:
+            if outcome is None:
+                breaker.release()
+            else:
+                breaker.record(*outcome)
+
+    async def geocode(self, city_name, language="en"):
+        """(lat, lon) from gazetteer, then geocode cache, then network. (None, None) if unknown"""
+        if not city_name or not city_name.strip():
+            return None, None
+
+        place = get_gazetteer().resolve(city_name)
+        if place:
+            return place['latitude'], place['longitude']
+
+        cache = get_geocode_cache()
+        cached = cache.get(city_name, language)
+        if cached is not None:
+            return cached
+
+        try:
+            params = {"name": city_name.strip(), "count": 1, "language": language, "format": "json"}
+            status, data = await self._get_json(GEOCODING_URL, params)
+            if status != 200:
+                return None, None
+
+            if data.get('results'):
+                lat, lon = data['results'][0]['latitude'], data['results'][0]['longitude']
+            else:
+                lat, lon = None, None
+            cache.put(city_name, lat, lon, language)
+            return lat, lon
+        except Exception:
+            return None, None
+
+    async def fetch_query(self, select_city, query):
+        """Run a MeteoQuery, same ({section: MeteoColumns}, error) as OpenMeteoAPI.fetch_query"""
+        try:
+            lat, lon = await self.geocode(select_city)
+            if not lat or not lon:
+                return None, f"City {select_city} not found."
+
+            params = query.params()
+            params.update({"latitude": lat, "longitude": lon, "timezone": query.timezone or "GMT"})
+            status, data = await self._get_json(query.url, self._query_params(params))
+            if status is None:
+                return None, "API rate limit exceeded. Please try again later."
+            if status != 200:
+                return None, f"Open-Meteo service error (Code: {status})"
+
+            return query.decode_json(data, select_city, lat, lon), None
+        except Exception as e:
+            return None, str(e)
+
+    async def fetch_forecast_and_trend(self, select_city):
+        """Same MeteoColumns as OpenMeteoAPI.meteo_forecast_and_trend (5 past days + forecast)"""
+        result, error = await self.fetch_query(select_city, MeteoQuery.forecast(daily=TREND_DAILY, past_days=TREND_PAST_DAYS))
+        return (result['daily'], None) if result else (None, error)
+
+    async def fetch_historical_range(self, select_city, start_date, end_date):
+        """Same range_data as OpenMeteoAPI.fetch_historical_range"""
+        yesterday = datetime.today().date() - timedelta(days=1)
+        end_date = min(end_date, yesterday)
+        if start_date > end_date:
+            return None, "Use OpenWeatherAPI for current/future dates"
+
+        result, error = await self.fetch_query(select_city, MeteoQuery.archive(start_date, end_date, daily=HISTORY_DAILY))
+        return (result['daily'], None) if result else (None, error)
+
+    async def gather(self, fetch, cities, *args):
+        """Run fetch(city, *args) for every city concurrently, returns {city: (data, error)}"""
+        cities = list(dict.fromkeys(cities))
+        results = await asyncio.gather(*(fetch(city, *args) for city in cities), return_exceptions=True)
+        return {
+            city: (None, str(result)) if isinstance(result, BaseException) else result
+            for city, result in zip(cities, results)
+        }
+
+
+""" Sync wrappers for existing (non-async) callers. Do not call from inside a running event loop """
+
+def _run(fetch_name, cities, *args, max_concurrency=DEFAULT_CONCURRENCY, cancel=None):
+    async def _gather():
+        async with AsyncWeatherClient(max_concurrency=max_concurrency, cancel=cancel) as client:
+            return await client.gather(getattr(client, fetch_name), cities, *args)
+    return asyncio.run(_gather())
+
+
+def fetch_current_weather_many(cities, max_concurrency=DEFAULT_CONCURRENCY, cancel=None):
+    """{city: (weather_data, error)}, used by features.alerts.sweep_alert_cities"""
+    return _run("fetch_current_weather", cities, max_concurrency=max_concurrency, cancel=cancel)
+
+
+def fetch_forecast_and_trend_many(cities, max_concurrency=DEFAULT_CONCURRENCY):
+    return _run("fetch_forecast_and_trend", cities, max_concurrency=max_concurrency)
+
+
+def fetch_query_many(cities, query, max_concurrency=DEFAULT_CONCURRENCY):
+    return _run("fetch_query", cities, query, max_concurrency=max_concurrency)
+
+
+def fetch_historical_range_many(cities, start_date, end_date, max_concurrency=DEFAULT_CONCURRENCY):
+    return _run("fetch_historical_range", cities, start_date, end_date, max_concurrency=max_concurrency)
@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import time
+
+from data.api_handlers.cache_policy import STALE_WHILE_REVALIDATE
+from data.api_handlers.http_client import CACHE_NAME, cache_stats
+
+
+""" Keeps the .cache HTTP cache database bounded: TTL + LRU eviction, periodic VACUUM, size/hit-rate summary """
+
+MAX_CACHE_SIZE_MB = 50
+VACUUM_INTERVAL = 24 * 3600
+
+
+class CacheMaintenance:
+    def __init__(self, db_path=f"{CACHE_NAME}.sqlite", max_size_mb=MAX_CACHE_SIZE_MB,
+                 expired_grace=STALE_WHILE_REVALIDATE, vacuum_interval=VACUUM_INTERVAL):
+        self.db_path = db_path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.expired_grace = expired_grace
+        self.vacuum_interval = vacuum_interval
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("CREATE TABLE IF NOT EXISTS cache_access (key TEXT PRIMARY KEY, last_access REAL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache_maintenance (name TEXT PRIMARY KEY, value REAL)")
+        return conn
+
+    @staticmethod
+    def last_vacuum(conn):
+        """Time of the last VACUUM, kept in the cache database so restarts and other processes see it"""
+        row = conn.execute("SELECT value FROM cache_maintenance WHERE name = 'last_vacuum'").fetchone()
+        return row[0] if row else 0
+
+    def size_bytes(self):
+        """Database size on disk, WAL included"""
+        return sum(os.path.getsize(path) for path in (self.db_path, f"{self.db_path}-wal") if os.path.exists(path))
+
+    def _record_access_times(self, conn):
+        """Persist last access times gathered by the shared cached session since the last run"""
+        access_times = cache_stats.pop_access_times()
+        conn.executemany(
+            "INSERT OR REPLACE INTO cache_access (key, last_access) VALUES (?, ?)",
+            access_times.items()
+        )
+
+    def _delete(self, conn, keys):
+        for table in ("responses", "redirects", "cache_access"):
+            column = "value" if table == "redirects" else "key"
+            conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", ((key,) for key in keys))
+
+    def remove_expired(self, conn):
+        """
+        Drop responses expired for longer than the stale-while-revalidate window.
+        Entries without an expiry (archive data) are only removed by the size cap.
+        """
+        cutoff = int(time.time() - self.expired_grace)
+        keys = [row[0] for row in conn.execute(
+            "SELECT key FROM responses WHERE expires IS NOT NULL AND expires < ?", (cutoff,)
+        )]
+        self._delete(conn, keys)
+        return len(keys)
+
+    def evict_to_size(self, conn):
+        """Least recently used responses first until the stored bodies fit the size cap"""
+        rows = conn.execute(
+            "SELECT r.key, length(r.value), COALESCE(a.last_access, 0) "
+            "FROM responses r LEFT JOIN cache_access a ON a.key = r.key"
+        ).fetchall()
+
+        total = sum(size or 0 for _, size, _ in rows)
+        if total <= self.max_size_bytes:
+            return 0
+
+        evicted = []
+        for key, size, _ in sorted(rows, key=lambda row: row[2]):
+            if total <= self.max_size_bytes:
+                break
+            evicted.append(key)
+            total -= size or 0
+
+        self._delete(conn, evicted)
+        return len(evicted)
+
+    def run(self):
+        """One maintenance pass, returns the summary dict"""
+        if not os.path.exists(self.db_path):
+            return self.summary()
+
+        conn = self._connect()
+        try:
+            with conn:
+                self._record_access_times(conn)
+                expired = self.remove_expired(conn)
+                evicted = self.evict_to_size(conn)
+
+            vacuum_due = time.time() - self.last_vacuum(conn) >= self.vacuum_interval
+            if expired or evicted or vacuum_due:
+                conn.execute("VACUUM")
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO cache_maintenance (name, value) VALUES ('last_vacuum', ?)", (time.time(),))
+        finally:
+            conn.close()
+
+        summary = self.summary()
+        summary['expired_removed'] = expired
+        summary['evicted'] = evicted
+        print(f"HTTP cache: {summary['entries']} entries, {summary['size_mb']:.1f} MB, "
+              f"hit rate {summary['hit_rate']:.0%}, removed {expired} expired / {evicted} LRU")
+        return summary
+
+    def summary(self):
+        """Size and hit-rate report for the HTTP cache"""
+        entries = 0
+        if os.path.exists(self.db_path):
+            try:
+                conn = sqlite3.connect(self.db_path, timeout=30)
+                try:
+                    entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                finally:
+                    conn.close()
+            except sqlite3.Error:
+                pass
+
+        return {
+            'entries': entries,
+            'size_mb': self.size_bytes() / (1024 * 1024),
+            'max_size_mb': self.max_size_bytes / (1024 * 1024),
+            'hits': cache_stats.hits,
+            'misses': cache_stats.misses,
+            'hit_rate': cache_stats.hit_rate()
+        }
+
+
+def run_cache_maintenance():
+    """Scheduler entry point"""
+    try:
+        return CacheMaintenance().run()
+    except Exception as e:
+        print(f"Error maintaining HTTP cache: {e}")
+        return None
@@ -0,0 +1,72 @@
+import zlib
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlparse
+
+from requests_cache import NEVER_EXPIRE
+from requests_cache.serializers import SerializerPipeline, Stage, pickle_serializer
+
+
+""" Expiry policy for the requests_cache database, by URL pattern (first match wins) """
+
+FORECAST_TTL = 3600                     # forecasts are re-run hourly
+CURRENT_WEATHER_TTL = 600               # OpenWeather updates current conditions about every 10 minutes
+GEOCODING_TTL = 30 * 24 * 3600          # city coordinates, monthly (geocode_cache, not the HTTP cache)
+STALE_WHILE_REVALIDATE = 24 * 3600      # serve up to a day stale while refreshing in the background
+
+""" The archive keeps filling in the most recent days (reanalysis lag), don't freeze those """
+ARCHIVE_SETTLE_DAYS = 5
+
+""" zlib the pickled responses, Open-Meteo flatbuffers and JSON shrink several times """
+COMPRESS_RESPONSES = True
+
+URLS_EXPIRE_AFTER = {
+    "archive-api.open-meteo.com/v1/archive": NEVER_EXPIRE,
+    "api.open-meteo.com/v1/forecast": FORECAST_TTL,
+}
+
+
+def archive_is_settled(response):
+    """
+    filter_fn for the cache: archive responses are only stored once every requested day
+    is older than the reanalysis lag. Everything else is cached under URLS_EXPIRE_AFTER.
+    """
+    url = urlparse(response.url)
+    if not url.netloc.startswith("archive-api."):
+        return True
+
+    end_dates = parse_qs(url.query).get("end_date")
+    if not end_dates:
+        return False
+    try:
+        end_date = datetime.strptime(end_dates[0], "%Y-%m-%d").date()
+    except ValueError:
+        return False
+    return end_date <= datetime.today().date() - timedelta(days=ARCHIVE_SETTLE_DAYS)
+
+
+def _decompress(data):
+    try:
+        return zlib.decompress(data)
+    except zlib.error:
+        return data  # stored before compression was turned on
+
+
+compressed_serializer = SerializerPipeline(
+    [*pickle_serializer.stages, Stage(dumps=zlib.compress, loads=_decompress)],
+    name="pickle_zlib",
+    is_binary=True
+)
+
+
+def cache_settings():
+    """Keyword arguments for requests_cache.CachedSession"""
+    settings = {
+        "expire_after": FORECAST_TTL,
+        "urls_expire_after": URLS_EXPIRE_AFTER,
+        "filter_fn": archive_is_settled,
+        "stale_while_revalidate": STALE_WHILE_REVALIDATE,
+        "stale_if_error": True,
+    }
+    if COMPRESS_RESPONSES:
+        settings["serializer"] = compressed_serializer
+    return settings
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import deque
+
+from data.api_handlers.rate_limiter import key_id
+
+
+""" Per provider/key health: trip on error rate or slow calls, skip the provider while open, probe to recover """
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+WINDOW = 20                 # most recent calls considered
+MIN_CALLS = 4               # don't judge a provider on fewer calls than this
+FAILURE_RATE = 0.5          # open when at least half of the window failed
+SLOW_CALL_SECONDS = 3.0     # a call slower than this counts as a failure
+OPEN_SECONDS = 30           # how long to skip the provider before probing
+
+
+class CircuitBreaker:
+    def __init__(self, name, window=WINDOW, min_calls=MIN_CALLS, failure_rate=FAILURE_RATE,
+                 slow_call_seconds=SLOW_CALL_SECONDS, open_seconds=OPEN_SECONDS):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.opened_at = 0
+        self._results = deque(maxlen=window)
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        True when a call may go to this provider. While open the answer is False
+        (no waiting), after open_seconds a single half-open probe is let through.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, ok, latency=0.0):
+        """Outcome of a call that was allowed, slow successes count as failures"""
+        ok = ok and latency < self.slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if ok:
+                    self.state = CLOSED
+                    self._results.clear()
+                    print(f"Circuit {self.name} closed")
+                else:
+                    self._open()
+                return
+
+            self._results.append(ok)
+            failures = self._results.count(False)
+            if len(self._results) >= self.min_calls and failures / len(self._results) >= self.failure_rate:
+                self._open()
+
+    def release(self):
+        """
+        An allowed call ended without reaching the provider (rate limited, quota spent, local error).
+        Frees the half-open probe slot so the next allow() can probe, nothing is counted
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._results.clear()
+        print(f"Circuit {self.name} open, skipping for {self.open_seconds}s")
+
+    def status(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'calls': len(self._results),
+                'failures': self._results.count(False)
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider, api_key=None):
+    """Shared CircuitBreaker for a provider/key"""
+    name = f"{provider}:{key_id(api_key)}"
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def breaker_status():
+    """{provider:key_id: status} for every breaker created so far"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.status() for name, breaker in breakers.items()}
@@ -0,0 +1,115 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from data.gazetteer import get_gazetteer
+from data.api_handlers.cache_policy import CURRENT_WEATHER_TTL
+
+
+class CurrentWeatherCache:
+    """
+    OpenWeather current conditions by resolved location (fetched once in English, see translate_condition).
+    SQLite keeps entries across restarts, an in-process LRU serves repeat views.
+    """
+
+    def __init__(self, db_path="data/cache/current_weather.sqlite", ttl=CURRENT_WEATHER_TTL, memory_size=128):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS current_conditions (
+                    location TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )"""
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    @staticmethod
+    def location_key(city_name):
+        """
+        Gazetteer cities key on rounded coordinates, so "london", "London, GB", "Londres"
+        and a (lat, lon) lookup share one entry. Unknown names fall back to the normalized name.
+        """
+        if isinstance(city_name, tuple):
+            return f"{city_name[0]:.2f},{city_name[1]:.2f}"
+
+        place = get_gazetteer().resolve(city_name)
+        if place:
+            return f"{place['latitude']:.2f},{place['longitude']:.2f}"
+        return "name:" + " ".join(city_name.split()).casefold()
+
+    def get(self, city_name):
+        """Cached weather json for the city, None when missing or older than the TTL"""
+        key = self.location_key(city_name)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    return entry[0]
+                del self._memory[key]
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload, fetched_at FROM current_conditions WHERE location = ?",
+                (key,)
+            ).fetchone()
+
+        if row is None or row[1] + self.ttl <= now:
+            return None
+
+        weather_json_data = json.loads(row[0])
+        self._remember(key, weather_json_data, row[1] + self.ttl)
+        return weather_json_data
+
+    def put(self, city_name, weather_json_data):
+        """Store a successful response, errors are never cached"""
+        key = self.location_key(city_name)
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO current_conditions (location, payload, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(weather_json_data), now)
+            )
+            # Anything past its TTL can't be served again, keep the table small
+            conn.execute("DELETE FROM current_conditions WHERE fetched_at < ?", (now - self.ttl,))
+
+        self._remember(key, weather_json_data, now + self.ttl)
+
+    def _remember(self, key, weather_json_data, expires_at):
+        with self._lock:
+            self._memory[key] = (weather_json_data, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+
+_current_weather_cache = None
+_current_weather_cache_lock = threading.Lock()
+
+
+def get_current_weather_cache():
+    """Shared CurrentWeatherCache for the OpenWeather handlers"""
+    global _current_weather_cache
+    with _current_weather_cache_lock:
+        if _current_weather_cache is None:
+            _current_weather_cache = CurrentWeatherCache()
+        return _current_weather_cache
@@ -0,0 +1,169 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from data.gazetteer import get_gazetteer
+from data.api_handlers.http_client import get_session
+from data.api_handlers.cache_policy import GEOCODING_TTL
+from data.api_handlers.rate_limiter import INTERACTIVE_WAIT, OPEN_METEO, get_rate_limiter
+
+
+GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
+
+""" City coordinates practically never change, refresh monthly. Misses (typos) expire quickly """
+GEOCODE_TTL = GEOCODING_TTL
+NOT_FOUND_TTL = 24 * 3600
+
+
+class GeocodeCache:
+    """Persistent city -> coordinates store (SQLite) with an in-process LRU in front"""
+
+    def __init__(self, db_path="data/cache/geocode_cache.sqlite", ttl=GEOCODE_TTL,
+                 not_found_ttl=NOT_FOUND_TTL, memory_size=512):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.not_found_ttl = not_found_ttl
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS geocode (
+                    name TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    latitude REAL,
+                    longitude REAL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (name, language)
+                )"""
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    @staticmethod
+    def normalize(city_name):
+        """Case and whitespace insensitive key for a city name"""
+        return " ".join(city_name.split()).casefold()
+
+    def get(self, city_name, language="en"):
+        """
+        Cached (lat, lon) for a city, (None, None) for a cached miss,
+        or None when the city has never been looked up or the entry expired
+        """
+        key = (self.normalize(city_name), language)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._memory.move_to_end(key)
+                    return entry[0], entry[1]
+                del self._memory[key]
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT latitude, longitude, fetched_at FROM geocode WHERE name = ? AND language = ?",
+                key
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        lat, lon, fetched_at = row
+        expires_at = fetched_at + (self.ttl if lat is not None else self.not_found_ttl)
+        if expires_at <= now:
+            return None
+
+        self._remember(key, lat, lon, expires_at)
+        return lat, lon
+
+    def put(self, city_name, lat, lon, language="en"):
+        """Store a lookup result, lat/lon of None records a not-found city"""
+        key = (self.normalize(city_name), language)
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO geocode (name, language, latitude, longitude, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key[0], key[1], lat, lon, now)
+            )
+
+        expires_at = now + (self.ttl if lat is not None else self.not_found_ttl)
+        self._remember(key, lat, lon, expires_at)
+
+    def _remember(self, key, lat, lon, expires_at):
+        with self._lock:
+            self._memory[key] = (lat, lon, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+
+_geocode_cache = None
+_geocode_cache_lock = threading.Lock()
+
+
+def get_geocode_cache():
+    """Shared GeocodeCache for all API handlers"""
+    global _geocode_cache
+    with _geocode_cache_lock:
+        if _geocode_cache is None:
+            _geocode_cache = GeocodeCache()
+        return _geocode_cache
+
+
+def resolve_coordinates(city_name, language="en"):
+    """
+    City name -> (lat, lon) from the offline gazetteer, then the shared cache,
+    geocoding over the network only when neither knows the city.
+    Returns (None, None) when the city cannot be found.
+    """
+    if not city_name or not city_name.strip():
+        return None, None
+
+    place = get_gazetteer().resolve(city_name)
+    if place:
+        return place['latitude'], place['longitude']
+
+    cache = get_geocode_cache()
+    cached = cache.get(city_name, language)
+    if cached is not None:
+        return cached
+
+    try:
+        params = {
+            "name": city_name.strip(),
+            "count": 1,
+            "language": language,
+            "format": "json"
+        }
+
+        if not get_rate_limiter().acquire(OPEN_METEO, timeout=INTERACTIVE_WAIT):
+            return None, None
+        response = get_session().get(GEOCODING_URL, params=params, timeout=5)
+        if response.status_code != 200:
+            # Service trouble is not a "not found", don't cache it
+            return None, None
+
+        data = response.json()
+        if data.get('results') and len(data['results']) > 0:
+            result = data['results'][0]
+            lat, lon = result['latitude'], result['longitude']
+        else:
+            lat, lon = None, None
+
+        cache.put(city_name, lat, lon, language)
+        return lat, lon
+    except Exception:
+        return None, None
@@ -0,0 +1,164 @@
+import threading
+import time
+
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from data.api_handlers.cache_policy import cache_settings
+from data.api_handlers.rate_limiter import record_response
+
+
+""" One transport for every API handler: keep-alive pools, retry and timeout policy live here """
+
+DEFAULT_TIMEOUT = 10            # seconds, applied when a caller passes no timeout
+DEFAULT_POOL_MAXSIZE = 10       # kept-alive connections per host
+POOL_CONNECTIONS = 10           # host pools kept per adapter
+
+""" Per-host connection limits, hosts not listed use DEFAULT_POOL_MAXSIZE """
+HOST_POOL_LIMITS = {
+    "https://api.openweathermap.org": 10,
+    "https://openweathermap.org": 4,
+    "https://api.open-meteo.com": 8,
+    "https://archive-api.open-meteo.com": 4,
+    "https://geocoding-api.open-meteo.com": 4,
+    "http://ip-api.com": 1,
+}
+
+""" Hosts whose handler fails over itself (alternate key, circuit breaker): a retry would only
+    multiply the caller's timeout and hide the failure from the breaker, so none at all """
+FAILOVER_HOSTS = ("https://api.openweathermap.org",)
+
+CACHE_NAME = ".cache"
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout when the caller gives none"""
+
+    def __init__(self, *args, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _retry_policy(read_retries=True):
+    """
+    Retry connection errors and 5xx with backoff, 4xx goes straight back to the handler.
+    read_retries=False: a read timeout raises ReadTimeout at once (read=False re-raises the
+    original error, read=0 would wrap it in a ConnectionError) instead of resending the request
+    """
+    return Retry(
+        total=3,
+        read=None if read_retries else False,
+        backoff_factor=0.2,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+def _mount_adapters(session, read_retries=True):
+    # Count every call that reaches the network against the provider/key daily quota
+    session.hooks["response"].append(record_response)
+
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, TimeoutHTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=DEFAULT_POOL_MAXSIZE,
+            max_retries=_retry_policy(read_retries)
+        ))
+
+    # Longer prefixes win over the generic ones above
+    for host, pool_maxsize in HOST_POOL_LIMITS.items():
+        session.mount(host, TimeoutHTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(0, read=False) if host in FAILOVER_HOSTS else _retry_policy(read_retries)
+        ))
+    return session
+
+
+class CacheStats:
+    """Hit/miss counters and last access time per cache key, read by cache_maintenance"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.last_access = {}
+        self._lock = threading.Lock()
+
+    def record(self, response):
+        with self._lock:
+            if getattr(response, "from_cache", False):
+                self.hits += 1
+            else:
+                self.misses += 1
+            cache_key = getattr(response, "cache_key", None)
+            if cache_key:
+                self.last_access[cache_key] = time.time()
+
+    def pop_access_times(self):
+        with self._lock:
+            access_times, self.last_access = self.last_access, {}
+            return access_times
+
+    def hit_rate(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return self.hits / total if total else 0.0
+
+
+cache_stats = CacheStats()
+
+
+class StatsCachedSession(requests_cache.CachedSession):
+    """CachedSession that reports every response to cache_stats"""
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        cache_stats.record(response)
+        return response
+
+
+_session = None
+_cached_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Shared pooled session for plain requests (OpenWeather, geocoding, icons, IP lookup).
+    No read timeout retries: these calls run on the UI thread and pass their own timeout,
+    a slow server costs that timeout once and the handler's Timeout branch decides what next
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _mount_adapters(requests.Session(), read_retries=False)
+        return _session
+
+
+def get_cached_session():
+    """Shared pooled session backed by the requests_cache database (expiry per cache_policy), used by the Open-Meteo client"""
+    global _cached_session
+    with _session_lock:
+        if _cached_session is None:
+            _cached_session = _mount_adapters(StatsCachedSession(CACHE_NAME, **cache_settings()))
+        return _cached_session
+
+
+def close_sessions():
+    """Close pooled connections, for app shutdown"""
+    global _session, _cached_session
+    with _session_lock:
+        for session in (_session, _cached_session):
+            if session is not None:
+                session.close()
+        _session = None
+        _cached_session = None
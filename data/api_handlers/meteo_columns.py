@@ -0,0 +1,95 @@
+import numpy as np
+
+
+class MeteoColumns:
+    """
+    Columnar Open-Meteo result: a datetime64 time index plus one numpy array per variable.
+    Slicing by position or date returns views onto the same arrays, nothing is copied.
+    """
+
+    __slots__ = ('time', 'columns', 'city', 'coord')
+
+    def __init__(self, time, columns, city=None, coord=None):
+        self.time = time
+        self.columns = columns
+        self.city = city
+        self.coord = coord
+
+    @classmethod
+    def from_section(cls, section, names, city=None, coord=None):
+        """
+        Decode a Daily()/Hourly() FlatBuffers section. names must be in request order.
+        ValuesAsNumpy() wraps the response buffer, so the columns are not copied.
+        """
+        if section.VariablesLength() != len(names):
+            raise ValueError(f"Expected {len(names)} variables, response has {section.VariablesLength()}")
+
+        interval = section.Interval()
+        time = np.arange(section.Time(), section.TimeEnd(), interval, dtype=np.int64).astype("datetime64[s]")
+        if interval == 86400:
+            time = time.astype("datetime64[D]")
+
+        columns = {name: cls._values(section.Variables(i)) for i, name in enumerate(names)}
+        return cls(time, columns, city=city, coord=coord)
+
+    @staticmethod
+    def _values(variable):
+        """float32 values, or the int64 ones for timestamp variables (sunrise, sunset)"""
+        values = variable.ValuesAsNumpy()
+        if values.size == 0 and variable.ValuesInt64Length():
+            return variable.ValuesInt64AsNumpy()
+        return values
+
+    def __getitem__(self, name):
+        return self.time if name == 'time' else self.columns[name]
+
+    def __contains__(self, name):
+        return name == 'time' or name in self.columns
+
+    def __len__(self):
+        return len(self.time)
+
+    def names(self):
+        return list(self.columns)
+
+    def _view(self, start, stop):
+        return MeteoColumns(
+            self.time[start:stop],
+            {name: values[start:stop] for name, values in self.columns.items()},
+            city=self.city,
+            coord=self.coord
+        )
+
+    def slice(self, start, stop):
+        """Rows start:stop as views"""
+        return self._view(max(0, start), max(0, stop))
+
+    def index_of(self, day):
+        """Row position of a date (or datetime64), None when outside the index"""
+        target = np.datetime64(day).astype(self.time.dtype)
+        position = int(np.searchsorted(self.time, target))
+        if position < len(self.time) and self.time[position] == target:
+            return position
+        return None
+
+    def between(self, start_day, end_day):
+        """Rows with start_day <= time <= end_day as views (time index is sorted)"""
+        start = int(np.searchsorted(self.time, np.datetime64(start_day), side="left"))
+        stop = int(np.searchsorted(self.time, np.datetime64(end_day), side="right"))
+        return self._view(start, stop)
+
+    def dates(self):
+        """Time index as python dates, for labels"""
+        return self.time.astype("datetime64[D]").tolist()
+
+    def value(self, name, row, places=None):
+        """One value as a python float (optionally rounded), None for NaN"""
+        value = float(self.columns[name][row])
+        if value != value:
+            return None
+        return round(value, places) if places is not None else value
+
+    def to_dataframe(self):
+        """pandas view for callers that still want a DataFrame"""
+        import pandas as pd
+        return pd.DataFrame({'date': self.time, **self.columns}, copy=False)
@@ -0,0 +1,106 @@
+import numpy as np
+
+from data.api_handlers.meteo_columns import MeteoColumns
+
+
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+""" Response sections a query can ask for, with the numpy time unit of each """
+SECTIONS = {"daily": "datetime64[D]", "hourly": "datetime64[s]", "current": "datetime64[s]"}
+
+
+class MeteoQuery:
+    """
+    Declarative Open-Meteo request: any set of daily/hourly variables over one span.
+    Every requested variable comes back in one MeteoColumns per daily/hourly section,
+    current conditions as a plain {variable: value} dict, e.g.
+
+        query = MeteoQuery.forecast(daily=["temperature_2m_max", "precipitation_sum", "weather_code"],
+                                    hourly=["relative_humidity_2m", "wind_speed_10m"])
+        result, error = OpenMeteoAPI().fetch_query("London", query)
+        result['daily']['precipitation_sum'], result['hourly']['wind_speed_10m']
+    """
+
+    def __init__(self, url=FORECAST_URL, daily=(), hourly=(), start_date=None, end_date=None,
+                 past_days=None, forecast_days=None, timezone=None, current=()):
+        if not daily and not hourly and not current:
+            raise ValueError("MeteoQuery needs at least one daily, hourly or current variable")
+
+        self.url = url
+        # Open-Meteo answers in request order, so the variable order is fixed here once
+        self.variables = {
+            "daily": list(dict.fromkeys(daily)),
+            "hourly": list(dict.fromkeys(hourly)),
+            "current": list(dict.fromkeys(current))
+        }
+        self.start_date = start_date
+        self.end_date = end_date
+        self.past_days = past_days
+        self.forecast_days = forecast_days
+        self.timezone = timezone
+
+    @classmethod
+    def forecast(cls, daily=(), hourly=(), past_days=None, forecast_days=None, current=()):
+        return cls(FORECAST_URL, daily, hourly, past_days=past_days, forecast_days=forecast_days, current=current)
+
+    @classmethod
+    def archive(cls, start_date, end_date, daily=(), hourly=()):
+        return cls(ARCHIVE_URL, daily, hourly, start_date=start_date, end_date=end_date)
+
+    def sections(self):
+        """Requested sections, in the order of SECTIONS"""
+        return [section for section in SECTIONS if self.variables[section]]
+
+    def params(self):
+        """Request params without coordinates (the API handler adds latitude/longitude)"""
+        params = {section: self.variables[section] for section in self.sections()}
+        if self.start_date:
+            params["start_date"] = self.start_date.strftime("%Y-%m-%d")
+        if self.end_date:
+            params["end_date"] = self.end_date.strftime("%Y-%m-%d")
+        if self.past_days is not None:
+            params["past_days"] = self.past_days
+        if self.forecast_days is not None:
+            params["forecast_days"] = self.forecast_days
+        if self.timezone:
+            params["timezone"] = self.timezone
+        return params
+
+    def decode(self, response, city_name=None, lat=None, lon=None):
+        """
+        Decode one FlatBuffers response into {section: MeteoColumns}.
+        Each column wraps the response buffer, nothing is converted value by value.
+        """
+        coord = {'lat': lat, 'lon': lon}
+        readers = {"daily": response.Daily, "hourly": response.Hourly}
+        result = {}
+        for section in self.sections():
+            if section == "current":
+                result[section] = self._current_values(response.Current())
+            else:
+                result[section] = MeteoColumns.from_section(readers[section](), self.variables[section], city=city_name, coord=coord)
+        return result
+
+    def _current_values(self, current):
+        """Current section holds one scalar per variable"""
+        values = {'time': np.datetime64(current.Time(), "s")}
+        for i, name in enumerate(self.variables["current"]):
+            values[name] = current.Variables(i).Value()
+        return values
+
+    def decode_json(self, data, city_name=None, lat=None, lon=None):
+        """Decode a format=json response (aiohttp client) into the same {section: MeteoColumns}"""
+        coord = {'lat': lat, 'lon': lon}
+        result = {}
+        for section in self.sections():
+            values = data[section]
+            if section == "current":
+                result[section] = {'time': np.datetime64(values['time'], "s"),
+                                   **{name: values[name] for name in self.variables[section]}}
+                continue
+            time = np.array(values['time'], dtype=SECTIONS[section])
+            # None (missing) becomes NaN, same float32 columns as the FlatBuffers decoder
+            columns = {name: np.array(values[name], dtype=np.float32) for name in self.variables[section]}
+            result[section] = MeteoColumns(time, columns, city=city_name, coord=coord)
+        return result
@@ -1,112 +1,208 @@
 import openmeteo_requests
-import pandas as pd
-import requests_cache
-from retry_requests import retry
 from datetime import datetime, timedelta
+from data.gazetteer import get_gazetteer
+from data.api_handlers.geocode_cache import resolve_coordinates
+from data.api_handlers.http_client import get_cached_session
+from data.api_handlers.meteo_query import MeteoQuery
+from data.api_handlers.rate_limiter import INTERACTIVE_WAIT, OPEN_METEO, get_rate_limiter
+
+""" Open-Meteo accepts lists of coordinates, keep each request URL a sane length """
+MAX_BATCH_LOCATIONS = 50
+
+""" Daily variables per endpoint, in request order (decoding relies on it) """
+HISTORY_DAILY = ["temperature_2m_max", "temperature_2m_min", "temperature_2m_mean"]
+TREND_DAILY = ["temperature_2m_max", "temperature_2m_min"]
+TREND_PAST_DAYS = 5
+
+""" Current conditions used as the OpenWeather fallback, in request order """
+CURRENT_VARIABLES = ["temperature_2m", "apparent_temperature", "relative_humidity_2m", "pressure_msl",
+                     "weather_code", "cloud_cover", "wind_speed_10m", "wind_direction_10m", "is_day"]
+
+""" WMO weather code -> OpenWeather (condition id, main, description, icon) so fallback data renders like OpenWeather's """
+WMO_TO_OPENWEATHER = {
+    0: (800, "Clear", "clear sky", "01"),
+    1: (801, "Clouds", "few clouds", "02"),
+    2: (802, "Clouds", "scattered clouds", "03"),
+    3: (804, "Clouds", "overcast clouds", "04"),
+    45: (741, "Fog", "fog", "50"),
+    48: (741, "Fog", "fog", "50"),
+    51: (300, "Drizzle", "light intensity drizzle", "09"),
+    53: (301, "Drizzle", "drizzle", "09"),
+    55: (302, "Drizzle", "heavy intensity drizzle", "09"),
+    56: (511, "Rain", "freezing rain", "13"),
+    57: (511, "Rain", "freezing rain", "13"),
+    61: (500, "Rain", "light rain", "10"),
+    63: (501, "Rain", "moderate rain", "10"),
+    65: (502, "Rain", "heavy intensity rain", "10"),
+    66: (511, "Rain", "freezing rain", "13"),
+    67: (511, "Rain", "freezing rain", "13"),
+    71: (600, "Snow", "light snow", "13"),
+    73: (601, "Snow", "snow", "13"),
+    75: (602, "Snow", "heavy snow", "13"),
+    77: (600, "Snow", "light snow", "13"),
+    80: (520, "Rain", "light intensity shower rain", "09"),
+    81: (521, "Rain", "shower rain", "09"),
+    82: (522, "Rain", "heavy intensity shower rain", "09"),
+    85: (620, "Snow", "light shower snow", "13"),
+    86: (622, "Snow", "heavy shower snow", "13"),
+    95: (211, "Thunderstorm", "thunderstorm", "11"),
+    96: (201, "Thunderstorm", "thunderstorm with rain", "11"),
+    99: (202, "Thunderstorm", "thunderstorm with heavy rain", "11"),
+}
 
 class OpenMeteoAPI:
     def __init__(self):
-        # Setup the Open-Meteo API client with cache and retry on error
-        cache_session = requests_cache.CachedSession('.cache', expire_after = -1)
-        retry_session = retry(cache_session, retries = 5, backoff_factor = 0.2)
-        self.openmeteo = openmeteo_requests.Client(session = retry_session)
-        self.geocoding_url = "https://geocoding-api.open-meteo.com/v1/search"
+        # Setup the Open-Meteo API client on the shared cached, pooled and retrying session
+        self.openmeteo = openmeteo_requests.Client(session = get_cached_session())
 
     def fetch_historical_weather(self, select_city, target_date):
         """
         Fetch historical weather data for a specific date using official client
         """
         try:
-            # First get coordinates for the city
-            lat, lon = self._get_coordinates(select_city)
-            if not lat or not lon:
-                return None, f"City {select_city} not found."
-            
             # Only fetch historical data (past dates)
             if target_date >= datetime.today().date():
                 return None, "Use OpenWeatherAPI for current/future dates"
-                
-            return self._fetch_historical_data(lat, lon, select_city, target_date)
-                
-        except Exception as e:
-            return None, str(e)
 
-    def _get_coordinates(self, city_name):
-        """Get lat/lon coordinates for a city using requests"""
-        import requests
-        
-        try:
-            params = {
-                "name": city_name,
-                "count": 1,
-                "language": "en",
-                "format": "json"
-            }
-            
-            response = requests.get(self.geocoding_url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('results') and len(data['results']) > 0:
-                    result = data['results'][0]
-                    return result['latitude'], result['longitude']
-            return None, None
-        except Exception:
-            return None, None
-
-    def _fetch_historical_data(self, lat, lon, city_name, target_date):
-        """Fetch historical weather data using official Open-Meteo client"""
-        try:
-            date_str = target_date.strftime("%Y-%m-%d")
-            
-            url = "https://archive-api.open-meteo.com/v1/archive"
-            params = {
-                "latitude": lat,
-                "longitude": lon,
-                "start_date": date_str,
-                "end_date": date_str,
-                "daily": ["temperature_2m_max", "temperature_2m_min", "temperature_2m_mean"]
-            }
-            
-            responses = self.openmeteo.weather_api(url, params=params)
-            response = responses[0]
-            
-            # Process daily data
-            daily = response.Daily()
-            daily_temperature_2m_max = daily.Variables(0).ValuesAsNumpy()
-            daily_temperature_2m_min = daily.Variables(1).ValuesAsNumpy()
-            daily_temperature_2m_mean = daily.Variables(2).ValuesAsNumpy()
-            
-            # Get the values for the single day (first and only entry)
-            temp_max = float(daily_temperature_2m_max[0]) if len(daily_temperature_2m_max) > 0 else None
-            temp_min = float(daily_temperature_2m_min[0]) if len(daily_temperature_2m_min) > 0 else None
-            temp_mean = float(daily_temperature_2m_mean[0]) if len(daily_temperature_2m_mean) > 0 else None
-            
+            range_data, error = self.fetch_historical_range(select_city, target_date, target_date)
+            if error:
+                return None, error
+
             # Return in a format compatible with existing processing
             weather_data = {
-                'name': city_name,
+                'name': range_data.city,
                 'main': {
-                    'temp_max': temp_max,
-                    'temp_min': temp_min,
-                    'temp_mean': temp_mean
+                    'temp_max': range_data.value('temperature_2m_max', 0),
+                    'temp_min': range_data.value('temperature_2m_min', 0),
+                    'temp_mean': range_data.value('temperature_2m_mean', 0)
                 },
-                'coord': {'lat': lat, 'lon': lon}
+                'coord': range_data.coord
             }
-            
             return weather_data, None
                 
         except Exception as e:
             return None, str(e)
 
+    def fetch_historical_range(self, select_city, start_date, end_date):
+        """
+        Fetch a whole span of daily history for one city in a single archive request.
+        Returns MeteoColumns: a datetime64 day index and one numpy array per HISTORY_DAILY variable.
+        """
+        try:
+            # Archive only covers past days, clamp the span to yesterday
+            yesterday = datetime.today().date() - timedelta(days=1)
+            end_date = min(end_date, yesterday)
+            if start_date > end_date:
+                return None, "Use OpenWeatherAPI for current/future dates"
+
+            # Geocode once for the whole span
+            lat, lon = self._get_coordinates(select_city)
+            if not lat or not lon:
+                return None, f"City {select_city} not found."
+
+            return self._fetch_historical_data(lat, lon, select_city, start_date, end_date)
+
+        except Exception as e:
+            return None, str(e)
+
+    def _get_coordinates(self, city_name):
+        """Get lat/lon coordinates for a city through the shared geocode cache"""
+        return resolve_coordinates(city_name)
+
+    def fetch_historical_range_batch(self, cities, start_date, end_date, cancel=None):
+        """
+        Fetch the same span of daily history for several cities in one archive exchange.
+        Returns {city: (range_data, error)} with range_data as in fetch_historical_range.
+        cancel: threading.Event that ends the wait for rate limit slots
+        """
+        yesterday = datetime.today().date() - timedelta(days=1)
+        end_date = min(end_date, yesterday)
+        if start_date > end_date:
+            return {city: (None, "Use OpenWeatherAPI for current/future dates") for city in cities}
+
+        query = MeteoQuery.archive(start_date, end_date, daily=HISTORY_DAILY)
+        return self._fetch_batch(query, cities, section="daily", cancel=cancel)
+
+    def _fetch_historical_data(self, lat, lon, city_name, start_date, end_date):
+        """Fetch historical weather data using official Open-Meteo client"""
+        query = MeteoQuery.archive(start_date, end_date, daily=HISTORY_DAILY)
+        result, error = self.fetch_query_at(lat, lon, city_name, query)
+        return (result['daily'], None) if result else (None, error)
+
+    def fetch_query(self, select_city, query):
+        """
+        Run a MeteoQuery for one city.
+        Returns ({section: MeteoColumns}, error), e.g. result['daily']['precipitation_sum']
+        """
+        try:
+            lat, lon = self._get_coordinates(select_city)
+            if not lat or not lon:
+                return None, f"City {select_city} not found."
+
+            return self.fetch_query_at(lat, lon, select_city, query)
+
+        except Exception as e:
+            return None, str(e)
+
+    def fetch_query_at(self, lat, lon, city_name, query):
+        """Run a MeteoQuery for known coordinates"""
+        try:
+            params = query.params()
+            params["latitude"] = lat
+            params["longitude"] = lon
+            if not get_rate_limiter().acquire(OPEN_METEO, timeout=INTERACTIVE_WAIT):
+                return None, "Open-Meteo rate limit reached. Please try again later."
+            responses = self.openmeteo.weather_api(query.url, params=params)
+            return query.decode(responses[0], city_name, lat, lon), None
+
+        except Exception as e:
+            return None, str(e)
+
+    def fetch_query_batch(self, cities, query):
+        """Run one MeteoQuery for several cities in one exchange. Returns {city: (result, error)}"""
+        return self._fetch_batch(query, cities)
+
+    def _fetch_batch(self, query, cities, section=None, cancel=None):
+        """
+        Geocode each city, then request all resolved locations together.
+        Open-Meteo returns one response per location, in request order.
+        With section set, each city gets that section's MeteoColumns instead of the full result.
+        """
+        results = {}
+        locations = []
+        for city in dict.fromkeys(cities):
+            lat, lon = self._get_coordinates(city)
+            if not lat or not lon:
+                results[city] = (None, f"City {city} not found.")
+            else:
+                locations.append((city, lat, lon))
+
+        for i in range(0, len(locations), MAX_BATCH_LOCATIONS):
+            chunk = locations[i:i + MAX_BATCH_LOCATIONS]
+            try:
+                batch_params = query.params()
+                batch_params["latitude"] = [lat for _, lat, _ in chunk]
+                batch_params["longitude"] = [lon for _, _, lon in chunk]
+                # Every location counts as a call, batches wait for their slots
+                if not get_rate_limiter().acquire(OPEN_METEO, tokens=len(chunk), cancel=cancel):
+                    raise RuntimeError("Cancelled" if cancel is not None and cancel.is_set() else "Open-Meteo daily quota used up")
+                responses = self.openmeteo.weather_api(query.url, params=batch_params)
+
+                for (city, lat, lon), response in zip(chunk, responses):
+                    try:
+                        result = query.decode(response, city, lat, lon)
+                        results[city] = (result[section] if section else result, None)
+                    except Exception as e:
+                        results[city] = (None, str(e))
+            except Exception as e:
+                for city, _, _ in chunk:
+                    results[city] = (None, str(e))
+
+        return results
+
         """ Pulling in previous functions to return different API call and returns on secondary/non-vital page """
     def meteo_forecast_and_trend(self,select_city):
-        # Setup the Open-Meteo API client with cache and retry on error
-        cache_session = requests_cache.CachedSession('.cache', expire_after = 3600)
-        retry_session = retry(cache_session, retries = 5, backoff_factor = 0.2)
-        """ TODO unsure if this is needed where repeating a call or if the __init__ makes this accessible. """
-        openmeteo = openmeteo_requests.Client(session = retry_session)
-
-        # Make sure all required weather variables are listed here
-        # The order of variables in hourly or daily is important to assign them correctly below
+        # Required weather variables are listed in TREND_DAILY, MeteoQuery keeps them in request order
         try:
             lat, lon = self._get_coordinates(select_city)
             if not lat or not lon:
@@ -117,39 +213,77 @@ class OpenMeteoAPI:
         except Exception as e:
             return None, str(e)
         
+    def meteo_forecast_and_trend_batch(self, cities):
+        """
+        Forecast/trend data for several cities in one request.
+        Returns {city: (columns, error)} with the same MeteoColumns as meteo_forecast_and_trend.
+        """
+        return self._fetch_batch(self._trend_query(), cities, section="daily")
+
     def meteo_forecast_and_trend_data(self, lat, lon,city_name):
+        # Process first location. Use meteo_forecast_and_trend_batch for multiple locations
+        result, error = self.fetch_query_at(lat, lon, city_name, self._trend_query())
+        return (result['daily'], None) if result else (None, error)
 
-        try:
-            url = "https://api.open-meteo.com/v1/forecast"
-            params = {
-	            "latitude": lat,
-	            "longitude": lon,
-	            "daily": ["temperature_2m_max", "temperature_2m_min"],
-	            "past_days": 5
-            }
-            responses = self.openmeteo.weather_api(url, params=params)
+    def _trend_query(self):
+        """Daily min/max for the past TREND_PAST_DAYS days plus the forecast"""
+        return MeteoQuery.forecast(daily=TREND_DAILY, past_days=TREND_PAST_DAYS)
 
-            # Process first location. Add a for-loop for multiple locations or weather models
-            response = responses[0]
+    def fetch_current_conditions(self, select_city):
+        """
+        Open-Meteo current conditions shaped like an OpenWeather /weather response.
+        Failover source for OpenWeatherAPI when both keys are down.
+        """
+        try:
+            lat, lon = self._get_coordinates(select_city)
+            if not lat or not lon:
+                return None, f"City {select_city} not found."
 
-            # Process daily data. The order of variables needs to be the same as requested.
-            daily = response.Daily()
-            daily_temperature_2m_max = daily.Variables(0).ValuesAsNumpy()
-            daily_temperature_2m_min = daily.Variables(1).ValuesAsNumpy()
+            return self.fetch_current_conditions_at(lat, lon, select_city)
 
-            daily_data = {"date": pd.date_range(
-	        start = pd.to_datetime(daily.Time(), unit = "s", utc = True),
-	        end = pd.to_datetime(daily.TimeEnd(), unit = "s", utc = True),
-	        freq = pd.Timedelta(seconds = daily.Interval()),
-	        inclusive = "left"
-            )}
+        except Exception as e:
+            return None, str(e)
 
-            daily_data["temperature_2m_max"] = daily_temperature_2m_max
-            daily_data["temperature_2m_min"] = daily_temperature_2m_min
+    def fetch_current_conditions_at(self, lat, lon, city_name=None):
+        """fetch_current_conditions for known coordinates"""
+        query = MeteoQuery.forecast(daily=["sunrise", "sunset"], current=CURRENT_VARIABLES, forecast_days=1)
+        result, error = self.fetch_query_at(lat, lon, city_name, query)
+        if error:
+            return None, error
 
-            daily_dataframe = pd.DataFrame(data = daily_data)
+        try:
+            current = result['current']
+            daily = result['daily']
+            condition_id, main, description, icon = WMO_TO_OPENWEATHER.get(int(current['weather_code']), WMO_TO_OPENWEATHER[0])
+            place = get_gazetteer().resolve(city_name) if isinstance(city_name, str) else None
 
+            return {
+                'name': place['name'] if place else (city_name if isinstance(city_name, str) else f"{lat:.2f}, {lon:.2f}"),
+                'coord': {'lat': lat, 'lon': lon},
+                'weather': [{
+                    'id': condition_id,
+                    'main': main,
+                    'description': description,
+                    'icon': icon + ("d" if current['is_day'] else "n")
+                }],
+                'main': {
+                    'temp': float(current['temperature_2m']),
+                    'feels_like': float(current['apparent_temperature']),
+                    'humidity': int(current['relative_humidity_2m']),
+                    'pressure': int(current['pressure_msl'])
+                },
+                'wind': {
+                    'speed': round(float(current['wind_speed_10m']) / 3.6, 2),   # km/h -> m/s like OpenWeather metric
+                    'deg': int(current['wind_direction_10m'])
+                },
+                'clouds': {'all': int(current['cloud_cover'])},
+                'sys': {
+                    'country': place['country_code'] if place else "",
+                    'sunrise': int(daily['sunrise'][0]),
+                    'sunset': int(daily['sunset'][0])
+                },
+                'source': 'open-meteo'
+            }, None
 
-            return daily_dataframe, None
         except Exception as e:
             return None, str(e)
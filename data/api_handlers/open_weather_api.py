@@ -1,29 +1,34 @@
 import requests
-import os
-from dotenv import load_dotenv
-from features.weather_extract import WeatherProcessor
-import math
-from PIL import Image
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from data.api_handlers.http_client import get_session
+from data.api_handlers.current_weather_cache import get_current_weather_cache
+from data.api_handlers.rate_limiter import INTERACTIVE_WAIT, OPEN_METEO, OPENWEATHER, get_rate_limiter
+from data.api_handlers.circuit_breaker import get_breaker
+from data.api_handlers.settings import settings
+from data.gazetteer import get_gazetteer
+from data.user_preferences.location_store import get_location_store
 import time
 
 
-city = WeatherProcessor.select_city()
+# API keys and URLs come from .env through settings, read on first use (open_weather_key,
+# alternate_open_weather_api_key, open_weather_url, open_weather_geo_url)
 
-# import API Keys and URLs from .env
-load_dotenv()
+""" Bulk fetch workers, matches the api.openweathermap.org connection pool in http_client """
+BULK_MAX_WORKERS = 10
 
-# Open Weather API and URL
-weather_api_key = os.getenv("open_weather_key")
-weather_url = os.getenv("open_weather_url")
-alternate_api_key = os.getenv("alternate_open_weather_api_key")
+""" Seconds per OpenWeather call, primary and alternate key alike """
+REQUEST_TIMEOUT = 5
 
-# Open Weather Geo URL
-ow_geo_url = os.getenv("open_weather_geo_url")
+IP_LOCATION_URL = "http://ip-api.com/json/"
+IP_LOOKUP_TIMEOUT = 3
 
 """ Handling Open Weather API for weather, geo, and associated """
 class OpenWeatherAPI:
-    def fetch_open_weather(self, select_city, language="en"):
+    def fetch_open_weather(self, select_city, bulk=False, cancel=None):
+        """
+        Current weather in canonical form (English, metric). Translate descriptions with translate_condition.
+        cancel: threading.Event that ends a bulk wait for a rate limit slot
+        """
         # Input validation
         if not select_city or not select_city.strip():
             return None, "City name cannot be empty"
@@ -32,60 +37,181 @@ class OpenWeatherAPI:
             return None, "City name is too long"
         
         # API key validation
-        if not weather_api_key:
+        if not settings.weather_api_key:
             return None, "Weather API key not configured"
         
         # Basic sanitization
         select_city = select_city.strip()
-        
+        return self._fetch_current(select_city, bulk, cancel)
+
+    def fetch_open_weather_at(self, lat, lon, bulk=False, cancel=None):
+        """ Current weather for coordinates, same canonical form as fetch_open_weather """
+        if not settings.weather_api_key:
+            return None, "Weather API key not configured"
+        return self._fetch_current((lat, lon), bulk, cancel)
+
+    def fetch_open_weather_many(self, locations, max_workers=BULK_MAX_WORKERS, cancel=None):
+        """
+        Current weather for many city names and/or (lat, lon) tuples on a bounded thread pool.
+        Returns {location: (weather_data, error)} in input order, duplicates fetched once.
+        Workers are paced by the rate limiter and never fall back to the alternate key.
+        cancel: threading.Event that ends the workers' rate limit waits
+        """
+        locations = list(dict.fromkeys(locations))
+        if not locations:
+            return {}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(locations)))) as pool:
+            futures = {pool.submit(self._fetch_location, location, cancel): location for location in locations}
+            for future in as_completed(futures):
+                location = futures[future]
+                try:
+                    results[location] = future.result()
+                except Exception as e:
+                    results[location] = (None, str(e))
+
+        return {location: results[location] for location in locations}
+
+    def _fetch_location(self, location, cancel=None):
+        if isinstance(location, tuple):
+            return self.fetch_open_weather_at(*location, bulk=True, cancel=cancel)
+        return self.fetch_open_weather(location, bulk=True, cancel=cancel)
+
+    @staticmethod
+    def _location_params(location):
+        """ q= for a city name, lat/lon for a (lat, lon) tuple or a gazetteer 'City, Region' """
+        if isinstance(location, tuple):
+            return {"lat": location[0], "lon": location[1]}
+        # q= only understands 'City,CC' qualifiers, region qualified names go by coordinates
+        qualifier = location.partition(",")[2].strip()
+        if qualifier and len(qualifier) != 2:
+            place = get_gazetteer().resolve(location)
+            if place:
+                return {"lat": place['latitude'], "lon": place['longitude']}
+        return {"q": location}
+
+    def _fetch_current(self, select_city, bulk=False, cancel=None):
+        """
+        Cached conditions, else the primary key. When the primary is failing (or its circuit is open)
+        interactive lookups fail over to the alternate key, then to Open-Meteo current conditions.
+        bulk: wait for a rate limit slot as long as needed and keep the fallbacks for interactive use
+        """
+        # Same place within the TTL: no network call
+        cached = get_current_weather_cache().get(select_city)
+        if cached is not None:
+            return cached, None
+
+        error = "Weather service unavailable. Please try again later."
+        weather_api_key = settings.weather_api_key
+        if get_breaker(OPENWEATHER, weather_api_key).allow():
+            weather_json_data, error, failed = self._request_current(select_city, weather_api_key, bulk, cancel)
+            if not failed or bulk:
+                return weather_json_data, error
+        elif bulk:
+            return None, error
+
+        return self._failover(select_city, error)
+
+    def _request_current(self, select_city, api_key, bulk=False, cancel=None):
+        """
+        One OpenWeather call with one key. Returns (weather_data, error, provider_failed),
+        provider_failed (bad key, 5xx, timeout, connection) feeds the key's circuit breaker.
+        Every return path either records an outcome or releases the breaker, so a half-open
+        probe that never reached the provider (rate limited, quota spent) can't block the key
+        """
+        breaker = get_breaker(OPENWEATHER, api_key)
+        outcome = None      # (ok, latency) once the provider answered or failed
+        started = time.monotonic()
         try: 
+            if not get_rate_limiter().acquire(OPENWEATHER, api_key, timeout=None if bulk else INTERACTIVE_WAIT, cancel=cancel):
+                if cancel is not None and cancel.is_set():
+                    return None, "Cancelled", False
+                return None, "API rate limit exceeded. Please try again later.", False
+
+            started = time.monotonic()
             params = {
-                "q": select_city,
-                "appid": weather_api_key, 
-                "units": "metric",
-                "lang": language 
+                **self._location_params(select_city),
+                "appid": api_key, 
+                "units": "metric"
             } 
             """ TODO temp_unit_select  #create function in logic to handle and attach to button selector """
             """ 
-    Revisit for other response codes/developer tab relay/API call counter function 
+    Revisit for other response codes/developer tab relay. Calls are counted per key in rate_limiter 
             """
             
-            response = requests.get(weather_url, params=params, timeout=5)
+            response = get_session().get(settings.weather_url, params=params, timeout=REQUEST_TIMEOUT)
+            failed = response.status_code == 401 or response.status_code in [500, 502, 503, 504]
+            outcome = (not failed, time.monotonic() - started)
             
             if response.status_code == 200:
                 try:
                     weather_json_data = response.json()
                     # Validate essential fields exist
                     if 'main' not in weather_json_data or 'weather' not in weather_json_data:
-                        return None, "Invalid weather data format received"
-                    return weather_json_data, None
+                        return None, "Invalid weather data format received", False
+                    get_current_weather_cache().put(select_city, weather_json_data)
+                    return weather_json_data, None, False
                 except ValueError:
-                    return None, "Invalid JSON response from weather service"
+                    return None, "Invalid JSON response from weather service", False
             elif response.status_code == 401: 
-                return self.alternate_fetch_open_weather(select_city, language)
                 """ 401 API related/Handle through retry and alternate API """
+                return None, "Weather API key rejected", True
             elif response.status_code == 404:
-                return None, f"City '{select_city}' not found. Please check the spelling or try a nearby major city."
+                return None, f"City '{select_city}' not found. Please check the spelling or try a nearby major city.", False
             elif response.status_code == 429:
-                return None, "API rate limit exceeded. Please try again later."
-            elif response.status_code in [500, 502, 503, 504]:
-                # Try alternate API for server errors
-                return self.alternate_fetch_open_weather(select_city, language)
+                return None, "API rate limit exceeded. Please try again later.", False
             else:
-                return None, f"Weather service error (Code: {response.status_code}). Please try again later."
+                return None, f"Weather service error (Code: {response.status_code}). Please try again later.", failed
                 
         except requests.exceptions.Timeout:
-            return None, "Request timed out. Please check your internet connection and try again."
+            outcome = (False, time.monotonic() - started)
+            return None, "Request timed out. Please check your internet connection and try again.", True
         except requests.exceptions.ConnectionError:
-            return None, "Unable to connect to weather service. Please check your internet connection."
+            outcome = (False, time.monotonic() - started)
+            return None, "Unable to connect to weather service. Please check your internet connection.", True
         except requests.exceptions.RequestException as e:
-            return None, f"Network error occurred: {str(e)}"
+            outcome = (False, time.monotonic() - started)
+            return None, f"Network error occurred: {str(e)}", True
         except ValueError as e:
-            return None, f"Invalid response format from weather service: {str(e)}"
+            return None, f"Invalid response format from weather service: {str(e)}", False
         except KeyError as e:
-            return None, f"Missing expected data in weather response: {str(e)}"
+            return None, f"Missing expected data in weather response: {str(e)}", False
         except Exception as e:
-            return None, f"Unexpected error: {str(e)}"
+            return None, f"Unexpected error: {str(e)}", False
+        finally:
+            if outcome is None:
+                breaker.release()
+            else:
+                breaker.record(*outcome)
+
+    def _failover(self, select_city, error):
+        """ Alternate key if its circuit allows, then Open-Meteo current conditions (not cached, so recovery shows real data) """
+        alternate_api_key = settings.alternate_api_key
+        if alternate_api_key and get_breaker(OPENWEATHER, alternate_api_key).allow():
+            weather_json_data, alternate_error, failed = self._request_current(select_city, alternate_api_key)
+            if not failed:
+                return weather_json_data, alternate_error
+            error = alternate_error
+
+        meteo_breaker = get_breaker(OPEN_METEO)
+        if meteo_breaker.allow():
+            from data.api_handlers.open_meteo_api import OpenMeteoAPI
+            started = time.monotonic()
+            try:
+                if isinstance(select_city, tuple):
+                    weather_json_data, meteo_error = OpenMeteoAPI().fetch_current_conditions_at(*select_city)
+                else:
+                    weather_json_data, meteo_error = OpenMeteoAPI().fetch_current_conditions(select_city)
+            except Exception:
+                meteo_breaker.release()
+                raise
+            meteo_breaker.record(weather_json_data is not None, time.monotonic() - started)
+            if weather_json_data is not None:
+                return weather_json_data, None
+            print(f"Open-Meteo fallback failed: {meteo_error}")
+
+        return None, error
     
     """ fetch lat/lon and location information for maps/other features """
     def fetch_open_geo(select_city):
@@ -93,10 +219,10 @@ class OpenWeatherAPI:
             params = {
                 "q": select_city,
                 "limit": "5",
-                "appid": weather_api_key
+                "appid": settings.weather_api_key
             }
 
-            response = requests.get(ow_geo_url, params=params)
+            response = get_session().get(settings.geo_url, params=params)
             if response.status_code == 200:
                 return response.json(), None
             else:
@@ -105,12 +231,20 @@ class OpenWeatherAPI:
             return None, str(e)
 
     """ locate by IP for real vs default weather values on load """    
-    def get_location_by_ip(self):
+    def get_location_by_ip(self, use_cache=True):
+        """ City for this machine's IP, answered from the location store while it is fresh """
+        store = get_location_store()
+        if use_cache:
+            cached_city = store.get_ip_location()
+            if cached_city:
+                return cached_city, None
+
         try:
-            response = requests.get("http://ip-api.com/json/")
+            response = get_session().get(IP_LOCATION_URL, timeout=IP_LOOKUP_TIMEOUT)
             if response.status_code == 200:
                 data = response.json()
                 if data['status'] == 'success':
+                    store.set_ip_location(data['city'])
                     return data['city'], None
                 else:
                     return None, "Could not determine location from IP"
@@ -120,27 +254,7 @@ class OpenWeatherAPI:
             return None, str(e)
 
         
-    def alternate_fetch_open_weather(self, select_city, language="en"):
-        try: 
-            params = {
-                "q": select_city,
-                "appid": alternate_api_key, 
-                "units": "metric",
-                "lang": language 
-            } 
-            """ This is primarily to handle bad/expired API key and will have nominal error handling before kicking to tertiary """
-            
-            response = requests.get(weather_url, params=params)
-            
-            if response.status_code == 200:
-                weather_json_data = response.json()
-                return weather_json_data, None
-            # elif response.status_code == 401: 
-                
-               
-                """ 401 API related/Handle through retry and alternate API """
-            else:
-                return None, f"City {select_city} not found."
-        except Exception as e:
-            return None, str(e)
-
+    def alternate_fetch_open_weather(self, select_city):
+        """ This is primarily to handle bad/expired API key and will have nominal error handling before kicking to tertiary """
+        weather_json_data, error, _ = self._request_current(select_city, settings.alternate_api_key)
+        return weather_json_data, error
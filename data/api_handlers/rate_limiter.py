@@ -0,0 +1,232 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date
+from urllib.parse import parse_qs, urlparse
+
+
+""" Client-side pacing and daily quota accounting per provider and API key, shared by every thread """
+
+OPENWEATHER = "openweather"
+OPEN_METEO = "open-meteo"
+
+""" Free-tier limits. OpenWeather: 60/min, 1M/month. Open-Meteo (non-commercial): 600/min, 10k/day """
+PROVIDER_LIMITS = {
+    OPENWEATHER: {"per_minute": 60, "per_day": 30000},
+    OPEN_METEO: {"per_minute": 600, "per_day": 10000},
+}
+
+PROVIDER_HOSTS = {
+    "api.openweathermap.org": OPENWEATHER,
+    "api.open-meteo.com": OPEN_METEO,
+    "archive-api.open-meteo.com": OPEN_METEO,
+    "geocoding-api.open-meteo.com": OPEN_METEO,
+}
+
+""" Seconds a UI lookup may wait for a slot, bulk jobs pass timeout=None and are paced instead """
+INTERACTIVE_WAIT = 5
+
+QUOTA_PATH = "data/cache/api_quota.json"
+SAVE_INTERVAL = 5   # seconds between quota file writes
+
+
+def key_id(api_key):
+    """Short stable id for an API key, the key itself is never written to disk"""
+    if not api_key:
+        return "-"
+    return hashlib.sha1(api_key.encode("utf-8")).hexdigest()[:8]
+
+
+class TokenBucket:
+    """Refills rate tokens per second up to capacity"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available, otherwise return the seconds until they will be"""
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens=1, timeout=None, cancel=None):
+        """
+        Block until tokens are available. False if that would take longer than timeout,
+        or as soon as the cancel event (threading.Event) is set
+        """
+        tokens = min(tokens, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if cancel is not None and cancel.is_set():
+                return False
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            if cancel is not None:
+                cancel.wait(wait)
+            else:
+                time.sleep(wait)
+
+
+class QuotaCounter:
+    """Calls per provider/key for the current day, persisted so restarts keep counting"""
+
+    def __init__(self, path=QUOTA_PATH):
+        self.path = path
+        self.day = date.today().isoformat()
+        self.counts = {}
+        self._dirty = False
+        self._last_save = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if data.get("date") == self.day:
+                self.counts = data.get("counts", {})
+        except (OSError, ValueError):
+            pass
+
+    def _roll_day(self):
+        today = date.today().isoformat()
+        if today != self.day:
+            self.day = today
+            self.counts = {}
+            self._dirty = True
+
+    def used(self, name):
+        with self._lock:
+            self._roll_day()
+            return self.counts.get(name, 0)
+
+    def snapshot(self):
+        with self._lock:
+            self._roll_day()
+            return dict(self.counts)
+
+    def add(self, name, calls=1):
+        with self._lock:
+            self._roll_day()
+            self.counts[name] = self.counts.get(name, 0) + calls
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= SAVE_INTERVAL
+        if due:
+            self.save()
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"date": self.day, "counts": dict(self.counts)}
+            self._dirty = False
+            self._last_save = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not save API quota counters: {e}")
+
+
+class RateLimiter:
+    """One token bucket per provider/key plus the shared daily QuotaCounter"""
+
+    def __init__(self, limits=PROVIDER_LIMITS, quota_path=QUOTA_PATH):
+        self.limits = limits
+        self.quota = QuotaCounter(quota_path)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _name(provider, api_key):
+        return f"{provider}:{key_id(api_key)}"
+
+    def _bucket(self, provider, api_key):
+        name = self._name(provider, api_key)
+        with self._lock:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                per_minute = self.limits[provider]["per_minute"]
+                bucket = self._buckets[name] = TokenBucket(per_minute / 60, per_minute)
+            return bucket
+
+    def acquire(self, provider, api_key=None, tokens=1, timeout=None, cancel=None):
+        """
+        Wait for a call slot. False when the key's daily quota is spent or no slot
+        frees up within timeout (None waits as long as needed, for bulk jobs).
+        Bulk jobs pass their stop event as cancel, so shutting down never waits on pacing
+        """
+        if self.remaining(provider, api_key) < tokens:
+            return False
+        return self._bucket(provider, api_key).acquire(tokens, timeout, cancel)
+
+    def record(self, provider, api_key=None, calls=1):
+        """Count calls that actually went out over the network"""
+        self.quota.add(self._name(provider, api_key), calls)
+
+    def remaining(self, provider, api_key=None):
+        """Calls left today for this provider/key"""
+        return max(0, self.limits[provider]["per_day"] - self.quota.used(self._name(provider, api_key)))
+
+    def usage(self):
+        """{provider:key_id: calls today}, for the quota report"""
+        return self.quota.snapshot()
+
+
+def provider_for_url(url):
+    """(provider, api_key, calls) for a request URL, None for hosts that aren't rate limited"""
+    parsed = urlparse(url)
+    provider = PROVIDER_HOSTS.get(parsed.hostname)
+    if provider is None:
+        return None
+
+    query = parse_qs(parsed.query)
+    api_key = query.get("appid", [None])[0]
+    # Open-Meteo counts every location in a multi-location request as one call
+    # (requests repeats latitude=, the aiohttp client sends a comma separated list)
+    calls = sum(len(value.split(",")) for value in query.get("latitude", [""])) if provider == OPEN_METEO else 1
+    return provider, api_key, calls
+
+
+def record_response(response, *args, **kwargs):
+    """requests response hook: counts calls that reached the network (cache hits never get here)"""
+    target = None if getattr(response, "from_cache", False) else provider_for_url(response.url)
+    if target:
+        provider, api_key, calls = target
+        get_rate_limiter().record(provider, api_key, calls)
+    return response
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Shared RateLimiter for all API handlers"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+            atexit.register(_rate_limiter.quota.save)
+        return _rate_limiter
@@ -1,28 +1,29 @@
 # Download the helper library from https://www.twilio.com/docs/python/install
-import os
-from twilio.rest import Client
-from dotenv import load_dotenv
-from features.alerts import SMS_Alerts
+from data.api_handlers.settings import settings, register_provider, get_provider
+
 
-load_dotenv()
 # Find your Account SID and Auth Token at twilio.com/console
 # and set the environment variables. See http://twil.io/secure
-account_sid = os.environ["TWILIO_ACCOUNT_SID"]
-auth_token = os.environ["TWILIO_AUTH_TOKEN"]
-client = Client(account_sid, auth_token)
-TWILIO_TOLLFREE = os.getenv("TWILIO_TOLLFREE")
+def _create_twilio_client():
+    """Twilio client, built on the first SMS rather than at import"""
+    from twilio.rest import Client
+
+    account_sid = settings.twilio_account_sid
+    auth_token = settings.twilio_auth_token
+    if not account_sid or not auth_token:
+        raise RuntimeError("Twilio credentials not configured (TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)")
+    return Client(account_sid, auth_token)
+
 
+register_provider("twilio", _create_twilio_client)
 
 
 def twilio_sms(alert):
     body = alert
-    message = client.messages.create(
+    message = get_provider("twilio").messages.create(
         body=body,
-        from_=f"+{TWILIO_TOLLFREE}",
+        from_=f"+{settings.twilio_tollfree}",
         to="+15415958129",
     )
 
     print(message.body)
-
-
-
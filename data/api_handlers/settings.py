@@ -0,0 +1,87 @@
+import os
+import threading
+
+
+""" Credentials and provider clients, created on first use. Importing an API module reads nothing and connects nothing """
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def load_env():
+    """Load .env once, on the first settings access (already exported variables win)"""
+    global _env_loaded
+    with _env_lock:
+        if not _env_loaded:
+            try:
+                from dotenv import load_dotenv
+                load_dotenv()
+            except ImportError:
+                pass  # plain environment variables still work
+            _env_loaded = True
+
+
+def get_setting(name, default=None):
+    load_env()
+    return os.getenv(name, default)
+
+
+class Settings:
+    """Named access to the .env keys, read on every access so tests can monkeypatch os.environ"""
+
+    @property
+    def weather_api_key(self):
+        return get_setting("open_weather_key")
+
+    @property
+    def alternate_api_key(self):
+        return get_setting("alternate_open_weather_api_key")
+
+    @property
+    def weather_url(self):
+        return get_setting("open_weather_url", "https://api.openweathermap.org/data/2.5/weather")
+
+    @property
+    def geo_url(self):
+        return get_setting("open_weather_geo_url", "https://api.openweathermap.org/geo/1.0/direct")
+
+    @property
+    def twilio_account_sid(self):
+        return get_setting("TWILIO_ACCOUNT_SID")
+
+    @property
+    def twilio_auth_token(self):
+        return get_setting("TWILIO_AUTH_TOKEN")
+
+    @property
+    def twilio_tollfree(self):
+        return get_setting("TWILIO_TOLLFREE")
+
+
+settings = Settings()
+
+
+""" Provider registry: modules register a factory at import (free), the client is built on first get_provider() """
+
+_factories = {}
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def register_provider(name, factory):
+    with _providers_lock:
+        _factories[name] = factory
+
+
+def get_provider(name):
+    """Shared client for a registered provider, created once. Factory errors propagate to the caller"""
+    with _providers_lock:
+        if name not in _providers:
+            _providers[name] = _factories[name]()
+        return _providers[name]
+
+
+def reset_providers():
+    """Drop created clients (tests, credential changes)"""
+    with _providers_lock:
+        _providers.clear()
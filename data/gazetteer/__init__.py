@@ -0,0 +1,3 @@
+from .gazetteer import Gazetteer, get_gazetteer
+
+__all__ = ['Gazetteer', 'get_gazetteer']
@@ -0,0 +1,200 @@
+import csv
+import heapq
+import os
+import threading
+import unicodedata
+from bisect import bisect_left
+
+
+""" Bundled seed list, plus an optional full GeoNames dump (cities15000.txt) dropped next to it """
+CITIES_PATH = "data/gazetteer/cities.csv"
+GEONAMES_PATH = "data/gazetteer/cities15000.txt"
+
+
+def normalize_name(name):
+    """Accent, case and whitespace insensitive form of a place name"""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.replace(".", " ").split()).casefold()
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    """Offline city index: exact lookup, prefix autocomplete and trigram fuzzy matching"""
+
+    def __init__(self, cities_path=CITIES_PATH, geonames_path=GEONAMES_PATH):
+        self.places = []
+        self._exact = {}            # normalized name -> place ids, most populous first
+        self._prefix_keys = []      # sorted (normalized name, place id) for bisect
+        self._trigram_index = {}    # trigram -> normalized names
+
+        if os.path.exists(cities_path):
+            self._load_csv(cities_path)
+        if geonames_path and os.path.exists(geonames_path):
+            self._load_geonames(geonames_path)
+
+        self._build_indexes()
+
+    def _load_csv(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                try:
+                    self._add_place(
+                        row['name'],
+                        [alt for alt in row.get('alternate_names', '').split('|') if alt],
+                        row['country_code'],
+                        row.get('admin1', ''),
+                        float(row['latitude']),
+                        float(row['longitude']),
+                        int(row.get('population') or 0)
+                    )
+                except (KeyError, ValueError) as e:
+                    print(f"Skipping gazetteer row {row}: {e}")
+
+    def _load_geonames(self, path):
+        """GeoNames tab separated dump, see https://download.geonames.org/export/dump/"""
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) < 15:
+                    continue
+                try:
+                    self._add_place(
+                        fields[1],
+                        [fields[2]] if fields[2] != fields[1] else [],
+                        fields[8],
+                        fields[10],
+                        float(fields[4]),
+                        float(fields[5]),
+                        int(fields[14] or 0)
+                    )
+                except ValueError:
+                    continue
+
+    def _add_place(self, name, alternate_names, country_code, admin1, lat, lon, population):
+        place = {
+            'name': name,
+            'country_code': country_code,
+            'admin1': admin1,
+            'latitude': lat,
+            'longitude': lon,
+            'population': population
+        }
+        place_id = len(self.places)
+        self.places.append(place)
+
+        for label in [name] + alternate_names:
+            key = normalize_name(label)
+            if key:
+                self._exact.setdefault(key, []).append(place_id)
+
+    def _build_indexes(self):
+        for key, place_ids in self._exact.items():
+            # Same place listed twice under one key (name and alternate) only counts once
+            unique_ids = list(dict.fromkeys(place_ids))
+            unique_ids.sort(key=lambda place_id: -self.places[place_id]['population'])
+            self._exact[key] = unique_ids
+
+            for place_id in unique_ids:
+                self._prefix_keys.append((key, place_id))
+            for gram in _trigrams(key):
+                self._trigram_index.setdefault(gram, set()).add(key)
+
+        self._prefix_keys.sort()
+
+    def __len__(self):
+        return len(self.places)
+
+    def complete(self, prefix, limit=8):
+        """Autocomplete: places whose name starts with prefix, most populous first"""
+        key = normalize_name(prefix)
+        if not key:
+            return []
+
+        start = bisect_left(self._prefix_keys, (key,))
+        matches = {}
+        for i in range(start, len(self._prefix_keys)):
+            name_key, place_id = self._prefix_keys[i]
+            if not name_key.startswith(key):
+                break
+            matches[place_id] = self.places[place_id]['population']
+
+        best = heapq.nlargest(limit, matches, key=matches.get)
+        return [self.places[place_id] for place_id in best]
+
+    def resolve(self, query):
+        """
+        Best place for a typed city name, None when the index has no match.
+        Accepts 'City', 'City, CC' or 'City, Region/Country code' forms.
+        """
+        if not query or not query.strip():
+            return None
+
+        name, _, qualifier = query.partition(",")
+        place_ids = self._exact.get(normalize_name(name))
+        if not place_ids:
+            return None
+
+        qualifier = normalize_name(qualifier)
+        if not qualifier:
+            return self.places[place_ids[0]]
+
+        for place_id in place_ids:
+            place = self.places[place_id]
+            if qualifier in (normalize_name(place['country_code']), normalize_name(place['admin1'])):
+                return place
+        return None
+
+    def fuzzy(self, query, limit=5, min_score=0.4):
+        """'Did you mean' suggestions ranked by trigram similarity"""
+        key = normalize_name(query)
+        if not key:
+            return []
+
+        grams = _trigrams(key)
+        overlap = {}
+        for gram in grams:
+            for candidate in self._trigram_index.get(gram, ()):
+                overlap[candidate] = overlap.get(candidate, 0) + 1
+
+        scored = []
+        for candidate, shared in overlap.items():
+            score = shared / len(grams | _trigrams(candidate))
+            if score >= min_score:
+                scored.append((score, candidate))
+
+        best = heapq.nlargest(limit, scored)
+        return [self.places[self._exact[candidate][0]] for _, candidate in best]
+
+    @staticmethod
+    def display_name(place):
+        """'City, Region, CC' label for dropdowns"""
+        parts = [place['name'], place['admin1'], place['country_code']]
+        return ", ".join(part for part in parts if part)
+
+    def query_name(self, place):
+        """
+        Search text that resolve() maps back to this place: 'City, CC', or 'City, Region'
+        when the country has a bigger place of the same name
+        """
+        query = f"{place['name']}, {place['country_code']}"
+        if self.resolve(query) is place or not place['admin1']:
+            return query
+        return f"{place['name']}, {place['admin1']}"
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer():
+    """Shared Gazetteer, loaded on first use"""
+    global _gazetteer
+    with _gazetteer_lock:
+        if _gazetteer is None:
+            _gazetteer = Gazetteer()
+        return _gazetteer
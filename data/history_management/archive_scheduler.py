@@ -0,0 +1,156 @@
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from ..api_handlers.cache_maintenance import run_cache_maintenance
+
+
+""" History jobs on a background thread in the app process, the window never waits for them """
+
+HISTORY_DAILY_AT = "01:00"      # daily history run, local time
+MAINTENANCE_HOURS = 6           # HTTP cache maintenance interval
+ALERT_SWEEP_MINUTES = 30        # weather alert sweep over registered users' cities
+STARTUP_DELAY = 5               # seconds after start before the first history run
+JITTER_SECONDS = 900            # random offset added to every scheduled run
+TICK_SECONDS = 30               # how often due jobs are checked
+
+
+class ArchiveScheduler:
+    """
+    Runs populate_history once shortly after start, then daily at HISTORY_DAILY_AT, cache
+    maintenance every MAINTENANCE_HOURS and the weather alert sweep every ALERT_SWEEP_MINUTES.
+    on_alerts({city: alert}) gets the alerts that are new or changed since the previous sweep,
+    on this thread (GUI callers hand it over with after()). Due times are wall-clock, so after a sleep or
+    hibernate every missed job runs once on wake-up (not once per missed slot). Each run is
+    offset by a random jitter, so many installs don't hit the APIs at the same second.
+    stop() wakes the thread at once and cancels a history run in progress: queued tasks are
+    dropped, running ones give up at their next rate limit wait (an HTTP call already sent
+    finishes or times out first).
+    """
+
+    def __init__(self, automation_factory=None, progress=None, daily_at=HISTORY_DAILY_AT,
+                 maintenance_hours=MAINTENANCE_HOURS, startup_delay=STARTUP_DELAY,
+                 jitter=JITTER_SECONDS, tick=TICK_SECONDS, on_alerts=None,
+                 alert_minutes=ALERT_SWEEP_MINUTES, alert_sweep=None):
+        self.automation_factory = automation_factory
+        self.progress = progress
+        self.on_alerts = on_alerts
+        self.alert_sweep = alert_sweep
+        self.daily_at = datetime.strptime(daily_at, "%H:%M").time()
+        self.maintenance_interval = timedelta(hours=maintenance_hours)
+        self.alert_interval = timedelta(minutes=alert_minutes)
+        self.startup_delay = startup_delay
+        self.jitter = jitter
+        self.tick = tick
+        self._automation = None
+        self._alerts = {}       # {city: alert} from the previous sweep
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _jitter(self, limit=None):
+        return timedelta(seconds=random.uniform(0, self.jitter if limit is None else limit))
+
+    def _next_daily(self, now):
+        run_at = datetime.combine(now.date(), self.daily_at)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return run_at + self._jitter()
+
+    def start(self):
+        """Start the background thread (no-op when it is already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="archive-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        """Ask the thread to finish and wait up to timeout seconds. True when it has stopped"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        now = datetime.now()
+        # Start-up run soon but not instantly (the window is still drawing), small jitter only
+        next_history = now + timedelta(seconds=self.startup_delay) + self._jitter(min(self.jitter, 60))
+        next_maintenance = now + self.maintenance_interval + self._jitter()
+        next_alerts = next_history
+
+        while not self._stop.is_set():
+            now = datetime.now()
+            if now >= next_history:
+                self._run_history()
+                next_history = self._next_daily(datetime.now())
+            if self._stop.is_set():
+                break
+            if now >= next_alerts:
+                self._run_alert_sweep()
+                next_alerts = datetime.now() + self.alert_interval + self._jitter(min(self.jitter, 60))
+            if self._stop.is_set():
+                break
+            if now >= next_maintenance:
+                run_cache_maintenance()
+                next_maintenance = datetime.now() + self.maintenance_interval + self._jitter()
+
+            # Short waits instead of sleeping until the next job: clock jumps after a
+            # suspend are noticed within one tick, and stop() returns immediately
+            self._stop.wait(self.tick)
+
+    def _run_history(self):
+        try:
+            if self._automation is None:
+                # Built on this thread, so creating the API clients never delays the window
+                if self.automation_factory is None:
+                    from .auto_api_history_builder import ForecastArchiveAutomation
+                    self.automation_factory = ForecastArchiveAutomation
+                self._automation = self.automation_factory()
+            started = time.monotonic()
+            self._automation.populate_history(progress=self.progress, stop=self._stop)
+            if not self._stop.is_set():
+                print(f"Historical data update complete in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            print(f"Error updating historical data: {e}")
+
+    def _run_alert_sweep(self):
+        """Bulk alert check of the alert cities, reports only alerts that are new or changed"""
+        try:
+            if self.alert_sweep is None:
+                from features.alerts import sweep_alert_cities
+                self.alert_sweep = sweep_alert_cities
+            alerts = self.alert_sweep(cancel=self._stop)
+        except Exception as e:
+            print(f"Error sweeping weather alerts: {e}")
+            return
+
+        if self._stop.is_set():
+            return
+        changed = {city: alert for city, alert in alerts.items() if self._alerts.get(city) != alert}
+        self._alerts = alerts
+        if not changed:
+            return
+        print(f"Weather alerts for {', '.join(changed)}")
+        if self.on_alerts:
+            try:
+                self.on_alerts(changed)
+            except Exception as e:
+                print(f"Error reporting weather alerts: {e}")
+
+
+_archive_scheduler = None
+_archive_scheduler_lock = threading.Lock()
+
+
+def get_archive_scheduler():
+    """Shared ArchiveScheduler for the app process"""
+    global _archive_scheduler
+    with _archive_scheduler_lock:
+        if _archive_scheduler is None:
+            _archive_scheduler = ArchiveScheduler()
+        return _archive_scheduler
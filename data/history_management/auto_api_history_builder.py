@@ -1,14 +1,13 @@
-import os
-import schedule 
-from schedule import every, repeat, run_pending
 import time
-import pandas as pd 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 # Link Data and Feature files for interactions
 from ..api_handlers.open_weather_api import OpenWeatherAPI
-from ..api_handlers.open_meteo_api import OpenMeteoAPI
+from ..api_handlers.open_meteo_api import MAX_BATCH_LOCATIONS, OpenMeteoAPI
 from features.weather_extract import WeatherProcessor
-from data.history_management.file_handler import save_weather
+from data.history_management.file_handler import flush_history, save_weather
+from data.history_management.history_archive import DAILY_HISTORY, city_slug, get_history_archive
+from data.history_management.history_store import get_history_store
 
 
 """ Function to call Openweather_api to populate data as backup for when API is down for locations that are frequently searched or from a list of user favorites """
@@ -24,11 +23,21 @@ from data.history_management.file_handler import save_weather
 
 
 
+""" Days of history a newly added city starts with """
+BASELINE_DAYS = 7
+
+""" Concurrent history tasks. Each API still paces itself through the shared rate limiter """
+HISTORY_MAX_WORKERS = 8
+
+RANGE_TASK = "range"    # past days from the Open-Meteo archive, one task per batch of cities
+TODAY_TASK = "today"    # today's row from OpenWeather current conditions, one task per city
+
+
 class ForecastArchiveAutomation:
-    def __init__(self, search_log_path='data/history_management/weather_history.csv', history_path='data/history_management/historical_search.csv', limit=10):
+    def __init__(self, store=None, archive=None, limit=10):
 
-        self.search_log_path = search_log_path
-        self.history_path = history_path
+        self.store = store or get_history_store()
+        self.archive = archive or get_history_archive()
         self.limit = limit
         self.weather_api = OpenWeatherAPI()  # Keep for current weather
         self.historical_api = OpenMeteoAPI()  # Add for historical data
@@ -37,12 +46,8 @@ class ForecastArchiveAutomation:
     
     """ TODO check user entered search for top 10 locations searched by count """
     def get_top_searched(self):
-        
-        if os.path.exists(self.search_log_path):
-            df = pd.read_csv(self.search_log_path)
-            if not df.empty and 'city' in df.columns:
-                return df['city'].value_counts().head(self.limit).index.tolist()
-        return []
+        flush_history()
+        return self.store.top_searched(self.limit)
     
     """ TODO + GUI element that appends and returns list(limit=10) """
     def get_user_favorites(self):
@@ -55,30 +60,27 @@ class ForecastArchiveAutomation:
     
     """ Combine list """
     def get_cities_list(self):
+        """ Top searched then favorites, in that order, one entry per city however it is capitalised """
         top_searched = self.get_top_searched()
         user_favorites = self.get_user_favorites()
 
-        all_cities = list(set(top_searched + user_favorites))
-        return all_cities 
-    
-    """ update historical_search.csv to maintain a min 7 days of data available for comparison """
-    def get_last_recorded_date(self):
-        if os.path.exists(self.history_path):
-            try:
-                # Check if file is empty
-                if os.path.getsize(self.history_path) == 0:
-                    return datetime.today().date() - timedelta(days=7)
-                
-                df = pd.read_csv(self.history_path)
-                if not df.empty and 'date' in df.columns:
-                    try:
-                        return pd.to_datetime(df['date']).max().date()
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+        cities = {}
+        for city in top_searched + user_favorites:
+            if city and city.strip():
+                cities.setdefault(city_slug(city), city.strip())
+        return list(cities.values())
+
+    """ update the daily history to maintain a min 7 days of data available for comparison """
+    def get_last_recorded_date(self, city):
+        """ Last complete archived day for a city from the watermark index, the baseline start when it has none """
+        try:
+            last_date = self.archive.watermark(city)
+            if last_date:
+                return last_date
+        except Exception:
+            pass
 
-        return datetime.today().date() - timedelta(days=7)
+        return datetime.today().date() - timedelta(days=BASELINE_DAYS)
     
     def _extract_minimal_weather_info(self, weather_json):
         """Extract only the fields we want for historical CSV"""
@@ -99,84 +101,166 @@ class ForecastArchiveAutomation:
             'longitude': round(weather_json['coord']['lon'], 4)
         }
 
-    def populate_history(self):
+    @staticmethod
+    def _task_result(task, city, start_date, end_date, error=None):
+        """ Outcome of one (task, city): ok with error None, or the error message """
+        return {
+            'task': task,
+            'city': city,
+            'start_date': start_date,
+            'end_date': end_date,
+            'ok': error is None,
+            'error': error
+        }
+
+    def _populate_range_batch(self, cities, start_date, end_date, stop=None):
+        """Archive every past day in the span for all cities from one batched archive exchange"""
+        batch = self.historical_api.fetch_historical_range_batch(cities, start_date, end_date, cancel=stop)
+
+        results = []
+        for city in cities:
+            range_data, error = batch.get(city, (None, "No response"))
+            if range_data is None or error:
+                results.append(self._task_result(RANGE_TASK, city, start_date, end_date, error or "No data"))
+                continue
+
+            # Columns go into the archive as they came, no per-day rows
+            self.archive.write_columns(range_data)
+            results.append(self._task_result(RANGE_TASK, city, start_date, end_date))
+        return results
+
+    def _save_city_today(self, city, today, stop=None):
+        """Save today's row from OpenWeather current conditions"""
+        weather_response, error = self.weather_api.fetch_open_weather(city, bulk=True, cancel=stop)
+        if not weather_response or error:
+            return [self._task_result(TODAY_TASK, city, today, today, error or "No response")]
+
+        # Use WeatherProcessor extraction for current data
+        processed = self.processor.extract_minimal_weather_info(weather_response)
+        if not processed:
+            return [self._task_result(TODAY_TASK, city, today, today, "Could not process weather data")]
+
+        processed['date'] = today.strftime("%Y-%m-%d")
+        # Archive under the requested name, same as the range rows. Today is never settled,
+        # so this row doesn't move the watermark and can't hide a failed range
+        processed['city'] = city
+        save_weather(processed, table=DAILY_HISTORY)
+        return [self._task_result(TODAY_TASK, city, today, today)]
+
+    def _history_tasks(self, cities, today):
+        """ (task, cities, start_date, end_date) for everything the cities are missing, no city twice per task """
+        tasks = []
+        for (start_date, end_date), span_cities in sorted(self._missing_spans(cities, today).items()):
+            for i in range(0, len(span_cities), MAX_BATCH_LOCATIONS):
+                tasks.append((RANGE_TASK, span_cities[i:i + MAX_BATCH_LOCATIONS], start_date, end_date))
+        tasks.extend((TODAY_TASK, [city], today, today) for city in cities if not self._has_today(city, today))
+        return tasks
+
+    def _has_today(self, city, today):
+        try:
+            return self.archive.has_day(city, today)
+        except Exception:
+            return False
+
+    def _run_task(self, task, cities, start_date, end_date, stop=None):
+        if stop is not None and stop.is_set():
+            return [self._task_result(task, city, start_date, end_date, "Cancelled") for city in cities]
+        try:
+            if task == RANGE_TASK:
+                return self._populate_range_batch(cities, start_date, end_date, stop)
+            return self._save_city_today(cities[0], start_date, stop)
+        except Exception as e:
+            return [self._task_result(task, city, start_date, end_date, str(e)) for city in cities]
+
+    def _missing_spans(self, cities, today):
+        """
+        {(start, end): [cities]} past days after each city's watermark, cities missing the same
+        span share one exchange. The span includes days that are stored but not settled or
+        incomplete yet, and everything after a gap left by a failed run
+        """
+        spans = {}
+        for city in cities:
+            start_date = self.get_last_recorded_date(city) + timedelta(days=1)
+            end_date = today - timedelta(days=1)
+            if start_date <= end_date:
+                spans.setdefault((start_date, end_date), []).append(city)
+        return spans
+
+    def populate_history(self, max_workers=HISTORY_MAX_WORKERS, progress=None, stop=None):
+        """
+        Archive the missing past days and today's row for every tracked city, tasks run on a
+        bounded thread pool. progress(done, total, results) is called on this thread after each
+        task (GUI callers hand it over with after()). Returns one result dict per (task, city),
+        sorted by task and city, whatever order the tasks finished in.
+        stop (threading.Event) ends the run early: queued tasks are dropped, running ones give
+        up at their next rate limit wait, and it returns once no worker is left
+        """
         today = datetime.today().date()
-        last_date = self.get_last_recorded_date()
         cities = self.get_cities_list()
 
         if not cities:
             print("No cities to process")
-            return
-        
-        days_diff = (today - last_date).days
-        if days_diff <= 0:
+            return []
+
+        # Queued rows advance watermarks too, one index lookup per city after this
+        flush_history()
+        tasks = self._history_tasks(cities, today)
+        if not tasks:
             print("History is up to date")
-            return
-        
-        date_range = [last_date + timedelta(days=i) for i in range(1, days_diff + 1)]
+            return []
+        stale = {city for _, task_cities, _, _ in tasks for city in task_cities}
+
+        results = []
+        done = 0
+        pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks))))
+        try:
+            futures = [pool.submit(self._run_task, *task, stop) for task in tasks]
+            for future in as_completed(futures):
+                task_results = future.result()
+                results.extend(task_results)
+                done += 1
+                if progress:
+                    try:
+                        progress(done, len(tasks), task_results)
+                    except Exception as e:
+                        print(f"Error reporting history progress: {e}")
+                if stop is not None and stop.is_set():
+                    break
+        finally:
+            # Waits for running tasks only, so nothing writes after the caller shuts down
+            pool.shutdown(wait=True, cancel_futures=True)
+        if done < len(tasks):
+            print(f"History update stopped after {done} of {len(tasks)} tasks")
 
+        # Rows are written by the background history writer, make the run complete on disk
+        flush_history()
 
-        for city in cities:
-            for target_date in date_range:
-                try:
-                    # Use different APIs based on date
-                    if target_date < datetime.today().date():
-                        # Use Open-Meteo for historical data
-                        weather_response, error = self.historical_api.fetch_historical_weather(city, target_date)
-                        if not weather_response or error:
-                            print(f"Failed to get weather data for {city} on {target_date}. Error: {error}")
-                            continue
-                
-                        # Use custom extraction for historical data
-                        processed = self._extract_minimal_weather_info(weather_response)
-                
-                    else:
-                        # Use OpenWeather for current data
-                        weather_response, error = self.weather_api.fetch_open_weather(city)
-                        if not weather_response or error:
-                            print(f"Failed to get weather data for {city} on {target_date}. Error: {error}")
-                            continue
-                
-                        # Use WeatherProcessor extraction for current data
-                        processed = self.processor.extract_minimal_weather_info(weather_response)
-            
-                    if not processed:
-                        print(f"Failed to process weather data for {city} on {target_date}")
-                        continue
-
-                    # Add the date
-                    processed['date'] = target_date.strftime("%Y-%m-%d")
-            
-                    # Save to historical file
-                    save_weather(processed, filepath=self.history_path)
-
-                    print(f"Successfully saved weather data for {city} on {target_date}")
-
-                    # Add small delay to avoid hitting API rate limits
-                    # time.sleep(0.1)
-
-                except Exception as e:
-                    print(f"Error processing {city} on {target_date}: {e}")
-                    continue
-
-    """ Run daily or on start-up to keep baseline data available for fallback, processing and GUI """
-    def run_daily(self):
-        schedule.every().day.at("01:00").do(self.populate_history)
+        order = {RANGE_TASK: 0, TODAY_TASK: 1}
+        results.sort(key=lambda result: (order[result['task']], city_slug(result['city'])))
+        failed = [result for result in results if not result['ok']]
+        print(f"History updated for {len(stale)} cities: {len(results) - len(failed)} saved, {len(failed)} failed")
+        for result in failed:
+            print(f"Failed {result['task']} for {result['city']} ({result['start_date']} to {result['end_date']}): {result['error']}")
+        return results
 
+    """ Run on start-up, daily runs and cache maintenance are scheduled by archive_scheduler.ArchiveScheduler """
     def run_once(self):
-        self.populate_history()
+        return self.populate_history()
 
 
 def main():
-    scheduler = ForecastArchiveAutomation()
-
-    scheduler.run_once()
-
-    scheduler.run_daily()
+    """ Standalone scheduler (the GUI runs the same ArchiveScheduler in its own process) """
+    from data.history_management.archive_scheduler import ArchiveScheduler
 
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    scheduler = ArchiveScheduler(automation_factory=ForecastArchiveAutomation, startup_delay=0)
+    scheduler.start()
+    try:
+        while scheduler.is_running():
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Stopping archive scheduler")
+    finally:
+        scheduler.stop()
 
 
 if __name__ == "__main__":
@@ -1,55 +1,159 @@
-import csv
-import os
+import atexit
+import queue
+import threading
+import time
 from datetime import datetime
 
+from data.history_management.history_archive import DAILY_HISTORY, get_history_archive
+from data.history_management.history_store import OBSERVATIONS, get_history_store
+
 """ TODO As this file progresses, consider Class designation for organization, dependencies and reusability. """
 
 """ Save weather default and search results for later access """
 
-def save_weather(weather_data, filepath="data/history_management/weather_history.csv"):
-    """ weather_data from Features.WeatherProcessor """
-    
-    # Handle coordinates - check if already flattened or needs flattening
-    if 'coordinates' in weather_data:
-        # Original format from WeatherProcessor
-        coordinates = weather_data.pop('coordinates', {})
-        weather_data['latitude'] = coordinates.get('lat')
-        weather_data['longitude'] = coordinates.get('lon')
-    # If latitude/longitude already exist as flat keys, leave them as-is
-
-    # Add timestamp
-    weather_data['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-    file_exist = os.path.isfile(filepath)
-    file_empty = not file_exist or os.path.getsize(filepath) == 0
-
-    headers = ["timestamp", "date", "city", "temp_min", "temp_max", "temp_mean", "latitude", "longitude"]
-
-    try:
-        with open(filepath, "a", newline="") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=headers)
-            
-            # write header
-            if file_empty:
-                writer.writeheader()
-            
-            row = {
-                "timestamp": weather_data.get('timestamp'),
-                "date": weather_data.get('date', 'N/A'),
-                "city": weather_data.get('city', 'Unknown'),
-                "temp_min": round(weather_data.get('temp_min', 0), 2) if weather_data.get           ('temp_min') not in [None, 'N/A'] else 'N/A',
-                "temp_max": round(weather_data.get('temp_max', 0), 2) if weather_data.get           ('temp_max') not in [None, 'N/A'] else 'N/A',
-                "temp_mean": round(weather_data.get('temp_mean', 0), 2) if weather_data.get         ('temp_mean') not in [None, 'N/A'] else 'N/A',
-                "latitude": round(weather_data.get('latitude', 0), 4) if weather_data.get           ('latitude') not in [None, 'N/A'] else 'N/A',
-                "longitude": round(weather_data.get('longitude', 0), 4) if weather_data.get         ('longitude') not in [None, 'N/A'] else 'N/A',
-            }
-
-            # Write weather data row
-            writer.writerow(row)
-    except Exception as e:
-        print(f"Error saving weather_data: {e}")
+""" Writer tuning: rows queued before save_weather blocks, rows per flush, seconds a row may wait """
+MAX_QUEUED_ROWS = 10000
+FLUSH_ROWS = 200
+FLUSH_SECONDS = 1.0
+
+_FLUSH = object()
+_STOP = object()
+
+
+def _rounded(value, places):
+    return round(value, places) if value not in [None, 'N/A'] else 'N/A'
+
+
+def history_row(weather_data):
+    """ History row for weather_data from Features.WeatherProcessor (weather_data itself is left untouched) """
+
+    # Handle coordinates - original nested format or already flattened keys
+    coordinates = weather_data.get('coordinates') or {}
+    latitude = weather_data.get('latitude', coordinates.get('lat'))
+    longitude = weather_data.get('longitude', coordinates.get('lon'))
+
+    return {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "date": weather_data.get('date', 'N/A'),
+        "city": weather_data.get('city', 'Unknown'),
+        "temp_min": _rounded(weather_data.get('temp_min'), 2),
+        "temp_max": _rounded(weather_data.get('temp_max'), 2),
+        "temp_mean": _rounded(weather_data.get('temp_mean'), 2),
+        "latitude": _rounded(latitude, 4),
+        "longitude": _rounded(longitude, 4),
+    }
+
+
+class HistoryWriter:
+    """
+    Single background thread owning history writes. Callers only enqueue rows,
+    the writer stores them in batches (FLUSH_ROWS rows or FLUSH_SECONDS, whichever
+    comes first) with one transaction per table per batch. flush() waits until
+    everything queued so far is stored, queued rows are also written at interpreter exit.
+    """
+
+    def __init__(self, max_queued=MAX_QUEUED_ROWS, flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS):
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._closed = False
+        self._close_lock = threading.Lock()    # nothing is queued behind _STOP
+        self._thread.start()
+
+    def submit(self, table, row):
+        """Queue a row for a HistoryStore table. Blocks only while the queue is full (the writer is behind)"""
+        with self._close_lock:
+            if not self._closed:
+                self._queue.put((table, row))
+                return
+        self._write_batch({table: [row]})
+
+    def flush(self):
+        """Wait until every row queued so far has been written"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._queue.put(_FLUSH)     # wakes the writer for an immediate write
+        self._queue.join()
+
+    def close(self):
+        """Write what is queued and stop the writer thread"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        pending = {}
+        rows = 0
+        taken = 0           # items taken from the queue, marked done once written
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+                taken += 1
+            except queue.Empty:
+                item = None     # oldest pending row waited flush_seconds
+
+            if item is not None and item is not _FLUSH and item is not _STOP:
+                table, row = item
+                pending.setdefault(table, []).append(row)
+                rows += 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_seconds
+                if rows < self.flush_rows and time.monotonic() < deadline:
+                    continue
+
+            if pending:
+                self._write_batch(pending)
+                pending = {}
+                rows = 0
+                deadline = None
+            for _ in range(taken):
+                self._queue.task_done()
+            taken = 0
+
+            if item is _STOP:
+                return
+
+    def _write_batch(self, batch):
+        for table, rows in batch.items():
+            try:
+                if table == DAILY_HISTORY:
+                    get_history_archive().write_rows(rows)
+                else:
+                    get_history_store().add_observations(rows)
+            except Exception as e:
+                print(f"Error saving weather_data: {e}")
+
+
+_history_writer = None
+_history_writer_lock = threading.Lock()
+
+
+def get_history_writer():
+    """Shared HistoryWriter, started on first use and flushed at exit"""
+    global _history_writer
+    with _history_writer_lock:
+        if _history_writer is None:
+            _history_writer = HistoryWriter()
+            atexit.register(_history_writer.close)
+        return _history_writer
+
+
+def flush_history():
+    """Make queued rows visible to HistoryStore readers"""
+    with _history_writer_lock:
+        writer = _history_writer
+    if writer is not None:
+        writer.flush()
 
 
+def save_weather(weather_data, table=OBSERVATIONS):
+    """ weather_data from Features.WeatherProcessor, stored by the background history writer.
+        table: OBSERVATIONS (search log) or DAILY_HISTORY (archive, one row per city and date) """
+    get_history_writer().submit(table, history_row(weather_data))
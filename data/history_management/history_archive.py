@@ -0,0 +1,364 @@
+import csv
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+from data.api_handlers.cache_policy import ARCHIVE_SETTLE_DAYS
+from data.api_handlers.meteo_columns import MeteoColumns
+
+
+""" Daily history as typed numpy columns, one .npz partition per city and month """
+
+ARCHIVE_DIR = "data/history_management/archive"
+LEGACY_HISTORY = "data/history_management/historical_search.csv"
+LEGACY_HISTORY_DB = "data/history_management/history.sqlite"
+WATERMARKS_FILE = "watermarks.json"
+LOCK_FILE = ".lock"
+
+DAILY_HISTORY = "daily_history"      # file_handler table name for rows stored here
+
+TEMPERATURE_COLUMNS = ["temp_min", "temp_max", "temp_mean"]
+
+""" Open-Meteo archive variables and the archive column each is stored as """
+METEO_COLUMNS = {
+    "temperature_2m_min": "temp_min",
+    "temperature_2m_max": "temp_max",
+    "temperature_2m_mean": "temp_mean",
+}
+
+
+def city_slug(city):
+    """Directory name for a city, case and punctuation insensitive"""
+    return re.sub(r"\W+", "_", city.strip().casefold()).strip("_") or "_"
+
+
+def _float(value):
+    return np.nan if value in (None, "", "N/A") else float(value)
+
+
+def _lock_file(path):
+    """Open path and take an exclusive lock on it, blocking until other processes release it"""
+    lock_file = open(path, "a+b")
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+    else:
+        lock_file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                continue    # LK_LOCK gives up after ~10 s, keep waiting
+    return lock_file
+
+
+def _unlock_file(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    lock_file.close()
+
+
+def _replace_atomically(path, write, mode="wb"):
+    """write(file) into a uniquely named temp file next to path, then move it over path"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(mode=mode, dir=directory, suffix=".tmp", delete=False)
+    try:
+        with tmp:
+            write(tmp)
+        os.replace(tmp.name, path)
+    except BaseException:
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+        raise
+
+
+class HistoryArchive:
+    """
+    root/<city>/<YYYY-MM>.npz with a datetime64[D] date index and float32 temperature
+    columns, sorted by date and unique per date (later writes replace earlier ones).
+    Reads open only the partitions of one city whose month overlaps the requested span,
+    then cut the span out of the sorted index with searchsorted. root/watermarks.json
+    keeps, per city, the last day up to which history is complete: every day from the
+    first stored one is present, has all TEMPERATURE_COLUMNS and is older than the
+    settle window. Rows after a gap, NaN rows and recent days are stored but stay past
+    the watermark, so the builder fetches them again until they are final.
+
+    Every read-modify-write (partition merge, watermark update, legacy import) holds
+    root/.lock, so the GUI and a standalone scheduler process can write at the same time.
+    Files are replaced atomically, readers never see a partial file and don't lock.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self.watermarks_path = os.path.join(root, WATERMARKS_FILE)
+        self.lock_path = os.path.join(root, LOCK_FILE)
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_handle = None
+        os.makedirs(root, exist_ok=True)
+
+    @contextmanager
+    def _exclusive(self):
+        """Thread lock plus the inter-process file lock, re-entrant within a thread"""
+        with self._lock:
+            if self._lock_depth == 0:
+                self._lock_handle = _lock_file(self.lock_path)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    _unlock_file(self._lock_handle)
+                    self._lock_handle = None
+
+    def _city_dir(self, city):
+        return os.path.join(self.root, city_slug(city))
+
+    def _partition_path(self, city, month):
+        return os.path.join(self._city_dir(city), f"{month}.npz")
+
+    def partitions(self, city, start_date=None, end_date=None):
+        """Months ('YYYY-MM') stored for a city that overlap start_date..end_date"""
+        city_dir = self._city_dir(city)
+        if not os.path.isdir(city_dir):
+            return []
+
+        first = str(start_date)[:7] if start_date else None
+        last = str(end_date)[:7] if end_date else None
+        months = sorted(name[:-4] for name in os.listdir(city_dir) if name.endswith(".npz"))
+        return [month for month in months if (not first or month >= first) and (not last or month <= last)]
+
+    @staticmethod
+    def _load(path):
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    """ Reads """
+
+    def read(self, city, start_date=None, end_date=None):
+        """MeteoColumns (date index, TEMPERATURE_COLUMNS) for a city, None when nothing is stored"""
+        parts = [self._load(self._partition_path(city, month)) for month in self.partitions(city, start_date, end_date)]
+        if not parts:
+            return None
+
+        time = np.concatenate([part["date"] for part in parts])
+        columns = {name: np.concatenate([part[name] for part in parts]) for name in TEMPERATURE_COLUMNS}
+        lat, lon = (float(value) for value in parts[-1]["coord"])
+        result = MeteoColumns(time, columns, city=str(parts[-1]["city"]), coord={'lat': lat, 'lon': lon})
+
+        if start_date or end_date:
+            result = result.between(start_date or time[0], end_date or time[-1])
+        return result
+
+    """ Watermarks """
+
+    def _read_watermarks(self):
+        try:
+            with open(self.watermarks_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_watermarks(self, marks):
+        _replace_atomically(self.watermarks_path, lambda f: json.dump(marks, f, indent=2, sort_keys=True), mode="w")
+
+    def watermarks(self):
+        """{city slug: 'YYYY-MM-DD'} last complete day per city, rebuilt from the partitions if missing"""
+        marks = self._read_watermarks()
+        if marks is None:
+            marks = self.rebuild_watermarks()
+        return marks
+
+    def rebuild_watermarks(self):
+        """Recompute watermarks.json from every partition of every city"""
+        with self._exclusive():
+            marks = {}
+            for entry in os.scandir(self.root):
+                if entry.is_dir():
+                    last = self._complete_until(entry.name, None)
+                    if last:
+                        marks[entry.name] = last
+            self._save_watermarks(marks)
+            return marks
+
+    def watermark(self, city):
+        """Last complete day (datetime.date) for a city, None when it has none yet"""
+        value = self.watermarks().get(city_slug(city))
+        return date.fromisoformat(value) if value else None
+
+    def last_date(self):
+        """Latest watermark across all cities, None when empty"""
+        values = self.watermarks().values()
+        return date.fromisoformat(max(values)) if values else None
+
+    def _complete_until(self, city, mark):
+        """
+        Last day of the gap-free run of complete, settled rows that follows mark
+        (from the first stored day when mark is None), mark itself when the next day is missing
+        """
+        settled = np.datetime64(date.today() - timedelta(days=ARCHIVE_SETTLE_DAYS), "D")
+        expected = np.datetime64(mark, "D") + 1 if mark else None
+        for month in self.partitions(city, expected, settled):
+            part = self._load(self._partition_path(city, month))
+            complete = ~np.any([np.isnan(part[name]) for name in TEMPERATURE_COLUMNS], axis=0)
+            for day, ok in zip(part["date"], complete):
+                if expected is not None and day < expected:
+                    continue
+                if day > settled or not ok or (expected is not None and day != expected):
+                    return mark
+                mark, expected = str(day), day + 1
+        return mark
+
+    def _advance_watermark(self, city):
+        """Move the city's watermark over the complete rows after it, caller holds _exclusive()"""
+        marks = self._read_watermarks()
+        if marks is None:
+            marks = self.rebuild_watermarks()
+        slug = city_slug(city)
+        mark = self._complete_until(city, marks.get(slug))
+        if mark and mark != marks.get(slug):
+            marks[slug] = mark
+            self._save_watermarks(marks)
+
+    def has_day(self, city, day):
+        """True when a row for day (any completeness) is stored for the city"""
+        stored = self.read(city, day, day)
+        return stored is not None and len(stored) > 0
+
+    """ Writes """
+
+    def write(self, city, dates, columns, coord=None):
+        """Merge rows for one city: dates, {column: values} (missing columns are NaN), coord {'lat', 'lon'}"""
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        if not len(dates):
+            return
+        values = {name: np.asarray(columns.get(name, np.full(len(dates), np.nan)), dtype=np.float32)
+                  for name in TEMPERATURE_COLUMNS}
+        months = dates.astype("datetime64[M]")
+
+        with self._exclusive():
+            for month in np.unique(months):
+                mask = months == month
+                self._merge(city, str(month), dates[mask], {name: column[mask] for name, column in values.items()}, coord)
+            self._advance_watermark(city)
+
+    def _merge(self, city, month, dates, values, coord):
+        """Read-modify-write of one partition, caller holds _exclusive()"""
+        path = self._partition_path(city, month)
+        coord = np.array([coord.get('lat', np.nan), coord.get('lon', np.nan)] if coord else [np.nan, np.nan], dtype=np.float64)
+
+        if os.path.exists(path):
+            old = self._load(path)
+            dates = np.concatenate([old["date"], dates])
+            values = {name: np.concatenate([old[name], values[name]]) for name in TEMPERATURE_COLUMNS}
+            if np.isnan(coord).all():
+                coord = old["coord"]
+
+        # Stable sort keeps old rows before new ones, the last row of each date wins
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        keep = np.append(dates[1:] != dates[:-1], True)
+
+        _replace_atomically(path, lambda f: np.savez(
+            f, date=dates[keep], coord=coord, city=np.array(city),
+            **{name: values[name][order][keep] for name in TEMPERATURE_COLUMNS}
+        ))
+
+    def write_rows(self, rows):
+        """Merge history rows (dicts with city, date, temp_* and latitude/longitude), rows without a date are skipped"""
+        by_city = {}
+        for row in rows:
+            if row.get("city") and row.get("date") not in (None, "", "N/A"):
+                by_city.setdefault(row["city"], []).append(row)
+
+        for city, city_rows in by_city.items():
+            last = city_rows[-1]
+            coord = {'lat': _float(last.get("latitude")), 'lon': _float(last.get("longitude"))}
+            self.write(
+                city,
+                [row["date"] for row in city_rows],
+                {name: [_float(row.get(name)) for row in city_rows] for name in TEMPERATURE_COLUMNS},
+                coord
+            )
+
+    def write_columns(self, range_data):
+        """Merge an Open-Meteo archive MeteoColumns (daily temperature_2m_* variables) as is"""
+        columns = {column: range_data[name] for name, column in METEO_COLUMNS.items() if name in range_data}
+        self.write(range_data.city, range_data.time, columns, range_data.coord)
+
+    """ Migration """
+
+    def migrate_legacy(self, csv_path=LEGACY_HISTORY, db_path=LEGACY_HISTORY_DB):
+        """
+        Import historical_search.csv and the daily_history table of history.sqlite once.
+        Runs under the archive lock: a second process starting at the same time waits,
+        then finds the marker and skips the import.
+        """
+        marker = os.path.join(self.root, ".migrated")
+        if os.path.exists(marker):
+            return
+        with self._exclusive():
+            if not os.path.exists(marker):
+                self._import_legacy(marker, csv_path, db_path)
+
+    def _import_legacy(self, marker, csv_path, db_path):
+
+        rows = []
+        if os.path.exists(csv_path):
+            try:
+                with open(csv_path, "r", newline="") as csvfile:
+                    rows.extend(csv.DictReader(csvfile))
+            except (OSError, csv.Error) as e:
+                print(f"Warning: Could not migrate {csv_path}: {e}")
+                return
+
+        if os.path.exists(db_path):
+            try:
+                conn = sqlite3.connect(db_path, timeout=10)
+                conn.row_factory = sqlite3.Row
+                try:
+                    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'daily_history'").fetchone():
+                        rows.extend(dict(row) for row in conn.execute("SELECT * FROM daily_history ORDER BY timestamp"))
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                print(f"Warning: Could not migrate daily history from {db_path}: {e}")
+                return
+
+        self.write_rows(rows)
+        _replace_atomically(marker, lambda f: f.write(datetime.now().isoformat()), mode="w")
+        print(f"Migrated {len(rows)} daily history rows into {self.root}")
+
+
+_history_archive = None
+_history_archive_lock = threading.Lock()
+
+
+def get_history_archive():
+    """Shared HistoryArchive, legacy daily history is imported on first use"""
+    global _history_archive
+    with _history_archive_lock:
+        if _history_archive is None:
+            _history_archive = HistoryArchive()
+            _history_archive.migrate_legacy()
+        return _history_archive
@@ -0,0 +1,212 @@
+import csv
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+
+""" Search log in one SQLite database (WAL), shared by the GUI and the scheduler process.
+    Daily history lives in the columnar archive, see history_archive """
+
+HISTORY_DB_PATH = "data/history_management/history.sqlite"
+LEGACY_SEARCH_LOG = "data/history_management/weather_history.csv"
+
+OBSERVATIONS = "observations"        # every displayed/searched current weather (search log)
+
+""" Search popularity halves every SEARCH_HALF_LIFE_DAYS, see search_counts """
+SEARCH_HALF_LIFE_DAYS = 30
+SEARCH_EPOCH = datetime(2025, 1, 1)
+
+OBSERVATION_COLUMNS = ["timestamp", "date", "city", "temp_min", "temp_max", "temp_mean", "latitude", "longitude"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    date TEXT,
+    city TEXT NOT NULL COLLATE NOCASE,
+    temp_min REAL,
+    temp_max REAL,
+    temp_mean REAL,
+    latitude REAL,
+    longitude REAL
+);
+CREATE INDEX IF NOT EXISTS observations_city_timestamp ON observations (city, timestamp);
+
+CREATE TABLE IF NOT EXISTS search_counts (
+    city TEXT PRIMARY KEY COLLATE NOCASE,
+    searches INTEGER NOT NULL,
+    score REAL NOT NULL,
+    last_searched TEXT
+);
+CREATE INDEX IF NOT EXISTS search_counts_searches ON search_counts (searches DESC);
+CREATE INDEX IF NOT EXISTS search_counts_score ON search_counts (score DESC);
+
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY
+);
+"""
+
+
+def _search_weight(timestamp):
+    """
+    Decayed weight of one search. Instead of shrinking every score as time passes, newer
+    searches weigh 2 ** (days since SEARCH_EPOCH / half life): the ranking is the same and
+    a search only ever touches its own city's row.
+    Limit: a float tops out near 2 ** 1024, about 84 years after SEARCH_EPOCH with a 30 day
+    half life (weights overflow to OverflowError from then on). Long before that, move
+    SEARCH_EPOCH forward and rebuild_search_counts(), which recomputes every score.
+    """
+    try:
+        moment = datetime.strptime(timestamp, "%Y-%m-%d %H:%M")
+    except (TypeError, ValueError):
+        moment = datetime.now()
+    days = (moment - SEARCH_EPOCH).total_seconds() / 86400
+    return 2.0 ** (days / SEARCH_HALF_LIFE_DAYS)
+
+
+def _nullable(value):
+    """'N/A' and empty CSV cells become NULL"""
+    return None if value in (None, "", "N/A") else value
+
+
+class HistoryStore:
+    """
+    Observations (search log) with indexed lookups by city, plus search_counts:
+    per-city search totals kept up to date on every write, so top-k never scans the log.
+    WAL lets one process write while others read, each thread keeps its own connection.
+    """
+
+    def __init__(self, db_path=HISTORY_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # busy timeout covers the other process holding the write lock for a batch
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    """ Writes """
+
+    def _add_observations(self, conn, rows):
+        values = [tuple(_nullable(row.get(column)) for column in OBSERVATION_COLUMNS) for row in rows]
+        conn.executemany(
+            f"INSERT INTO observations ({', '.join(OBSERVATION_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(OBSERVATION_COLUMNS))})",
+            values
+        )
+        self._count_searches(conn, rows)
+
+    def _count_searches(self, conn, rows):
+        """One upsert per row on search_counts"""
+        conn.executemany(
+            "INSERT INTO search_counts (city, searches, score, last_searched) VALUES (?, 1, ?, ?) "
+            "ON CONFLICT (city) DO UPDATE SET searches = searches + 1, score = score + excluded.score, "
+            "last_searched = MAX(COALESCE(last_searched, ''), COALESCE(excluded.last_searched, ''))",
+            [(row["city"], _search_weight(row.get("timestamp")), row.get("timestamp"))
+             for row in rows if row.get("city")]
+        )
+
+    def add_observations(self, rows):
+        """Append search log rows (dicts with OBSERVATION_COLUMNS keys) in one transaction"""
+        conn = self._connection()
+        with conn:
+            self._add_observations(conn, rows)
+
+    """ Reads """
+
+    def observations(self, city, limit=None):
+        """Most recent search log rows for a city (oldest first), list of dicts"""
+        query = "SELECT * FROM observations WHERE city = ? ORDER BY timestamp DESC, id DESC"
+        params = [city]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self._connection().execute(query, params).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def top_searched(self, limit=10, recent=False):
+        """
+        Most searched cities, an index walk over search_counts. Ranked by all-time searches,
+        recent=True ranks by popularity with a SEARCH_HALF_LIFE_DAYS half life instead.
+        """
+        order = "score DESC" if recent else "searches DESC, last_searched DESC"
+        rows = self._connection().execute(
+            f"SELECT city FROM search_counts ORDER BY {order} LIMIT ?", (limit,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _recount_searches(self, conn):
+        conn.execute("DELETE FROM search_counts")
+        rows = conn.execute("SELECT city, timestamp FROM observations ORDER BY id").fetchall()
+        self._count_searches(conn, [dict(row) for row in rows])
+
+    def rebuild_search_counts(self):
+        """Recount search_counts from the full search log (repair, the only full scan)"""
+        conn = self._connection()
+        with conn:
+            self._recount_searches(conn)
+
+    """ Migration """
+
+    def migrate_search_counts(self):
+        """Count the searches logged before search_counts existed, once"""
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM migrations WHERE name = 'search_counts'").fetchone():
+                return
+            self._recount_searches(conn)
+            conn.execute("INSERT INTO migrations (name) VALUES ('search_counts')")
+
+    def migrate_csv(self, search_log_path=LEGACY_SEARCH_LOG):
+        """Import the legacy search log CSV once, later runs (in any process) are no-ops"""
+        name = f"csv:{os.path.basename(search_log_path)}"
+        if not os.path.exists(search_log_path):
+            return
+        # Plain read first, every startup after the import skips parsing the CSV
+        conn = self._connection()
+        if conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone():
+            return
+
+        try:
+            with open(search_log_path, "r", newline="") as csvfile:
+                # Older search log rows have a different header, only shared columns are kept
+                rows = [row for row in csv.DictReader(csvfile) if row.get("city")]
+        except (OSError, csv.Error) as e:
+            print(f"Warning: Could not migrate {search_log_path}: {e}")
+            return
+
+        with conn:
+            # Write lock, then check again, so two processes starting together can't both import
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone():
+                return
+            self._add_observations(conn, rows)
+            conn.execute("INSERT INTO migrations (name) VALUES (?)", (name,))
+        print(f"Migrated {len(rows)} rows from {search_log_path} into {OBSERVATIONS}")
+
+
+_history_store = None
+_history_store_lock = threading.Lock()
+
+
+def get_history_store():
+    """Shared HistoryStore, the legacy search log is imported on first use"""
+    global _history_store
+    with _history_store_lock:
+        if _history_store is None:
+            _history_store = HistoryStore()
+            _history_store.migrate_csv()
+            _history_store.migrate_search_counts()
+        return _history_store
@@ -0,0 +1,74 @@
+import json
+import os
+import threading
+import time
+
+
+""" IP lookups are refreshed in the background, a day old answer is still fine for the first paint """
+IP_LOCATION_TTL = 24 * 3600
+DEFAULT_CITY = "Lebrija"
+
+
+class LocationStore:
+    """Detected (IP) location and last displayed city, persisted for an instant warm start"""
+
+    def __init__(self, location_file="data/cache/last_location.json", ip_ttl=IP_LOCATION_TTL):
+        self.location_file = location_file
+        self.ip_ttl = ip_ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(location_file), exist_ok=True)
+
+    def _load(self):
+        try:
+            with open(self.location_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _update(self, **values):
+        with self._lock:
+            data = self._load()
+            data.update(values)
+            tmp_path = f"{self.location_file}.tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, self.location_file)
+            except OSError as e:
+                print(f"Warning: Could not save location: {e}")
+
+    def get_ip_location(self, include_stale=False):
+        """Cached IP city, None when missing or older than the TTL (unless include_stale)"""
+        data = self._load()
+        city = data.get('ip_city')
+        if not city:
+            return None
+        if not include_stale and time.time() - data.get('ip_checked_at', 0) >= self.ip_ttl:
+            return None
+        return city
+
+    def set_ip_location(self, city):
+        self._update(ip_city=city, ip_checked_at=time.time())
+
+    def get_last_city(self):
+        return self._load().get('last_city')
+
+    def set_last_city(self, city):
+        if city and city != self.get_last_city():
+            self._update(last_city=city)
+
+    def startup_city(self, default=DEFAULT_CITY):
+        """City to show right away: last displayed, else last detected (even stale), else default"""
+        return self.get_last_city() or self.get_ip_location(include_stale=True) or default
+
+
+_location_store = None
+_location_store_lock = threading.Lock()
+
+
+def get_location_store():
+    global _location_store
+    with _location_store_lock:
+        if _location_store is None:
+            _location_store = LocationStore()
+        return _location_store
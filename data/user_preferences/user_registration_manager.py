@@ -117,6 +117,11 @@ class UserRegistrationManager:
         city = city.strip().title()
         return [user for user in users if user.get('city', '').lower() == city.lower()]
     
+    def get_alert_cities(self):
+        """Distinct cities active users want alerts for, for bulk alert sweeps"""
+        cities = [user.get('city', '').strip().title() for user in self.get_active_users()]
+        return list(dict.fromkeys(city for city in cities if city))
+    
     def _format_phone(self, phone):
         """Format phone number to consistent format"""
         # Remove all non-digit characters
@@ -55,7 +55,31 @@ class SMS_Alerts:
             return alert
         
         return None
-        
 
-       
 
+def sweep_alert_cities(cities=None, weather_api=None, cancel=None):
+    """
+    Bulk current-weather fetch for alert cities (registered users' cities by default). Returns {city: alert} for cities with an active alert.
+    Run every ALERT_SWEEP_MINUTES by archive_scheduler.ArchiveScheduler, cancel is its stop event.
+    Fetched concurrently by the asyncio client, or weather_api.fetch_open_weather_many when one is passed
+    """
+    from data.user_preferences.user_registration_manager import UserRegistrationManager
+
+    if cities is None:
+        cities = UserRegistrationManager().get_alert_cities()
+    if weather_api is not None:
+        fetched = weather_api.fetch_open_weather_many(cities, cancel=cancel)
+    else:
+        from data.api_handlers.async_weather_api import fetch_current_weather_many
+        fetched = fetch_current_weather_many(cities, cancel=cancel)
+
+    alerts = {}
+    sms_alerts = SMS_Alerts()
+    for city, (weather_json, error) in fetched.items():
+        if error:
+            print(f"Alert sweep: could not fetch {city}: {error}")
+            continue
+        alert = sms_alerts.weather_alerts(weather_json)
+        if alert:
+            alerts[city] = alert
+    return alerts
@@ -138,7 +138,64 @@ TRANSLATION = {
         "search_error": "Error searching for weather data",
         
         # UI Elements
-        "ok_button": "OK"
+        "ok_button": "OK",
+        
+        # Weather Conditions (OpenWeather condition id, see translate_condition)
+        "condition_200": "thunderstorm with light rain",
+        "condition_201": "thunderstorm with rain",
+        "condition_202": "thunderstorm with heavy rain",
+        "condition_210": "light thunderstorm",
+        "condition_211": "thunderstorm",
+        "condition_212": "heavy thunderstorm",
+        "condition_221": "ragged thunderstorm",
+        "condition_230": "thunderstorm with light drizzle",
+        "condition_231": "thunderstorm with drizzle",
+        "condition_232": "thunderstorm with heavy drizzle",
+        "condition_300": "light intensity drizzle",
+        "condition_301": "drizzle",
+        "condition_302": "heavy intensity drizzle",
+        "condition_310": "light intensity drizzle rain",
+        "condition_311": "drizzle rain",
+        "condition_312": "heavy intensity drizzle rain",
+        "condition_313": "shower rain and drizzle",
+        "condition_314": "heavy shower rain and drizzle",
+        "condition_321": "shower drizzle",
+        "condition_500": "light rain",
+        "condition_501": "moderate rain",
+        "condition_502": "heavy intensity rain",
+        "condition_503": "very heavy rain",
+        "condition_504": "extreme rain",
+        "condition_511": "freezing rain",
+        "condition_520": "light intensity shower rain",
+        "condition_521": "shower rain",
+        "condition_522": "heavy intensity shower rain",
+        "condition_531": "ragged shower rain",
+        "condition_600": "light snow",
+        "condition_601": "snow",
+        "condition_602": "heavy snow",
+        "condition_611": "sleet",
+        "condition_612": "light shower sleet",
+        "condition_613": "shower sleet",
+        "condition_615": "light rain and snow",
+        "condition_616": "rain and snow",
+        "condition_620": "light shower snow",
+        "condition_621": "shower snow",
+        "condition_622": "heavy shower snow",
+        "condition_701": "mist",
+        "condition_711": "smoke",
+        "condition_721": "haze",
+        "condition_731": "sand/dust whirls",
+        "condition_741": "fog",
+        "condition_751": "sand",
+        "condition_761": "dust",
+        "condition_762": "volcanic ash",
+        "condition_771": "squalls",
+        "condition_781": "tornado",
+        "condition_800": "clear sky",
+        "condition_801": "few clouds",
+        "condition_802": "scattered clouds",
+        "condition_803": "broken clouds",
+        "condition_804": "overcast clouds"
     },
     
     "es": {
@@ -277,7 +334,64 @@ TRANSLATION = {
         "search_error": "Error buscando datos meteorológicos",
         
         # UI Elements
-        "ok_button": "OK"
+        "ok_button": "OK",
+        
+        # Weather Conditions (OpenWeather condition id, see translate_condition)
+        "condition_200": "tormenta con lluvia ligera",
+        "condition_201": "tormenta con lluvia",
+        "condition_202": "tormenta con lluvia intensa",
+        "condition_210": "tormenta ligera",
+        "condition_211": "tormenta",
+        "condition_212": "tormenta fuerte",
+        "condition_221": "tormenta irregular",
+        "condition_230": "tormenta con llovizna ligera",
+        "condition_231": "tormenta con llovizna",
+        "condition_232": "tormenta con llovizna intensa",
+        "condition_300": "llovizna ligera",
+        "condition_301": "llovizna",
+        "condition_302": "llovizna intensa",
+        "condition_310": "llovizna con lluvia ligera",
+        "condition_311": "llovizna con lluvia",
+        "condition_312": "llovizna con lluvia intensa",
+        "condition_313": "chubascos y llovizna",
+        "condition_314": "chubascos fuertes y llovizna",
+        "condition_321": "chubascos de llovizna",
+        "condition_500": "lluvia ligera",
+        "condition_501": "lluvia moderada",
+        "condition_502": "lluvia intensa",
+        "condition_503": "lluvia muy intensa",
+        "condition_504": "lluvia extrema",
+        "condition_511": "lluvia helada",
+        "condition_520": "chubascos ligeros",
+        "condition_521": "chubascos",
+        "condition_522": "chubascos intensos",
+        "condition_531": "chubascos irregulares",
+        "condition_600": "nevada ligera",
+        "condition_601": "nieve",
+        "condition_602": "nevada intensa",
+        "condition_611": "aguanieve",
+        "condition_612": "chubascos ligeros de aguanieve",
+        "condition_613": "chubascos de aguanieve",
+        "condition_615": "lluvia y nieve ligeras",
+        "condition_616": "lluvia y nieve",
+        "condition_620": "chubascos ligeros de nieve",
+        "condition_621": "chubascos de nieve",
+        "condition_622": "chubascos fuertes de nieve",
+        "condition_701": "neblina",
+        "condition_711": "humo",
+        "condition_721": "bruma",
+        "condition_731": "remolinos de arena/polvo",
+        "condition_741": "niebla",
+        "condition_751": "arena",
+        "condition_761": "polvo",
+        "condition_762": "ceniza volcánica",
+        "condition_771": "turbonadas",
+        "condition_781": "tornado",
+        "condition_800": "cielo claro",
+        "condition_801": "algo de nubes",
+        "condition_802": "nubes dispersas",
+        "condition_803": "muy nuboso",
+        "condition_804": "nublado"
     },
     
     "hi": {
@@ -416,7 +530,64 @@ TRANSLATION = {
         "search_error": "मौसम डेटा खोजने में त्रुटि",
         
         # UI Elements
-        "ok_button": "ठीक"
+        "ok_button": "ठीक",
+        
+        # Weather Conditions (OpenWeather condition id, see translate_condition)
+        "condition_200": "हल्की बारिश के साथ आंधी-तूफ़ान",
+        "condition_201": "बारिश के साथ आंधी-तूफ़ान",
+        "condition_202": "भारी बारिश के साथ आंधी-तूफ़ान",
+        "condition_210": "हल्का आंधी-तूफ़ान",
+        "condition_211": "आंधी-तूफ़ान",
+        "condition_212": "भारी आंधी-तूफ़ान",
+        "condition_221": "रुक-रुक कर आंधी-तूफ़ान",
+        "condition_230": "हल्की बूंदाबांदी के साथ आंधी-तूफ़ान",
+        "condition_231": "बूंदाबांदी के साथ आंधी-तूफ़ान",
+        "condition_232": "भारी बूंदाबांदी के साथ आंधी-तूफ़ान",
+        "condition_300": "हल्की बूंदाबांदी",
+        "condition_301": "बूंदाबांदी",
+        "condition_302": "भारी बूंदाबांदी",
+        "condition_310": "हल्की बूंदाबांदी और बारिश",
+        "condition_311": "बूंदाबांदी और बारिश",
+        "condition_312": "भारी बूंदाबांदी और बारिश",
+        "condition_313": "बौछारें और बूंदाबांदी",
+        "condition_314": "भारी बौछारें और बूंदाबांदी",
+        "condition_321": "बूंदाबांदी की बौछारें",
+        "condition_500": "हल्की बारिश",
+        "condition_501": "मध्यम बारिश",
+        "condition_502": "भारी बारिश",
+        "condition_503": "बहुत भारी बारिश",
+        "condition_504": "अत्यधिक बारिश",
+        "condition_511": "जमने वाली बारिश",
+        "condition_520": "हल्की बौछारें",
+        "condition_521": "बौछारें",
+        "condition_522": "भारी बौछारें",
+        "condition_531": "रुक-रुक कर बौछारें",
+        "condition_600": "हल्की बर्फबारी",
+        "condition_601": "बर्फबारी",
+        "condition_602": "भारी बर्फबारी",
+        "condition_611": "बर्फ़ मिली बारिश",
+        "condition_612": "हल्की बर्फ़ मिली बौछारें",
+        "condition_613": "बर्फ़ मिली बौछारें",
+        "condition_615": "हल्की बारिश और बर्फ",
+        "condition_616": "बारिश और बर्फ",
+        "condition_620": "बर्फ की हल्की बौछारें",
+        "condition_621": "बर्फ की बौछारें",
+        "condition_622": "बर्फ की भारी बौछारें",
+        "condition_701": "धुंध",
+        "condition_711": "धुआं",
+        "condition_721": "कुहासा",
+        "condition_731": "रेत/धूल के बवंडर",
+        "condition_741": "कोहरा",
+        "condition_751": "रेत",
+        "condition_761": "धूल",
+        "condition_762": "ज्वालामुखीय राख",
+        "condition_771": "तेज़ हवा के झोंके",
+        "condition_781": "बवंडर",
+        "condition_800": "साफ आसमान",
+        "condition_801": "कुछ बादल",
+        "condition_802": "छितरे हुए बादल",
+        "condition_803": "टूटे हुए बादल",
+        "condition_804": "घने बादल"
     }
 }
 
@@ -465,6 +636,16 @@ def t(key, **kwargs):
     """Convenience alias for language_selector"""
     return language_selector(key, **kwargs)
 
+def translate_condition(condition_id, fallback=""):
+    """
+    Weather description for an OpenWeather condition id in the current language.
+    Weather is fetched once in English, so switching language never refetches.
+    Unknown ids fall back to English, then to the fallback text (the API description)
+    """
+    key = f"condition_{condition_id}"
+    translations = TRANSLATION.get(selected_language, TRANSLATION["en"])
+    return translations.get(key) or TRANSLATION["en"].get(key) or fallback
+
 # Additional utility functions for language management
 
 def get_available_languages():
@@ -547,6 +728,7 @@ __all__ = [
     'get_language', 
     'language_selector', 
     't',
+    'translate_condition',
     'get_available_languages',
     'get_language_name',
     'is_language_available',
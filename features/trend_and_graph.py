@@ -1,5 +1,6 @@
+from datetime import datetime
+
 from data.api_handlers.open_meteo_api import OpenMeteoAPI
-import pandas as pd
 
 
 class TrendandGraphProcessor:
@@ -8,52 +9,41 @@ class TrendandGraphProcessor:
         
 
     def process_city_trend(self, city_name):
-        """ Open-Meteo returns pandas dataframe when using their API call builder """
-        trend_df, error = self.api.meteo_forecast_and_trend(city_name)
+        """ Open-Meteo returns MeteoColumns (day index + numpy column per variable) """
+        trend_columns, error = self.api.meteo_forecast_and_trend(city_name)
 
         if error:
             return None, error
         
-        trend_df = trend_df.set_index('date')
-        trend_df = trend_df.sort_index()
-        trend_df = trend_df.dropna()
+        return trend_columns
 
-        """ round to nearest decimal, Open-Meteo returns 6 places """
-        trend_df['temperature_2m_max'] = trend_df['temperature_2m_max'].round(2)
-        trend_df['temperature_2m_min'] = trend_df['temperature_2m_min'].round(2)
-        
-        """ TODO cleaning data here/could be another function. Let's see if we pull in more Open-Meteo calls and need a seperate process and cleaning function """
-        
-        return trend_df 
-    
+    def process_city_trends(self, cities):
+        """ Batched process_city_trend, one Open-Meteo request for all cities. Returns {city: (trend_columns, error)} """
+        return self.api.meteo_forecast_and_trend_batch(cities)
 
     def get_seven_day_data(self, city):
         """Get 7 days of temperature data centered on today"""
         try:
-            trend_df = self.process_city_trend(city)
-            if trend_df is None:
+            trend_columns = self.process_city_trend(city)
+            if trend_columns is None or isinstance(trend_columns, tuple):
                 return None, "Failed to get weather data"
+
+            return self._seven_day_window(trend_columns)
+
+        except Exception as e:
+            return None, str(e)
+
+    def _seven_day_window(self, trend_columns):
+        """Cut the 7-day window centered on today out of the trend columns (views, no copies)"""
+        try:
+            # Find today's position in the day index, if today not found use middle of available data
+            today_index = trend_columns.index_of(datetime.now().date())
+            if today_index is None:
+                today_index = len(trend_columns) // 2
             
-            # Get today's date and find it in the data
-            from datetime import datetime, timedelta
-            today = datetime.now().date()
-            
-            # Convert DataFrame index to date for comparison
-            df_dates = [date.date() for date in trend_df.index]
-            
-            # Find today's position in the data
-            if today in df_dates:
-                today_index = df_dates.index(today)
-            else:
-                # If today not found, use middle of available data
-                today_index = len(df_dates) // 2
-            
-            # Calculate start and end indices for 7-day window (3 before, today, 3 after)
-            start_index = max(0, today_index - 3)
-            end_index = min(len(trend_df), today_index + 4)
-            
-            # Extract 7 days of data
-            seven_day_data = trend_df.iloc[start_index:end_index]
+            # 7-day window (3 before, today, 3 after)
+            seven_day_data = trend_columns.slice(today_index - 3, today_index + 4)
+            days = seven_day_data.dates()
             
             # Ensure we have exactly 7 days (pad with None if needed)
             max_temps = []
@@ -62,11 +52,11 @@ class TrendandGraphProcessor:
             
             for i in range(7):
                 if i < len(seven_day_data):
-                    max_temps.append(seven_day_data.iloc[i]['temperature_2m_max'])
-                    min_temps.append(seven_day_data.iloc[i]['temperature_2m_min'])
+                    """ round to nearest decimal, Open-Meteo returns 6 places. Missing values come back as None """
+                    max_temps.append(seven_day_data.value('temperature_2m_max', i, 2))
+                    min_temps.append(seven_day_data.value('temperature_2m_min', i, 2))
                     # Format as "Day MM/DD" (e.g., "Mon 12/30")
-                    date_str = seven_day_data.index[i].strftime('%a %m/%d')
-                    dates.append(date_str)
+                    dates.append(days[i].strftime('%a %m/%d'))
                 else:
                     max_temps.append(None)
                     min_temps.append(None)
@@ -120,7 +110,30 @@ class TrendandGraphProcessor:
             seven_day_data, error = self.get_seven_day_data(city)
             if error:
                 return None, error
-            
+
+            return self._trend_display_data(seven_day_data, city)
+
+        except Exception as e:
+            return None, str(e)
+
+    def prepare_trend_display_data_batch(self, cities):
+        """Prepare TrendPage display data for several cities from one batched request"""
+        display = {}
+        for city, (trend_columns, error) in self.process_city_trends(cities).items():
+            if error:
+                display[city] = (None, error)
+                continue
+
+            seven_day_data, error = self._seven_day_window(trend_columns)
+            if error:
+                display[city] = (None, error)
+            else:
+                display[city] = self._trend_display_data(seven_day_data, city)
+        return display
+
+    def _trend_display_data(self, seven_day_data, city):
+        """Add trend arrows to a 7-day window for display"""
+        try:
             max_temps = seven_day_data['max_temps']
             min_temps = seven_day_data['min_temps']
             dates = seven_day_data['dates']
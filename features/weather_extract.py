@@ -25,6 +25,8 @@ class WeatherProcessor:
         # Weather description
         weather_desc = weather_json['weather'][0]['description']
         weather_main = weather_json['weather'][0]['main']
+        # Condition id is language independent, descriptions are translated locally
+        condition_id = weather_json['weather'][0].get('id')
 
         # Associated condition weather icon
         weather_icon = weather_json['weather'][0]['icon']
@@ -53,6 +55,7 @@ class WeatherProcessor:
             'pressure': pressure,
             'description': weather_desc,
             'main_weather': weather_main,
+            'condition_id': condition_id,
             'weather_icon': weather_icon,
             'wind_speed': wind_speed,
             'wind_direction': wind_direction,
@@ -0,0 +1,100 @@
+import tkinter as tk
+
+# Link Data and Feature files for interactions
+from data.gazetteer import get_gazetteer
+
+
+class CityAutocomplete:
+    """
+    Suggestion list under a city entry, filled from the offline gazetteer as the user types.
+    on_select(query) gets the chosen place as 'City, CC' / 'City, Region' search text
+    """
+
+    def __init__(self, entry, on_select=None, limit=6, min_chars=2):
+        self.entry = entry
+        self.on_select = on_select
+        self.limit = limit
+        self.min_chars = min_chars
+        self.gazetteer = get_gazetteer()
+        self.suggestions = []
+        self.listbox = None
+
+        self.entry.bind("<KeyRelease>", self._on_key_release, add="+")
+        self.entry.bind("<Down>", self._focus_list, add="+")
+        self.entry.bind("<Escape>", lambda event: self.hide(), add="+")
+        self.entry.bind("<Return>", lambda event: self.hide(), add="+")
+        self.entry.bind("<FocusOut>", lambda event: self.entry.after(150, self._hide_if_unfocused), add="+")
+
+    def _on_key_release(self, event):
+        if event.keysym in ("Return", "Escape", "Down", "Up", "Tab"):
+            return
+
+        text = self.entry.get().strip()
+        if len(text) < self.min_chars:
+            self.hide()
+            return
+
+        self.suggestions = self.gazetteer.complete(text, limit=self.limit)
+        if self.suggestions:
+            self._show([self.gazetteer.display_name(place) for place in self.suggestions])
+        else:
+            self.hide()
+
+    def _show(self, labels):
+        toplevel = self.entry.winfo_toplevel()
+        if self.listbox is None:
+            self.listbox = tk.Listbox(toplevel, activestyle="none", exportselection=False)
+            self.listbox.bind("<ButtonRelease-1>", self._choose)
+            self.listbox.bind("<Return>", self._choose)
+            self.listbox.bind("<Escape>", lambda event: self._back_to_entry())
+
+        self.listbox.delete(0, "end")
+        for label in labels:
+            self.listbox.insert("end", label)
+        self.listbox.configure(height=len(labels))
+
+        # Place directly below the entry, in toplevel coordinates
+        x = self.entry.winfo_rootx() - toplevel.winfo_rootx()
+        y = self.entry.winfo_rooty() - toplevel.winfo_rooty() + self.entry.winfo_height()
+        self.listbox.place(x=x, y=y, width=self.entry.winfo_width())
+        self.listbox.lift()
+
+    def hide(self):
+        if self.listbox is not None:
+            self.listbox.place_forget()
+
+    def _hide_if_unfocused(self):
+        """Entry lost focus, keep the list only while the user is clicking into it"""
+        try:
+            if self.listbox is None:
+                return
+            pointer_x, pointer_y = self.entry.winfo_pointerxy()
+            over_list = self.entry.winfo_containing(pointer_x, pointer_y) is self.listbox
+            if not over_list and self.entry.focus_get() is not self.listbox:
+                self.hide()
+        except (tk.TclError, KeyError):
+            self.hide()
+
+    def _focus_list(self, event):
+        if self.listbox is not None and self.listbox.winfo_ismapped():
+            self.listbox.focus_set()
+            self.listbox.selection_set(0)
+            return "break"
+
+    def _back_to_entry(self):
+        self.hide()
+        self.entry.focus_set()
+
+    def _choose(self, event):
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+
+        # Qualified, so the search finds the picked place and not the biggest one of that name
+        query = self.gazetteer.query_name(self.suggestions[selection[0]])
+        self.entry.delete(0, "end")
+        self.entry.insert(0, query)
+        self._back_to_entry()
+
+        if self.on_select:
+            self.on_select(query)
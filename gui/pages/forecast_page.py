@@ -2,6 +2,10 @@ import customtkinter as ctk
 import threading
 from datetime import datetime, timedelta
 
+# Link Data and Feature files for interactions
+from data.gazetteer import get_gazetteer
+from .city_autocomplete import CityAutocomplete
+
 
 class ForecastPage(ctk.CTkFrame):
     """7-day weather forecast page with city selection and threading for data loading"""
@@ -112,6 +116,7 @@ class ForecastPage(ctk.CTkFrame):
         )
         self.city_entry.grid(row=0, column=3, padx=10, pady=5, sticky="ew")
         self.city_entry.bind("<Return>", self._on_city_entry)
+        self.city_autocomplete = CityAutocomplete(self.city_entry, on_select=self._search_city)
 
         # Search button
         search_button = ctk.CTkButton(
@@ -302,10 +307,15 @@ class ForecastPage(ctk.CTkFrame):
             self._show_status("Invalid city name format", "error")
             return
 
+        # Offline gazetteer answers known cities without a network round trip
+        if get_gazetteer().resolve(city_name):
+            self._on_valid_city_found(city_name)
+            return
+
         # Clear any previous status
         self._show_status("Searching...", "info")
         
-        # Start search in background thread
+        # Not in the local index, geocode over the network in background thread
         threading.Thread(target=self._validate_and_load_city, args=(city_name,), daemon=True).start()
 
     def _validate_city_name(self, city_name):
@@ -316,9 +326,9 @@ class ForecastPage(ctk.CTkFrame):
         if len(city_name) < 2 or len(city_name) > 50:
             return False
         
-        # Check for valid characters (letters, spaces, hyphens, apostrophes)
+        # Check for valid characters (letters, spaces, hyphens, apostrophes, 'City, CC' commas)
         import re
-        if not re.match(r"^[a-zA-Z\s\-'\.]+$", city_name):
+        if not re.match(r"^[a-zA-ZÀ-ÿ\s\-'\.,]+$", city_name):
             return False
             
         # Check for repeated characters (basic spam detection)
@@ -3,14 +3,14 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import threading
-import os
 from datetime import datetime, timedelta
 import queue
 import tkinter as tk
 
 # Link Data and Feature files for interactions
 from features.trend_and_graph import TrendandGraphProcessor
-from data.history_management.file_handler import save_weather
+from data.history_management.file_handler import flush_history
+from data.history_management.history_archive import get_history_archive
 
 
 class HistoricalPage(ctk.CTkFrame):
@@ -27,7 +27,6 @@ class HistoricalPage(ctk.CTkFrame):
         self._destroyed = False  # Track if widget is destroyed
         
         # Data sources
-        self.weather_history_path = 'data/history_management/weather_history.csv'
         self.trend_processor = TrendandGraphProcessor()
         
         # Current city tracking
@@ -219,11 +218,24 @@ class HistoricalPage(ctk.CTkFrame):
             
             # Queue the result
             self.data_queue.put(('cities_loaded', city_list))
+
+            # Prefetch trend data for every listed city in one batched request
+            self._prefetch_trend_data(city_list)
             
         except Exception as e:
             print(f"Error in _load_available_cities: {e}")
             self.data_queue.put(('error', f"Error loading cities: {str(e)}"))
 
+    def _prefetch_trend_data(self, cities):
+        """Fill cached_data with Open-Meteo trend data for all cities (threaded)"""
+        try:
+            batch = self.trend_processor.prepare_trend_display_data_batch(cities)
+            for city, (trend_data, error) in batch.items():
+                if not error and trend_data:
+                    self.cached_data[city] = trend_data
+        except Exception as e:
+            print(f"Error prefetching trend data: {e}")
+
     def _on_city_selected(self, city_name):
         """Handle city selection"""
         if city_name and city_name != "Loading..." and not self.is_loading:
@@ -240,20 +252,24 @@ class HistoricalPage(ctk.CTkFrame):
                 'trend_data': None
             }
             
-            # 1. Load CSV data first (fastest)
-            if os.path.exists(self.weather_history_path):
-                try:
-                    df = pd.read_csv(self.weather_history_path)
-                    city_data = df[df['city'].str.contains(city_name, case=False, na=False)]
-                    if not city_data.empty:
-                        data_sources['csv_data'] = city_data
-                except Exception as e:
-                    print(f"Error loading CSV data: {e}")
+            # 1. Load stored daily history first (fastest), including rows still queued for writing
+            try:
+                flush_history()
+                # Only this city's partitions for the last month are opened
+                history = get_history_archive().read(city_name, start_date=datetime.now().date() - timedelta(days=30))
+                if history is not None and len(history):
+                    data_sources['csv_data'] = history.to_dataframe()
+            except Exception as e:
+                print(f"Error loading history data: {e}")
             
             # 2. Get Open-Meteo 13-day data (5 past + current + 7 forecast)
             try:
-                trend_data, error = self.trend_processor.prepare_trend_display_data(city_name)
-                if not error and trend_data:
+                trend_data = self.cached_data.get(city_name)
+                if not trend_data:
+                    trend_data, error = self.trend_processor.prepare_trend_display_data(city_name)
+                    if not error and trend_data:
+                        self.cached_data[city_name] = trend_data
+                if trend_data:
                     data_sources['trend_data'] = trend_data
             except Exception as e:
                 print(f"Error loading trend data: {e}")
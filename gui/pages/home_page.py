@@ -3,19 +3,22 @@ import customtkinter as ctk
 from PIL import ImageTk
 import tkintermapview
 import requests
-import io
 import random
 import re
+import threading
 
 # Link Data and Feature files for interactions
 from data.api_handlers.open_weather_api import OpenWeatherAPI
 from features.weather_extract import WeatherProcessor
 from data.history_management.file_handler import save_weather
-from features.language_select import set_language, get_language, language_selector as t
+from features.language_select import set_language, get_language, translate_condition, language_selector as t
 from features.alerts import SMS_Alerts
 from data.api_handlers.send_sms import twilio_sms
 from .toplevel_window import ToplevelWindow
+from .city_autocomplete import CityAutocomplete
+from .icon_cache import get_icon_cache
 from data.user_preferences.favorites_manager import FavoritesManager
+from data.user_preferences.location_store import DEFAULT_CITY, get_location_store
 from .weather_alerts_window import WeatherAlertsWindow
 from features.weather_quiz import WeatherQuiz
 
@@ -46,6 +49,9 @@ class HomePage(ctk.CTkFrame):
         self._build_panic_button_frame()
         self._build_weather_control_frame()
 
+        """ Weather icons to disk in the background (once), rendering never downloads """
+        get_icon_cache().prefetch()
+
         """ On-Load IP or Default Weather on build """
         self.load_default_weather()
 
@@ -211,7 +217,7 @@ class HomePage(ctk.CTkFrame):
             return False, "city_name_too_short"
         if len(city_name) > 50:
             return False, "city_name_too_long"
-        if not re.match(r"^[a-zA-ZÀ-ÿ\s\-'\.]+$", city_name):
+        if not re.match(r"^[a-zA-ZÀ-ÿ\s\-'\.,]+$", city_name):
             return False, "invalid_city_characters"
         if not re.search(r"[a-zA-ZÀ-ÿ]", city_name):
             return False, "city_name_no_letters"
@@ -365,6 +371,7 @@ class HomePage(ctk.CTkFrame):
         self.city_entry = ctk.CTkEntry(features_frame, placeholder_text=t("select_city_placeholder"), corner_radius=15)
         self.city_entry.grid(row=1, column=0, padx=5, pady=10, sticky="ew")
         self.city_entry.bind("<Return>", lambda event: self.search_weather(self.city_entry.get()))
+        self.city_autocomplete = CityAutocomplete(self.city_entry, on_select=self.search_weather)
 
         """TODO Import here to avoid circular imports"""
         from .forecast_page import ForecastPage
@@ -395,21 +402,31 @@ class HomePage(ctk.CTkFrame):
 
     # Default weather loading 
     def load_default_weather(self):
-        """Load to populate display at start up by IP look up"""
+        """Show the last city (or cached IP location) at start up, IP look up runs in the background"""
+        store = get_location_store()
+        first_run = store.get_last_city() is None and store.get_ip_location(include_stale=True) is None
+
+        if not first_run:
+            try:
+                self.update_weather(store.startup_city())
+            except Exception as e:
+                print(f"Error loading default weather: {e}")
+
+        # Nothing to show yet on first run: display the detected city once the look up returns
+        threading.Thread(target=self._refresh_ip_location, args=(first_run,), daemon=True).start()
+
+    def _refresh_ip_location(self, show_result):
+        """Background thread: refresh the stored IP location, hand the UI update back to Tk"""
         try:
             location, error = self.weather_api.get_location_by_ip()
-            if location:
-                self.update_weather(location)
-            else:
+            if not location:
                 print(f"Could not detect {error}")
-                self.update_weather("Lebrija")
         except Exception as e:
-            print(f"Error loading default weather: {e}")
-            # Final fallback
-            try:
-                self.update_weather("New Haven")
-            except:
-                print("Failed to load any default weather")
+            print(f"Error detecting location: {e}")
+            location = None
+
+        if show_result and self.current_weather is None:
+            self.after(0, self.update_weather, location or DEFAULT_CITY)
 
     # Search Entry bar handling 
     def search_weather(self, city_input):
@@ -456,8 +473,7 @@ class HomePage(ctk.CTkFrame):
             return False
 
         try:
-            current_language = get_language()
-            data, error = self.weather_api.fetch_open_weather(city, current_language)
+            data, error = self.weather_api.fetch_open_weather(city)
 
             if error:
                 print("Error:", error)
@@ -473,6 +489,7 @@ class HomePage(ctk.CTkFrame):
             if weather:
                 self.current_weather = weather
                 self.display_weather(weather)
+                get_location_store().set_last_city(weather['city'])
                 
                 # save weather data to csv
                 try:
@@ -515,6 +532,21 @@ class HomePage(ctk.CTkFrame):
             self.show_error_toplevel("error_title", "no_weather_data")
             return
 
+        try:
+            self.render_weather_text(weather)
+
+            # Update weather icon background
+            self.update_sun_widget_background(weather.get('weather_icon', '01d'))
+
+            # Update weather map
+            self.update_weather_map()
+            
+        except Exception as e:
+            print(f"Error displaying weather: {e}")
+            self.show_error_toplevel("error_title", "display_weather_error")
+
+    def render_weather_text(self, weather):
+        """Language dependent weather text only, no network. Used again on language change"""
         try:
             # Update city name frame with translation support
             city_text = t("city_display", city=weather['city'], country=weather['country'])
@@ -524,8 +556,8 @@ class HomePage(ctk.CTkFrame):
             temp_text = t("temperature_display", temp=f"{weather['temperature']:.1f}")
             self.temp_value.configure(text=temp_text)
 
-            # Update description frame
-            desc_text = weather['description'].title()
+            # Update description frame, translated locally from the condition id
+            desc_text = translate_condition(weather.get('condition_id'), weather['description']).title()
             self.desc_value.configure(text=desc_text)
 
             # Update humidity and wind frames
@@ -544,15 +576,8 @@ class HomePage(ctk.CTkFrame):
                 sunset_text = t("sunset_display", time=weather['sunset'])
                 self.sunset_time.configure(text=sunset_text)
 
-            # Update weather icon background
-            self.update_sun_widget_background(weather.get('weather_icon', '01d'))
-
-            # Update weather map
-            self.update_weather_map()
-            
         except Exception as e:
-            print(f"Error displaying weather: {e}")
-            self.show_error_toplevel("error_title", "display_weather_error")
+            print(f"Error rendering weather text: {e}")
 
     def update_weather_map(self):
         """Update map position based on current weather location with error handling"""
@@ -1092,40 +1117,27 @@ class HomePage(ctk.CTkFrame):
             if not hasattr(self, 'sun_background_label'):
                 print("Sun background label not found")
                 return
-                
-            # Load weather icon from OpenWeatherMap
-            icon_url = f"https://openweathermap.org/img/wn/{weather_icon}@2x.png"
-            
-            response = requests.get(icon_url, timeout=5)
-            if response.status_code == 200:
-                # Load the icon image
-                from PIL import Image
-                icon_image = Image.open(io.BytesIO(response.content))
-                
-                # Get the current widget size
-                widget_width = self.sun_background_label.winfo_width() or 100
-                widget_height = self.sun_background_label.winfo_height() or 100
-                
-                # Resize to fit the widget
-                icon_image = icon_image.resize((widget_width, widget_height), Image.Resampling.LANCZOS)
-                
-                # Convert to CTkImage
-                icon_ctk_image = ctk.CTkImage(
-                    light_image=icon_image, 
-                    dark_image=icon_image, 
-                    size=(widget_width, widget_height)
+
+            # Get the current widget size
+            widget_width = self.sun_background_label.winfo_width() or 100
+            widget_height = self.sun_background_label.winfo_height() or 100
+
+            # Cached icon, resized once per widget size, no network on the UI thread
+            icon_ctk_image = get_icon_cache().get(weather_icon, (widget_width, widget_height))
+            if icon_ctk_image is None:
+                # First time this icon is seen: download in the background, redraw when it lands
+                get_icon_cache().fetch_async(
+                    weather_icon,
+                    lambda: self.after(0, self.update_sun_widget_background, weather_icon)
                 )
-                
-                # Set as background
-                self.sun_background_label.configure(image=icon_ctk_image, text="")
-                
-                # Keep a reference to prevent garbage collection
-                self.sun_background_label.image = icon_ctk_image
-                
-                print(f"Weather icon background updated successfully with icon: {weather_icon}")
-            else:
-                print(f"Failed to load weather icon: {weather_icon}")
-                
+                return
+
+            # Set as background
+            self.sun_background_label.configure(image=icon_ctk_image, text="")
+
+            # Keep a reference to prevent garbage collection
+            self.sun_background_label.image = icon_ctk_image
+
         except Exception as e:
             print(f"Error updating sun widget background: {e}")
 
@@ -0,0 +1,158 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import customtkinter as ctk
+from PIL import Image
+
+from data.api_handlers.http_client import get_session
+
+
+""" OpenWeather icon codes (day/night variants), there are only these 18 """
+ICON_CODES = [f"{code}{period}" for code in ("01", "02", "03", "04", "09", "10", "11", "13", "50") for period in ("d", "n")]
+ICON_URL = "https://openweathermap.org/img/wn/{code}@2x.png"
+ICON_DIR = "data/cache/icons"
+
+
+class WeatherIconCache:
+    """
+    Weather icons in three layers: PNGs on disk (downloaded once), decoded PIL images
+    in an LRU, and CTkImages already resized per widget size. get() never touches the
+    network, downloads only happen on a background thread through fetch_async/prefetch.
+    """
+
+    def __init__(self, icon_dir=ICON_DIR, max_decoded=len(ICON_CODES), max_variants=64):
+        self.icon_dir = icon_dir
+        self.max_decoded = max_decoded
+        self.max_variants = max_variants
+        self._decoded = OrderedDict()     # code -> PIL.Image
+        self._variants = OrderedDict()    # (code, width, height) -> CTkImage
+        self._lock = threading.Lock()
+        self._downloading = {}            # code -> on_ready callbacks waiting for its download
+        os.makedirs(icon_dir, exist_ok=True)
+
+    def icon_path(self, code):
+        return os.path.join(self.icon_dir, f"{code}@2x.png")
+
+    def _remember(self, cache, key, value, limit):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+    def _decode(self, code):
+        """Decoded icon from memory or disk, None when it hasn't been downloaded yet"""
+        with self._lock:
+            image = self._decoded.get(code)
+            if image is not None:
+                self._decoded.move_to_end(code)
+                return image
+
+        path = self.icon_path(code)
+        if not os.path.exists(path):
+            return None
+        try:
+            with Image.open(path) as f:
+                image = f.convert("RGBA")
+        except OSError as e:
+            print(f"Warning: Corrupt icon {path}, downloading again: {e}")
+            os.remove(path)
+            return None
+
+        with self._lock:
+            self._remember(self._decoded, code, image, self.max_decoded)
+        return image
+
+    def get(self, code, size):
+        """CTkImage of the icon at size (width, height), None when it is not on disk yet"""
+        key = (code, size[0], size[1])
+        with self._lock:
+            variant = self._variants.get(key)
+            if variant is not None:
+                self._variants.move_to_end(key)
+                return variant
+
+        image = self._decode(code)
+        if image is None:
+            return None
+
+        # Resampled once per size, CTkImage then keeps its own scaled PhotoImage
+        resized = image.resize(size, Image.Resampling.LANCZOS)
+        variant = ctk.CTkImage(light_image=resized, dark_image=resized, size=size)
+        with self._lock:
+            self._remember(self._variants, key, variant, self.max_variants)
+        return variant
+
+    def fetch(self, code):
+        """Download an icon to disk if it isn't there. Returns True when it is available"""
+        path = self.icon_path(code)
+        if os.path.exists(path):
+            return True
+        try:
+            response = get_session().get(ICON_URL.format(code=code), timeout=5)
+            if response.status_code != 200:
+                print(f"Failed to load weather icon: {code}")
+                return False
+            # Uniquely named temp file, so an interrupted or parallel download never leaves a half icon at path
+            tmp = tempfile.NamedTemporaryFile(dir=self.icon_dir, suffix=".tmp", delete=False)
+            try:
+                with tmp:
+                    tmp.write(response.content)
+                os.replace(tmp.name, path)
+            except BaseException:
+                try:
+                    os.remove(tmp.name)
+                except OSError:
+                    pass
+                raise
+            return True
+        except Exception as e:
+            print(f"Error downloading weather icon {code}: {e}")
+            return False
+
+    def _claim(self, code, on_ready=None):
+        """True when the caller should download code, otherwise on_ready waits for the download in flight"""
+        with self._lock:
+            waiting = self._downloading.get(code)
+            if waiting is not None:
+                if on_ready:
+                    waiting.append(on_ready)
+                return False
+            self._downloading[code] = [on_ready] if on_ready else []
+            return True
+
+    def _download(self, code):
+        """fetch() a claimed icon, then run every on_ready that waited for it"""
+        try:
+            ok = self.fetch(code)
+        finally:
+            with self._lock:
+                waiting = self._downloading.pop(code, [])
+        if ok:
+            for on_ready in waiting:
+                on_ready()
+
+    def fetch_async(self, code, on_ready=None):
+        """Download an icon on a background thread, on_ready() runs (on that thread) once it is on disk"""
+        if self._claim(code, on_ready):
+            threading.Thread(target=self._download, args=(code,), daemon=True).start()
+
+    def prefetch(self, codes=ICON_CODES):
+        """Fill the disk cache with every icon in the background, a no-op once they are all there"""
+        # Claimed like fetch_async, so the two never download the same icon at once
+        missing = [code for code in codes if not os.path.exists(self.icon_path(code)) and self._claim(code)]
+        if missing:
+            threading.Thread(target=lambda: [self._download(code) for code in missing], daemon=True).start()
+
+
+_icon_cache = None
+_icon_cache_lock = threading.Lock()
+
+
+def get_icon_cache():
+    global _icon_cache
+    with _icon_cache_lock:
+        if _icon_cache is None:
+            _icon_cache = WeatherIconCache()
+        return _icon_cache
@@ -5,6 +5,9 @@ from .pages import HomePage, ForecastPage, TrendPage, HistoricalPage, FirePage
 
 # Link Data and Feature files for interactions  
 from features.language_select import set_language, get_language
+from data.api_handlers.http_client import close_sessions
+from data.history_management.archive_scheduler import get_archive_scheduler
+from data.history_management.file_handler import get_history_writer
 
 """ default to dark mode but add variable and button """
 ctk.set_appearance_mode("Dark")  
@@ -42,6 +45,34 @@ class App(ctk.CTk):
 
         self.show_frame(HomePage)
 
+        """ History fills in behind the window: background scheduler, stopped on close """
+        self.window_title = "Weather Wonderland"
+        self.archive_scheduler = get_archive_scheduler()
+        self.archive_scheduler.progress = self._history_progress
+        self.archive_scheduler.on_alerts = self._weather_alerts
+        self.after(0, self.archive_scheduler.start)
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+    def _history_progress(self, done, total, results):
+        """Scheduler thread callback, the title update is handed to the Tk loop"""
+        title = self.window_title if done == total else f"{self.window_title} - updating history {done}/{total}"
+        self.after(0, self.title, title)
+
+    def _weather_alerts(self, alerts):
+        """Scheduler thread callback for new alerts in registered users' cities, shown by the Tk loop"""
+        self.after(0, self.frames[HomePage].top_level_weather_alert, "\n\n".join(alerts.values()))
+
+    def on_closing(self):
+        """Stop background work, write queued history and close HTTP sessions before exiting"""
+        try:
+            if not self.archive_scheduler.stop(timeout=5):
+                print("History update still finishing, its remaining rows are written directly")
+            get_history_writer().close()
+            close_sessions()
+        except Exception as e:
+            print(f"Error during shutdown: {e}")
+        self.destroy()
+
     def show_frame(self, page_class):
         frame = self.frames[page_class]
         frame.tkraise()
@@ -64,12 +95,10 @@ class App(ctk.CTk):
         from features.language_select import set_language
         set_language(selected_lang)
 
-        # Optional: refresh weather if HomePage has it
+        # Weather is stored language independent, re-render it in the new language (no refetch)
         home_page = self.frames.get(HomePage)
         if home_page and hasattr(home_page, 'current_weather') and home_page.current_weather:
-            city = home_page.current_weather.get('city')
-            if city:
-                home_page.update_weather(city)    
+            home_page.render_weather_text(home_page.current_weather)
 
 
 """ For testing layout """
@@ -2,19 +2,9 @@
 
 import setup_rich
 from gui.v2gui_main import App
-from data.history_management.auto_api_history_builder import ForecastArchiveAutomation
 
 if __name__ == "__main__":
-    # Run historical data update once on startup
-    
-    try:
-        scheduler = ForecastArchiveAutomation()
-        scheduler.run_once()
-        print("Historical data update complete.")
-    except Exception as e:
-        print(f"Error updating historical data: {e}")
-    
-    # Start GUI
+    # Start GUI, the history update runs on the app's background scheduler
     app = App()
     app.mainloop()
 
@@ -0,0 +1,66 @@
+import importlib.util
+import threading
+import unittest
+from unittest.mock import patch
+
+HAS_REQUESTS_CACHE = importlib.util.find_spec("requests_cache") is not None
+
+if HAS_REQUESTS_CACHE:
+    from data.history_management.archive_scheduler import ArchiveScheduler
+
+
+class BlockingAutomation:
+    """populate_history stand-in that runs until its stop event is set"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.stop = None
+
+    def populate_history(self, progress=None, stop=None):
+        self.stop = stop
+        self.started.set()
+        stop.wait(30)
+        return []
+
+
+@unittest.skipUnless(HAS_REQUESTS_CACHE, "requests_cache not installed")
+class TestArchiveScheduler(unittest.TestCase):
+
+    def test_stop_interrupts_a_running_history_update(self):
+        automation = BlockingAutomation()
+        scheduler = ArchiveScheduler(automation_factory=lambda: automation, startup_delay=0, jitter=0, tick=0.01,
+                                     alert_sweep=lambda cancel: {})
+        scheduler.start()
+        self.assertTrue(automation.started.wait(5))
+
+        self.assertTrue(scheduler.stop(timeout=5))
+        self.assertTrue(automation.stop.is_set())
+        self.assertFalse(scheduler.is_running())
+
+    def test_alert_sweep_reports_new_and_changed_alerts_only(self):
+        sweeps = iter([
+            {"Lima": "fog in Lima, PE!"},
+            {"Lima": "fog in Lima, PE!", "Quito": "heavy snow in Quito, EC!"},
+            {"Quito": "sleet in Quito, EC!"},
+        ])
+        reported = []
+        scheduler = ArchiveScheduler(on_alerts=reported.append, alert_sweep=lambda cancel: next(sweeps))
+        with patch("builtins.print"):
+            for _ in range(3):
+                scheduler._run_alert_sweep()
+
+        self.assertEqual(reported, [
+            {"Lima": "fog in Lima, PE!"},
+            {"Quito": "heavy snow in Quito, EC!"},
+            {"Quito": "sleet in Quito, EC!"},
+        ])
+
+    def test_alert_sweep_gets_the_stop_event(self):
+        cancels = []
+        scheduler = ArchiveScheduler(alert_sweep=lambda cancel: cancels.append(cancel) or {})
+        scheduler._run_alert_sweep()
+        self.assertIs(cancels[0], scheduler._stop)
+
+
+if __name__ == "__main__":
+    unittest.main()
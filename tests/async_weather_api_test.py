@@ -0,0 +1,119 @@
+import asyncio
+import importlib.util
+import unittest
+from unittest.mock import Mock, patch
+
+HAS_AIOHTTP = all(importlib.util.find_spec(name) for name in ("aiohttp", "openmeteo_requests", "requests_cache"))
+
+if HAS_AIOHTTP:
+    from aiohttp import web
+    from data.api_handlers import async_weather_api
+    from data.api_handlers.async_weather_api import AsyncWeatherClient
+    from data.api_handlers.circuit_breaker import OPEN, get_breaker
+    from data.api_handlers.rate_limiter import OPENWEATHER
+
+
+def _weather(city):
+    return {"name": city, "main": {"temp": 20}, "weather": [{"id": 800}], "coord": {"lat": 0, "lon": 0}}
+
+
+class WeatherServer:
+    """Local stand-in for the OpenWeather endpoint, tracks how many requests are in flight"""
+
+    def __init__(self, status=200, delay=0.05):
+        self.status = status
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.status != 200:
+                return web.json_response({}, status=self.status)
+            return web.json_response(_weather(request.query["q"]))
+        finally:
+            self.in_flight -= 1
+
+    async def run(self, client_code):
+        app = web.Application()
+        app.router.add_get("/weather", self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            with patch.dict("os.environ", {"open_weather_url": f"http://127.0.0.1:{port}/weather"}):
+                return await client_code()
+        finally:
+            await runner.cleanup()
+
+
+@unittest.skipUnless(HAS_AIOHTTP, "aiohttp, openmeteo_requests or requests_cache not installed")
+class TestAsyncWeatherClient(unittest.TestCase):
+
+    def setUp(self):
+        cache = Mock()
+        cache.get.return_value = None
+        patcher = patch.object(async_weather_api, "get_current_weather_cache", return_value=cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _gather(self, server, cities, key, max_concurrency=3):
+        async def client_code():
+            async with AsyncWeatherClient(max_concurrency=max_concurrency) as client:
+                return await client.gather(client.fetch_current_weather, cities)
+
+        with patch.dict("os.environ", {"open_weather_key": key}):
+            return asyncio.run(server.run(client_code))
+
+    def test_gather_fetches_every_city_under_the_concurrency_limit(self):
+        server = WeatherServer()
+        cities = [f"City {i}" for i in range(10)] + ["City 0"]
+        results = self._gather(server, cities, "async-test-key")
+
+        self.assertEqual(list(results), [f"City {i}" for i in range(10)])
+        self.assertTrue(all(error is None for _, error in results.values()))
+        self.assertEqual(results["City 7"][0]["name"], "City 7")
+        self.assertEqual(server.requests, 10)
+        self.assertLessEqual(server.max_in_flight, 3)
+
+    def test_failures_open_the_primary_key_circuit(self):
+        server = WeatherServer(status=503, delay=0)
+        breaker = get_breaker(OPENWEATHER, "async-failing-key")
+        results = self._gather(server, [f"City {i}" for i in range(breaker.min_calls)], "async-failing-key", max_concurrency=1)
+
+        self.assertTrue(all("Code: 503" in error for _, error in results.values()))
+        self.assertEqual(breaker.state, OPEN)
+
+        # Open circuit: no request goes out
+        results = self._gather(server, ["Lima"], "async-failing-key")
+        self.assertEqual(server.requests, breaker.min_calls)
+        self.assertIsNone(results["Lima"][0])
+
+
+@unittest.skipUnless(HAS_AIOHTTP, "aiohttp, openmeteo_requests or requests_cache not installed")
+class TestAlertSweep(unittest.TestCase):
+
+    def test_sweep_uses_the_async_client(self):
+        from features.alerts import sweep_alert_cities
+
+        fog = {"name": "Lima", "sys": {"country": "PE"}, "weather": [{"id": 741}]}
+        clear = {"name": "Quito", "sys": {"country": "EC"}, "weather": [{"id": 800}]}
+        fetched = {"Lima": (fog, None), "Quito": (clear, None), "Nowhere": (None, "not found")}
+        cancel = Mock()
+        with patch.object(async_weather_api, "fetch_current_weather_many", return_value=fetched) as fetch_many, \
+                patch("builtins.print"):
+            alerts = sweep_alert_cities(["Lima", "Quito", "Nowhere"], cancel=cancel)
+
+        fetch_many.assert_called_once_with(["Lima", "Quito", "Nowhere"], cancel=cancel)
+        self.assertEqual(alerts, {"Lima": "fog in Lima, PE!\nTake caution"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import importlib.util
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+HAS_BUILDER_DEPS = all(importlib.util.find_spec(name) for name in ("numpy", "requests_cache", "openmeteo_requests"))
+
+if HAS_BUILDER_DEPS:
+    from data.history_management import auto_api_history_builder
+    from data.history_management.auto_api_history_builder import RANGE_TASK, TODAY_TASK, ForecastArchiveAutomation
+
+TODAY = datetime.today().date()
+
+
+def _weather_json(city):
+    return {"name": city, "coord": {"lat": 1.0, "lon": 2.0}, "main": {"temp": 20.0}}
+
+
+class StubHistoricalAPI:
+    """fetch_historical_range_batch stand-in, the first batch finishes last"""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch_historical_range_batch(self, cities, start_date, end_date, cancel=None):
+        with self._lock:
+            first = not self.calls
+            self.calls.append((list(cities), start_date, end_date))
+        if first:
+            time.sleep(self.delay)
+        return {city: ({"city": city}, None) for city in cities}
+
+
+class StubWeatherAPI:
+
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.calls = []
+
+    def fetch_open_weather(self, city, bulk=False, cancel=None):
+        self.calls.append(city)
+        if city in self.fail:
+            return None, "Service unavailable"
+        return _weather_json(city), None
+
+
+@unittest.skipUnless(HAS_BUILDER_DEPS, "numpy/requests_cache/openmeteo_requests not installed")
+class TestPopulateHistory(unittest.TestCase):
+
+    def setUp(self):
+        for name in ("flush_history", "save_weather"):
+            patcher = patch.object(auto_api_history_builder, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _automation(self, cities, watermarks):
+        store = Mock()
+        store.top_searched.return_value = cities
+        archive = Mock()
+        archive.watermark.side_effect = lambda city: watermarks.get(city)
+        archive.has_day.return_value = False
+
+        automation = ForecastArchiveAutomation(store=store, archive=archive)
+        automation.get_user_favorites = lambda: []
+        automation.historical_api = StubHistoricalAPI()
+        automation.weather_api = StubWeatherAPI()
+        return automation
+
+    def test_cities_missing_the_same_span_share_a_task(self):
+        watermarks = {"Lima": TODAY - timedelta(days=3), "Quito": TODAY - timedelta(days=3), "Oslo": TODAY - timedelta(days=1)}
+        automation = self._automation(["Lima", "Quito", "Bogota", "Oslo"], watermarks)
+
+        self.assertEqual(automation._missing_spans(["Lima", "Quito", "Bogota", "Oslo"], TODAY), {
+            (TODAY - timedelta(days=2), TODAY - timedelta(days=1)): ["Lima", "Quito"],
+            (TODAY - timedelta(days=6), TODAY - timedelta(days=1)): ["Bogota"],
+        })
+        with patch.object(auto_api_history_builder, "MAX_BATCH_LOCATIONS", 1):
+            tasks = automation._history_tasks(["Lima", "Quito", "Bogota", "Oslo"], TODAY)
+        # Oldest span first, batches split at MAX_BATCH_LOCATIONS, then one today task per city
+        self.assertEqual(tasks, [
+            (RANGE_TASK, ["Bogota"], TODAY - timedelta(days=6), TODAY - timedelta(days=1)),
+            (RANGE_TASK, ["Lima"], TODAY - timedelta(days=2), TODAY - timedelta(days=1)),
+            (RANGE_TASK, ["Quito"], TODAY - timedelta(days=2), TODAY - timedelta(days=1)),
+            (TODAY_TASK, ["Lima"], TODAY, TODAY),
+            (TODAY_TASK, ["Quito"], TODAY, TODAY),
+            (TODAY_TASK, ["Bogota"], TODAY, TODAY),
+            (TODAY_TASK, ["Oslo"], TODAY, TODAY),
+        ])
+
+    def test_results_are_sorted_whatever_order_tasks_finish_in(self):
+        watermarks = {"Lima": TODAY - timedelta(days=3), "Quito": TODAY - timedelta(days=3)}
+        automation = self._automation(["Quito", "Lima", "Bogota"], watermarks)
+        automation.weather_api = StubWeatherAPI(fail=("Lima",))
+        progress = []
+
+        results = automation.populate_history(max_workers=4, progress=lambda *args: progress.append(args))
+
+        # The first range batch sleeps, so today's rows finish before it
+        self.assertEqual([args[2][0]["task"] for args in progress][-1], RANGE_TASK)
+        self.assertEqual([(result["task"], result["city"]) for result in results], [
+            (RANGE_TASK, "Bogota"), (RANGE_TASK, "Lima"), (RANGE_TASK, "Quito"),
+            (TODAY_TASK, "Bogota"), (TODAY_TASK, "Lima"), (TODAY_TASK, "Quito"),
+        ])
+        self.assertEqual([result["ok"] for result in results], [True, True, True, True, False, True])
+        self.assertEqual(results[4]["error"], "Service unavailable")
+        self.assertEqual(sorted(args[0] for args in progress), [1, 2, 3, 4, 5])
+        self.assertTrue(all(args[1] == 5 for args in progress))
+        self.assertEqual(automation.archive.write_columns.call_count, 3)
+
+    def test_stop_drops_the_remaining_tasks(self):
+        automation = self._automation(["Lima", "Quito"], {"Quito": TODAY - timedelta(days=2)})
+        stop = threading.Event()
+        historical_api = automation.historical_api
+        fetch = historical_api.fetch_historical_range_batch
+
+        def stop_during_fetch(*args, **kwargs):
+            stop.set()
+            return fetch(*args, **kwargs)
+
+        historical_api.fetch_historical_range_batch = stop_during_fetch
+        progress = []
+
+        results = automation.populate_history(max_workers=1, progress=lambda *args: progress.append(args), stop=stop)
+
+        self.assertEqual(len(progress), 1)
+        self.assertEqual(len(historical_api.calls), 1)
+        self.assertEqual(automation.weather_api.calls, [])
+        self.assertEqual([(result["task"], result["ok"]) for result in results], [(RANGE_TASK, True)])
+
+
+if __name__ == "__main__":
+    unittest.main()
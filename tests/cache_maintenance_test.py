@@ -0,0 +1,72 @@
+import importlib.util
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+HAS_REQUESTS_CACHE = importlib.util.find_spec("requests_cache") is not None
+
+if HAS_REQUESTS_CACHE:
+    from data.api_handlers.cache_maintenance import CacheMaintenance
+
+
+@unittest.skipUnless(HAS_REQUESTS_CACHE, "requests_cache not installed")
+class TestCacheMaintenance(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "cache.sqlite")
+        # The requests_cache tables maintenance touches
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("CREATE TABLE responses (key TEXT PRIMARY KEY, value BLOB, expires INTEGER)")
+            conn.execute("CREATE TABLE redirects (key TEXT PRIMARY KEY, value TEXT)")
+        conn.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _last_vacuum(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return CacheMaintenance.last_vacuum(conn)
+        finally:
+            conn.close()
+
+    def _run(self, **kwargs):
+        with patch("builtins.print"):
+            return CacheMaintenance(self.db_path, **kwargs).run()
+
+    def test_last_vacuum_survives_a_new_instance(self):
+        self._run()
+        first = self._last_vacuum()
+        self.assertGreater(first, 0)
+
+        # A fresh instance (next scheduler tick, app restart) must not vacuum again
+        self._run()
+        self.assertEqual(self._last_vacuum(), first)
+
+        self._run(vacuum_interval=0)
+        self.assertGreater(self._last_vacuum(), first)
+
+    def test_removes_long_expired_responses_only(self):
+        now = int(time.time())
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.executemany("INSERT INTO responses (key, value, expires) VALUES (?, ?, ?)", [
+                ("old", b"x", now - 10 * 24 * 3600),
+                ("stale", b"x", now - 60),
+                ("archive", b"x", None),
+            ])
+        conn.close()
+
+        summary = self._run()
+        self.assertEqual(summary['expired_removed'], 1)
+        self.assertEqual(summary['entries'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import importlib.util
+import socket
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from data.api_handlers.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, get_breaker
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def _tripped(self, **kwargs):
+        breaker = CircuitBreaker("test", min_calls=2, **kwargs)
+        breaker.record(False)
+        breaker.record(False)
+        return breaker
+
+    def test_closed_allows_calls(self):
+        breaker = CircuitBreaker("test")
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_opens_on_failure_rate(self):
+        breaker = self._tripped(open_seconds=60)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = CircuitBreaker("test", min_calls=2, slow_call_seconds=1)
+        breaker.record(True, latency=5)
+        breaker.record(True, latency=5)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = self._tripped(open_seconds=0)
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())
+
+    def test_successful_probe_closes(self):
+        breaker = self._tripped(open_seconds=0)
+        self.assertTrue(breaker.allow())
+        breaker.record(True)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        breaker = self._tripped(open_seconds=0)
+        self.assertTrue(breaker.allow())
+        breaker.record(False)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_released_probe_frees_the_slot(self):
+        breaker = self._tripped(open_seconds=0)
+        self.assertTrue(breaker.allow())
+        # Probe never reached the provider (rate limited)
+        breaker.release()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        breaker.record(True)
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_release_when_closed_is_a_no_op(self):
+        breaker = CircuitBreaker("test")
+        breaker.release()
+        self.assertEqual(breaker.status(), {'state': CLOSED, 'calls': 0, 'failures': 0})
+
+
+@unittest.skipUnless(importlib.util.find_spec("requests"), "requests not installed")
+class TestRateLimitedProbe(unittest.TestCase):
+
+    @patch.dict("os.environ", {"open_weather_key": "probe-test-key"})
+    def test_rate_limited_probe_does_not_block_the_key(self):
+        from data.api_handlers import open_weather_api
+        from data.api_handlers.rate_limiter import OPENWEATHER
+
+        breaker = get_breaker(OPENWEATHER, "probe-test-key")
+        breaker.open_seconds = 0
+        for _ in range(breaker.min_calls):
+            breaker.record(False)
+        self.assertEqual(breaker.state, OPEN)
+
+        limiter = Mock()
+        limiter.acquire.return_value = False
+        cache = Mock()
+        cache.get.return_value = None
+        with patch.object(open_weather_api, "get_rate_limiter", return_value=limiter), \
+                patch.object(open_weather_api, "get_current_weather_cache", return_value=cache):
+            data, error = open_weather_api.OpenWeatherAPI().fetch_open_weather("London", bulk=True)
+
+        self.assertIsNone(data)
+        self.assertIn("rate limit", error)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow())
+
+
+@unittest.skipUnless(importlib.util.find_spec("requests_cache"), "requests_cache not installed")
+class TestTimingOutProvider(unittest.TestCase):
+    """fetch_open_weather against a dead provider, through a session mounted like the OpenWeather host"""
+
+    def _fetch_until_open(self, url, counted):
+        import requests
+        from data.api_handlers import http_client, open_weather_api
+        from data.api_handlers.open_weather_api import OpenWeatherAPI
+        from data.api_handlers.rate_limiter import OPENWEATHER
+
+        prefix = url.rsplit("/", 1)[0]
+        with patch.dict(http_client.HOST_POOL_LIMITS, {prefix: 1}), \
+                patch.object(http_client, "FAILOVER_HOSTS", (prefix,)):
+            session = http_client._mount_adapters(requests.Session(), read_retries=False)
+        limiter = Mock()
+        limiter.acquire.return_value = True
+        cache = Mock()
+        cache.get.return_value = None
+        api_key = f"timeout-test-key-{prefix}"
+        breaker = get_breaker(OPENWEATHER, api_key)
+        api = OpenWeatherAPI()
+
+        with patch.dict("os.environ", {"open_weather_key": api_key, "open_weather_url": url}), \
+                patch.object(open_weather_api, "REQUEST_TIMEOUT", 0.2), \
+                patch.object(open_weather_api, "get_session", return_value=session), \
+                patch.object(open_weather_api, "get_rate_limiter", return_value=limiter), \
+                patch.object(open_weather_api, "get_current_weather_cache", return_value=cache), \
+                patch.object(OpenWeatherAPI, "_failover", side_effect=lambda city, error: (None, error)):
+            for attempt in range(breaker.min_calls):
+                started = time.monotonic()
+                data, error = api.fetch_open_weather("London")
+                # One attempt per search, bounded by REQUEST_TIMEOUT, no resends or backoff
+                self.assertLess(time.monotonic() - started, 0.6)
+                self.assertIsNone(data)
+                self.assertIsNotNone(error)
+                if counted:
+                    self.assertEqual(counted(), attempt + 1)
+
+            self.assertEqual(breaker.state, OPEN)
+            started = time.monotonic()
+            data, error = api.fetch_open_weather("London")
+            self.assertLess(time.monotonic() - started, 0.1)
+            if counted:
+                self.assertEqual(counted(), breaker.min_calls)
+        return error
+
+    def test_read_timeouts_cost_one_timeout_each_then_the_circuit_opens(self):
+        from tests.http_client_test import LocalServer
+
+        with LocalServer(delay=1.0) as server:
+            self._fetch_until_open(server.url, lambda: server.requests)
+
+    def test_refused_connections_are_not_retried(self):
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        port = listener.getsockname()[1]
+        listener.close()
+
+        self._fetch_until_open(f"http://127.0.0.1:{port}/weather", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from data.api_handlers import current_weather_cache
+from data.api_handlers.current_weather_cache import CurrentWeatherCache
+
+LIMA = (-12.04, -77.03)
+QUITO = (-0.23, -78.52)
+OSLO = (59.91, 10.75)
+
+
+class TestCurrentWeatherCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "current_weather.sqlite")
+        self.clock = Mock()
+        self.clock.time.return_value = 1000.0
+        patcher = patch.object(current_weather_cache, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = CurrentWeatherCache(self.db_path, ttl=600, memory_size=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _advance(self, seconds):
+        self.clock.time.return_value += seconds
+
+    def test_coordinates_key_on_two_decimals(self):
+        self.assertEqual(CurrentWeatherCache.location_key((51.50853, -0.12574)), "51.51,-0.13")
+        self.cache.put((51.50853, -0.12574), {"name": "London"})
+        self.assertEqual(self.cache.get((51.511, -0.126)), {"name": "London"})
+
+    def test_entries_expire_after_the_ttl_in_memory_and_on_disk(self):
+        self.cache.put(LIMA, {"name": "Lima"})
+        self._advance(599)
+        self.assertEqual(self.cache.get(LIMA), {"name": "Lima"})
+        self.cache.clear_memory()
+        self.assertEqual(self.cache.get(LIMA), {"name": "Lima"})
+
+        self._advance(1)
+        self.assertIsNone(self.cache.get(LIMA))
+        self.cache.clear_memory()
+        self.assertIsNone(self.cache.get(LIMA))
+
+    def test_put_drops_rows_past_their_ttl(self):
+        self.cache.put(LIMA, {"name": "Lima"})
+        self._advance(601)
+        self.cache.put(QUITO, {"name": "Quito"})
+
+        with sqlite3.connect(self.db_path) as conn:
+            locations = [row[0] for row in conn.execute("SELECT location FROM current_conditions")]
+        self.assertEqual(locations, [CurrentWeatherCache.location_key(QUITO)])
+
+    def test_memory_keeps_the_most_recently_used_entries(self):
+        self.cache.put(LIMA, {"name": "Lima"})
+        self.cache.put(QUITO, {"name": "Quito"})
+        self.cache.get(LIMA)
+        self.cache.put(OSLO, {"name": "Oslo"})
+
+        key = CurrentWeatherCache.location_key
+        self.assertEqual(list(self.cache._memory), [key(LIMA), key(OSLO)])
+        # Evicted from memory only, SQLite still serves it
+        self.assertEqual(self.cache.get(QUITO), {"name": "Quito"})
+        self.assertEqual(list(self.cache._memory), [key(OSLO), key(QUITO)])
+
+
+if __name__ == "__main__":
+    unittest.main()
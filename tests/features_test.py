@@ -1,70 +1,91 @@
-from features.weather_extract import parse_json
 import unittest
 from unittest.mock import patch, Mock
+from data.api_handlers import open_weather_api
 from data.api_handlers.open_weather_api import OpenWeatherAPI
 
+WEATHER_JSON = {
+    "name": "London",
+    "coord": {"lat": 51.5085, "lon": -0.1257},
+    "main": {"temp": 14.236, "temp_min": 12.1, "temp_max": 16.3},
+    "weather": [{"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}]
+}
+
+
+@patch.dict("os.environ", {"open_weather_key": "features-test-key"})
 class TestOpenWeatherAPI(unittest.TestCase):
 
-    @patch("weather.open_weather_api.requests.get")
-    def test_fetch_open_weather_success(self, mock_get):
+    def setUp(self):
+        # Calls go to a mock session, no cached conditions and no rate limit waits
+        self.session = Mock()
+        cache = Mock()
+        cache.get.return_value = None
+        limiter = Mock()
+        limiter.acquire.return_value = True
+        for name, value in (("get_session", self.session), ("get_current_weather_cache", cache), ("get_rate_limiter", limiter)):
+            patcher = patch.object(open_weather_api, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_fetch_open_weather_success(self):
         # Setup mock response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"weather": [{"main": "Clear"}]}
-        mock_get.return_value = mock_response
+        mock_response.json.return_value = WEATHER_JSON
+        self.session.get.return_value = mock_response
 
-        data, error = OpenWeatherAPI.fetch_open_weather("London")
+        data, error = OpenWeatherAPI().fetch_open_weather("London", bulk=True)
 
         self.assertIsNone(error)
         self.assertIsInstance(data, dict)
         self.assertIn("weather", data)
+        self.assertEqual(self.session.get.call_args.kwargs["params"]["q"], "London")
 
-    @patch("weather.open_weather_api.requests.get")
-    def test_fetch_open_weather_city_not_found(self, mock_get):
+    def test_fetch_open_weather_city_not_found(self):
         mock_response = Mock()
         mock_response.status_code = 404
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
-        data, error = OpenWeatherAPI.fetch_open_weather("InvalidCity")
+        data, error = OpenWeatherAPI().fetch_open_weather("InvalidCity", bulk=True)
 
         self.assertIsNone(data)
         self.assertIsNotNone(error)
-        self.assertIn("City InvalidCity not found", error)
+        self.assertIn("City 'InvalidCity' not found", error)
+
+    def test_fetch_open_weather_exception(self):
+        self.session.get.side_effect = Exception("Network error")
 
-    @patch("weather.open_weather_api.requests.get")
-    def test_fetch_open_weather_exception(self, mock_get):
-        mock_get.side_effect = Exception("Network error")
+        data, error = OpenWeatherAPI().fetch_open_weather("Paris", bulk=True)
+
+        self.assertIsNone(data)
+        self.assertEqual(error, "Unexpected error: Network error")
 
-        data, error = OpenWeatherAPI.fetch_open_weather("Paris")
+    def test_fetch_open_weather_empty_city(self):
+        data, error = OpenWeatherAPI().fetch_open_weather("  ")
 
         self.assertIsNone(data)
-        self.assertEqual(error, "Network error")
+        self.assertEqual(error, "City name cannot be empty")
+        self.session.get.assert_not_called()
 
-    @patch("weather.open_weather_api.requests.get")
-    def test_fetch_open_geo_success(self, mock_get):
+    def test_fetch_open_geo_success(self):
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = [{"name": "London", "lat": 51.51, "lon": -0.13}]
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
-        # patching select_city and api key logic internally would be needed to make this method work properly
-        data, error = OpenWeatherAPI.fetch_open_geo()
+        data, error = OpenWeatherAPI.fetch_open_geo("London")
 
         self.assertIsNone(error)
         self.assertIsInstance(data, list)
         self.assertEqual(data[0]["name"], "London")
 
-    @patch("weather.open_weather_api.requests.get")
-    def test_fetch_open_geo_exception(self, mock_get):
-        mock_get.side_effect = Exception("Geo lookup failed")
+    def test_fetch_open_geo_exception(self):
+        self.session.get.side_effect = Exception("Geo lookup failed")
 
-        data, error = OpenWeatherAPI.fetch_open_geo()
+        data, error = OpenWeatherAPI.fetch_open_geo("London")
 
         self.assertIsNone(data)
         self.assertEqual(error, "Geo lookup failed")
 
+
 if __name__ == "__main__":
     unittest.main()
-
-
-
@@ -0,0 +1,114 @@
+import importlib.util
+import threading
+import time
+import unittest
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+if HAS_NUMPY:
+    from data.history_management.file_handler import HistoryWriter
+
+    class RecordingWriter(HistoryWriter):
+        """HistoryWriter that keeps its batches instead of storing them"""
+
+        def __init__(self, **kwargs):
+            self.batches = []
+            self._batches_lock = threading.Lock()
+            super().__init__(**kwargs)
+
+        def _write_batch(self, batch):
+            with self._batches_lock:
+                self.batches.append({table: list(rows) for table, rows in batch.items()})
+
+        def rows(self, table="observations"):
+            with self._batches_lock:
+                return [row for batch in self.batches for row in batch.get(table, [])]
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestHistoryWriter(unittest.TestCase):
+
+    def _writer(self, **kwargs):
+        writer = RecordingWriter(**kwargs)
+        self.addCleanup(writer.close)
+        return writer
+
+    def test_rows_are_written_in_batches_of_flush_rows(self):
+        writer = self._writer(flush_rows=3, flush_seconds=60)
+        for i in range(7):
+            writer.submit("observations", i)
+        writer.submit("daily_history", "day")
+        writer.flush()
+
+        # One entry per table per batch, the partial batch goes out on flush()
+        self.assertEqual(writer.batches, [
+            {"observations": [0, 1, 2]},
+            {"observations": [3, 4, 5]},
+            {"observations": [6], "daily_history": ["day"]},
+        ])
+
+    def test_a_row_waits_at_most_flush_seconds(self):
+        writer = self._writer(flush_rows=100, flush_seconds=0.05)
+        writer.submit("observations", "row")
+
+        deadline = time.monotonic() + 2
+        while not writer.rows() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(writer.rows(), ["row"])
+
+    def test_flush_accounts_for_every_queued_item(self):
+        writer = self._writer(flush_rows=100, flush_seconds=60)
+        for i in range(5):
+            writer.submit("observations", i)
+        writer.flush()
+        writer.flush()      # nothing queued, returns straight away
+
+        self.assertEqual(writer.rows(), [0, 1, 2, 3, 4])
+        self.assertEqual(writer._queue.unfinished_tasks, 0)
+
+    def test_close_drains_the_queue_then_writes_directly(self):
+        writer = self._writer(flush_rows=100, flush_seconds=60)
+        for i in range(5):
+            writer.submit("observations", i)
+        writer.close()
+
+        self.assertFalse(writer._thread.is_alive())
+        self.assertEqual(writer.rows(), [0, 1, 2, 3, 4])
+        writer.submit("observations", 5)
+        writer.flush()
+        self.assertEqual(writer.rows(), [0, 1, 2, 3, 4, 5])
+
+    def test_concurrent_submits_racing_close_lose_no_rows(self):
+        writer = self._writer(flush_rows=10, flush_seconds=60)
+        start = threading.Barrier(9)
+        put = writer._queue.put
+
+        def slow_put(item, *args, **kwargs):
+            # Widen the window between submit()'s closed check and the put
+            if isinstance(item, tuple):
+                time.sleep(0.001)
+            put(item, *args, **kwargs)
+
+        writer._queue.put = slow_put
+
+        def submit_rows(thread):
+            start.wait()
+            for i in range(500):
+                writer.submit("observations", (thread, i))
+
+        threads = [threading.Thread(target=submit_rows, args=(thread,)) for thread in range(8)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        time.sleep(0.05)    # close while rows are still being submitted
+        writer.close()
+        for thread in threads:
+            thread.join(5)
+
+        # Every row written exactly once, queued before _STOP or written directly after it
+        self.assertEqual(sorted(writer.rows()), sorted((thread, i) for thread in range(8) for i in range(500)))
+        self.assertTrue(writer._queue.empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from data.gazetteer.gazetteer import Gazetteer, normalize_name
+
+CITIES = """name,alternate_names,country_code,admin1,latitude,longitude,population
+Portland,,US,Oregon,45.5234,-122.6762,652503
+Portland,,US,Maine,43.6591,-70.2568,68408
+Paris,Paree,FR,Île-de-France,48.8534,2.3488,2138551
+Paris,,US,Texas,33.6609,-95.5555,24782
+Parma,,IT,Emilia-Romagna,44.8015,10.3279,175895
+Cádiz,Cadiz,ES,Andalusia,36.5271,-6.2886,116979
+San Roque,,ES,Andalusia,36.2108,-5.3845,30516
+"""
+
+
+class TestGazetteer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(cls.tmp_dir, "cities.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(CITIES)
+        cls.gazetteer = Gazetteer(cities_path=path, geonames_path=None)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    def _where(self, place):
+        return (place['name'], place['country_code'], place['admin1'])
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("  CÁDIZ "), "cadiz")
+        self.assertEqual(normalize_name("St.  Louis"), "st louis")
+
+    def test_resolve_bare_name_picks_the_most_populous(self):
+        self.assertEqual(self._where(self.gazetteer.resolve("paris")), ("Paris", "FR", "Île-de-France"))
+        self.assertEqual(self._where(self.gazetteer.resolve("Portland")), ("Portland", "US", "Oregon"))
+
+    def test_resolve_name_and_country_code(self):
+        self.assertEqual(self._where(self.gazetteer.resolve("Paris, US")), ("Paris", "US", "Texas"))
+        self.assertEqual(self._where(self.gazetteer.resolve("paris,fr")), ("Paris", "FR", "Île-de-France"))
+
+    def test_resolve_name_and_region(self):
+        self.assertEqual(self._where(self.gazetteer.resolve("Portland, Maine")), ("Portland", "US", "Maine"))
+        self.assertEqual(self._where(self.gazetteer.resolve("Paris, Ile-de-France")), ("Paris", "FR", "Île-de-France"))
+
+    def test_resolve_accents_and_alternate_names(self):
+        self.assertEqual(self.gazetteer.resolve("cadiz")['name'], "Cádiz")
+        self.assertEqual(self.gazetteer.resolve("Paree")['name'], "Paris")
+
+    def test_resolve_misses(self):
+        self.assertIsNone(self.gazetteer.resolve("Atlantis"))
+        self.assertIsNone(self.gazetteer.resolve("Paris, DE"))
+        self.assertIsNone(self.gazetteer.resolve("  "))
+
+    def test_complete_prefix_most_populous_first(self):
+        names = [self._where(place) for place in self.gazetteer.complete("Par")]
+        self.assertEqual(names, [("Paris", "FR", "Île-de-France"), ("Parma", "IT", "Emilia-Romagna"), ("Paris", "US", "Texas")])
+        self.assertEqual(len(self.gazetteer.complete("p", limit=2)), 2)
+        self.assertEqual([place['name'] for place in self.gazetteer.complete("SAN R")], ["San Roque"])
+
+    def test_complete_no_match(self):
+        self.assertEqual(self.gazetteer.complete("Zz"), [])
+        self.assertEqual(self.gazetteer.complete(""), [])
+
+    def test_fuzzy_trigram_suggestions(self):
+        self.assertEqual([place['name'] for place in self.gazetteer.fuzzy("Portlnd")], ["Portland"])
+        self.assertEqual(self.gazetteer.fuzzy("Qwerty"), [])
+
+    def test_query_name_resolves_back_to_the_place(self):
+        for place in self.gazetteer.places:
+            self.assertIs(self.gazetteer.resolve(self.gazetteer.query_name(place)), place)
+        maine = self.gazetteer.resolve("Portland, Maine")
+        self.assertEqual(self.gazetteer.query_name(maine), "Portland, Maine")
+        self.assertEqual(self.gazetteer.query_name(self.gazetteer.resolve("Paris, US")), "Paris, US")
+
+
+if __name__ == "__main__":
+    unittest.main()
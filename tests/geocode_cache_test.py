@@ -0,0 +1,74 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+HAS_REQUESTS_CACHE = importlib.util.find_spec("requests_cache") is not None
+
+if HAS_REQUESTS_CACHE:
+    from data.api_handlers import geocode_cache
+    from data.api_handlers.geocode_cache import GeocodeCache
+
+
+@unittest.skipUnless(HAS_REQUESTS_CACHE, "requests_cache not installed")
+class TestGeocodeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.clock = Mock()
+        self.clock.time.return_value = 1000.0
+        patcher = patch.object(geocode_cache, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = GeocodeCache(os.path.join(self.tmp_dir, "geocode.sqlite"), ttl=100, not_found_ttl=10, memory_size=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _advance(self, seconds):
+        self.clock.time.return_value += seconds
+
+    def test_names_share_an_entry_however_they_are_typed(self):
+        self.assertIsNone(self.cache.get("New York"))
+        self.cache.put("New York", 40.71, -74.01)
+        self.assertEqual(self.cache.get("  new   YORK "), (40.71, -74.01))
+        self.assertIsNone(self.cache.get("New York", language="de"))
+
+    def test_entries_expire_after_the_ttl_in_memory_and_on_disk(self):
+        self.cache.put("Lima", -12.04, -77.03)
+        self._advance(99)
+        self.assertEqual(self.cache.get("Lima"), (-12.04, -77.03))
+        self.cache.clear_memory()
+        self.assertEqual(self.cache.get("Lima"), (-12.04, -77.03))
+
+        self._advance(1)
+        self.assertIsNone(self.cache.get("Lima"))
+        self.cache.clear_memory()
+        self.assertIsNone(self.cache.get("Lima"))
+
+    def test_not_found_is_cached_for_the_shorter_ttl(self):
+        self.cache.put("Atlantis", None, None)
+        self._advance(9)
+        self.assertEqual(self.cache.get("Atlantis"), (None, None))
+        self.cache.clear_memory()
+        self.assertEqual(self.cache.get("Atlantis"), (None, None))
+
+        self._advance(1)
+        self.assertIsNone(self.cache.get("Atlantis"))
+
+    def test_memory_keeps_the_most_recently_used_entries(self):
+        self.cache.put("Lima", -12.04, -77.03)
+        self.cache.put("Quito", -0.23, -78.52)
+        self.cache.get("Lima")
+        self.cache.put("Oslo", 59.91, 10.75)
+
+        self.assertEqual(list(self.cache._memory), [("lima", "en"), ("oslo", "en")])
+        # Evicted from memory only, SQLite still serves it
+        self.assertEqual(self.cache.get("Quito"), (-0.23, -78.52))
+        self.assertEqual(list(self.cache._memory), [("oslo", "en"), ("quito", "en")])
+
+
+if __name__ == "__main__":
+    unittest.main()
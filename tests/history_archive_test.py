@@ -0,0 +1,156 @@
+import importlib.util
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+HAS_ARCHIVE_DEPS = all(importlib.util.find_spec(name) for name in ("numpy", "requests_cache"))
+
+if HAS_ARCHIVE_DEPS:
+    import numpy as np
+    from data.api_handlers.cache_policy import ARCHIVE_SETTLE_DAYS
+    from data.history_management.history_archive import HistoryArchive, city_slug
+
+
+def _complete(values):
+    """Every temperature column set, so the rows count towards the watermark"""
+    return {"temp_min": values, "temp_max": values, "temp_mean": values}
+
+
+def _write_days(root, city, first_day, days):
+    """Process target: one row per day, temperatures = day of month"""
+    archive = HistoryArchive(root)
+    for offset in range(days):
+        day = np.datetime64(first_day) + offset
+        archive.write(city, [day], _complete([int(str(day)[-2:])]))
+
+
+@unittest.skipUnless(HAS_ARCHIVE_DEPS, "numpy or requests_cache not installed")
+class TestHistoryArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.archive = HistoryArchive(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_merge_deduplicates_later_write_wins(self):
+        self.archive.write("Lima", ["2025-07-01", "2025-07-02"], {"temp_max": [20, 21]})
+        self.archive.write("lima", ["2025-07-02", "2025-07-03"], {"temp_max": [99, 23]})
+
+        result = self.archive.read("Lima")
+        self.assertEqual([str(day) for day in result.dates()], ["2025-07-01", "2025-07-02", "2025-07-03"])
+        self.assertEqual(result["temp_max"].tolist(), [20, 99, 23])
+        # Columns missing from a write are NaN, not zero
+        self.assertTrue(np.isnan(result["temp_min"]).all())
+
+    def test_rows_are_sorted_whatever_the_write_order(self):
+        self.archive.write("Lima", ["2025-07-05", "2025-07-01", "2025-07-03"], {"temp_max": [5, 1, 3]})
+        self.assertEqual(self.archive.read("Lima")["temp_max"].tolist(), [1, 3, 5])
+
+    def test_read_between_dates_across_months(self):
+        days = np.arange(np.datetime64("2025-06-25"), np.datetime64("2025-08-05"))
+        self.archive.write("Quito", days, {"temp_min": np.arange(len(days))}, {"lat": -0.2, "lon": -78.5})
+
+        self.assertEqual(self.archive.partitions("Quito", "2025-07-10", "2025-07-20"), ["2025-07"])
+        self.assertEqual(self.archive.partitions("Quito"), ["2025-06", "2025-07", "2025-08"])
+
+        result = self.archive.read("Quito", date(2025, 6, 29), date(2025, 7, 2))
+        self.assertEqual([str(day) for day in result.dates()], ["2025-06-29", "2025-06-30", "2025-07-01", "2025-07-02"])
+        self.assertEqual(result.coord, {"lat": -0.2, "lon": -78.5})
+        self.assertEqual(result.city, "Quito")
+
+    def test_read_unknown_city(self):
+        self.assertIsNone(self.archive.read("Nowhere"))
+
+    def test_write_rows_skips_rows_without_a_date(self):
+        self.archive.write_rows([
+            {"city": "Lebrija", "date": "2025-07-01", "temp_max": "30.5", "latitude": "36.9", "longitude": "-6.07"},
+            {"city": "Lebrija", "date": "N/A", "temp_max": "31"},
+        ])
+        result = self.archive.read("Lebrija")
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(float(result["temp_max"][0]), 30.5)
+
+    def test_watermark_advances_and_never_goes_back(self):
+        self.assertIsNone(self.archive.watermark("Lima"))
+        self.archive.write("Lima", ["2025-07-01", "2025-07-02"], _complete([1, 2]))
+        self.assertEqual(self.archive.watermark("LIMA"), date(2025, 7, 2))
+        self.archive.write("Lima", ["2025-07-01"], _complete([9]))
+        self.assertEqual(self.archive.watermark("Lima"), date(2025, 7, 2))
+        self.assertEqual(self.archive.last_date(), date(2025, 7, 2))
+
+    def test_watermark_stops_at_a_gap_until_it_is_filled(self):
+        self.archive.write("Lima", ["2025-07-01", "2025-07-02"], _complete([1, 2]))
+        # A failed range leaves 07-03..07-04 out, a later row must not jump over them
+        self.archive.write("Lima", ["2025-07-05"], _complete([5]))
+        self.assertEqual(self.archive.watermark("Lima"), date(2025, 7, 2))
+
+        self.archive.write("Lima", ["2025-07-03", "2025-07-04"], _complete([3, 4]))
+        self.assertEqual(self.archive.watermark("Lima"), date(2025, 7, 5))
+
+    def test_watermark_stops_at_a_missing_month(self):
+        self.archive.write("Lima", ["2025-06-30"], _complete([30]))
+        self.archive.write("Lima", ["2025-08-01"], _complete([1]))
+        self.assertEqual(self.archive.watermark("Lima"), date(2025, 6, 30))
+
+    def test_watermark_stops_at_nan_rows(self):
+        self.archive.write("Lima", ["2025-07-01", "2025-07-02", "2025-07-03"],
+                           {"temp_min": [1, np.nan, 3], "temp_max": [1, 2, 3], "temp_mean": [1, 2, 3]})
+        self.assertEqual(self.archive.watermark("Lima"), date(2025, 7, 1))
+
+        self.archive.write("Lima", ["2025-07-02"], _complete([2]))
+        self.assertEqual(self.archive.watermark("Lima"), date(2025, 7, 3))
+
+    def test_watermark_skips_days_inside_the_settle_window(self):
+        today = np.datetime64(date.today(), "D")
+        days = np.arange(today - ARCHIVE_SETTLE_DAYS - 2, today + 1)
+        self.archive.write("Lima", days, _complete(np.ones(len(days))))
+
+        self.assertEqual(self.archive.watermark("Lima"), date.today() - timedelta(days=ARCHIVE_SETTLE_DAYS))
+        self.assertTrue(self.archive.has_day("Lima", date.today()))
+
+    def test_rebuild_watermarks(self):
+        self.archive.write("Lima", ["2025-07-09", "2025-07-10"], _complete([1, 1]))
+        self.archive.write("Lima", ["2025-07-12"], _complete([1]))
+        self.archive.write("San Roque", ["2025-08-02"], _complete([1]))
+        self.archive.write("Quito", ["2025-08-02"], {"temp_max": [1]})
+        os.remove(self.archive.watermarks_path)
+
+        self.assertEqual(self.archive.rebuild_watermarks(), {"lima": "2025-07-10", "san_roque": "2025-08-02"})
+        self.assertEqual(self.archive.watermark("san roque"), date(2025, 8, 2))
+        self.assertIsNone(self.archive.watermark("Quito"))
+        self.assertTrue(os.path.exists(self.archive.watermarks_path))
+
+    def test_no_temp_files_left_behind(self):
+        self.archive.write("Lima", ["2025-07-10"], {"temp_max": [1]})
+        leftovers = [name for _, _, files in os.walk(self.root) for name in files if name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+
+    def test_concurrent_processes_keep_every_row(self):
+        context = multiprocessing.get_context("spawn")
+        writers = [
+            context.Process(target=_write_days, args=(self.root, "Lima", "2025-07-01", 10)),
+            context.Process(target=_write_days, args=(self.root, "Lima", "2025-07-11", 10)),
+        ]
+        for process in writers:
+            process.start()
+        for process in writers:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+
+        result = self.archive.read("Lima")
+        self.assertEqual(len(result), 20)
+        self.assertEqual(result["temp_max"].tolist(), list(range(1, 21)))
+        self.assertEqual(self.archive.watermark("Lima"), date(2025, 7, 20))
+
+    def test_city_slug(self):
+        self.assertEqual(city_slug("  San Roque "), "san_roque")
+        self.assertEqual(city_slug("Cádiz"), "cádiz")
+
+
+if __name__ == "__main__":
+    unittest.main()
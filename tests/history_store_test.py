@@ -0,0 +1,91 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from data.history_management.history_store import SEARCH_HALF_LIFE_DAYS, HistoryStore, _search_weight
+
+
+def _search(city, timestamp):
+    return {"timestamp": timestamp, "date": timestamp[:10], "city": city, "temp_max": 20}
+
+
+class TestHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = HistoryStore(os.path.join(self.tmp_dir, "history.sqlite"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _counts(self):
+        rows = self.store._connection().execute("SELECT city, searches, last_searched FROM search_counts ORDER BY city")
+        return [tuple(row) for row in rows]
+
+    def test_search_counts_upsert_per_city_case_insensitive(self):
+        self.store.add_observations([
+            _search("Lima", "2025-07-01 10:00"),
+            _search("lima", "2025-07-03 09:00"),
+            _search("Quito", "2025-07-02 08:00"),
+        ])
+        self.store.add_observations([_search("LIMA", "2025-07-02 12:00")])
+
+        self.assertEqual(self._counts(), [("Lima", 3, "2025-07-03 09:00"), ("Quito", 1, "2025-07-02 08:00")])
+
+    def test_top_searched_defaults_to_all_time_counts(self):
+        old = [_search("Lima", "2025-01-01 10:00") for _ in range(3)]
+        new = [_search("Quito", "2025-12-01 10:00") for _ in range(2)]
+        self.store.add_observations(old + new + [_search("Cusco", "2025-06-01 10:00")])
+
+        self.assertEqual(self.store.top_searched(), ["Lima", "Quito", "Cusco"])
+        self.assertEqual(self.store.top_searched(limit=1), ["Lima"])
+        # Eleven months of half lives: two recent searches outweigh three old ones
+        self.assertEqual(self.store.top_searched(recent=True), ["Quito", "Cusco", "Lima"])
+
+    def test_search_weight_doubles_every_half_life(self):
+        self.assertAlmostEqual(_search_weight("2025-01-01 00:00"), 1.0)
+        later = f"2025-01-{1 + SEARCH_HALF_LIFE_DAYS:02d} 00:00"
+        self.assertAlmostEqual(_search_weight(later), 2.0)
+
+    def test_migrate_search_counts_counts_the_log_once(self):
+        self.store.add_observations([_search("Lima", "2025-07-01 10:00"), _search("Quito", "2025-07-01 11:00")])
+        # A search log written before search_counts existed
+        self.store._connection().execute("DELETE FROM search_counts")
+        self.store._connection().commit()
+
+        self.store.migrate_search_counts()
+        self.store.migrate_search_counts()
+        self.assertEqual(self._counts(), [("Lima", 1, "2025-07-01 10:00"), ("Quito", 1, "2025-07-01 11:00")])
+
+    def test_migrate_csv_feeds_search_counts(self):
+        csv_path = os.path.join(self.tmp_dir, "weather_history.csv")
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["timestamp", "city", "temp_max"])
+            writer.writeheader()
+            writer.writerows([
+                {"timestamp": "2025-07-01 10:00", "city": "Lima", "temp_max": "N/A"},
+                {"timestamp": "2025-07-02 10:00", "city": "Lima", "temp_max": "21"},
+            ])
+
+        self.store.migrate_csv(csv_path)
+        self.store.migrate_csv(csv_path)
+        self.assertEqual(self.store.top_searched(), ["Lima"])
+        self.assertEqual(self._counts(), [("Lima", 2, "2025-07-02 10:00")])
+        self.assertEqual([row["temp_max"] for row in self.store.observations("Lima")], [None, 21])
+
+    def test_migrate_csv_skips_reading_once_imported(self):
+        csv_path = os.path.join(self.tmp_dir, "weather_history.csv")
+        with open(csv_path, "w", newline="") as f:
+            f.write("timestamp,city\n2025-07-01 10:00,Lima\n")
+        self.store.migrate_csv(csv_path)
+
+        with patch("builtins.open", side_effect=AssertionError("CSV read after import")):
+            self.store.migrate_csv(csv_path)
+        self.assertEqual(self._counts(), [("Lima", 1, "2025-07-01 10:00")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import importlib.util
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HAS_REQUESTS_CACHE = importlib.util.find_spec("requests_cache") is not None
+
+if HAS_REQUESTS_CACHE:
+    import requests
+    from data.api_handlers.http_client import _mount_adapters
+
+
+class LocalServer:
+    """Local HTTP server: every GET sleeps delay seconds, then answers status. Counts the requests"""
+
+    def __init__(self, delay=0.0, status=200):
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                time.sleep(delay)
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", "2")
+                    self.end_headers()
+                    self.wfile.write(b"{}")
+                except OSError:
+                    pass    # client gave up
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/weather"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@unittest.skipUnless(HAS_REQUESTS_CACHE, "requests_cache not installed")
+class TestRetryPolicy(unittest.TestCase):
+
+    def _session(self, read_retries):
+        session = _mount_adapters(requests.Session(), read_retries=read_retries)
+        self.addCleanup(session.close)
+        return session
+
+    def test_read_timeout_is_not_resent(self):
+        with LocalServer(delay=1.0) as server:
+            started = time.monotonic()
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                self._session(read_retries=False).get(server.url, timeout=0.2)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(server.requests, 1)
+        self.assertLess(elapsed, 0.9)
+
+    def test_read_retries_resend_when_enabled(self):
+        with LocalServer(delay=0.5) as server:
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self._session(read_retries=True).get(server.url, timeout=0.1)
+        self.assertEqual(server.requests, 4)
+
+    def test_server_errors_are_still_retried(self):
+        with LocalServer(status=503) as server:
+            response = self._session(read_retries=False).get(server.url, timeout=2)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(server.requests, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+HAS_GUI = all(importlib.util.find_spec(name) for name in ("customtkinter", "PIL", "tkintermapview", "pandas", "matplotlib"))
+
+if HAS_GUI:
+    from gui.pages import icon_cache
+    from gui.pages.icon_cache import WeatherIconCache
+
+
+@unittest.skipUnless(HAS_GUI, "GUI dependencies not installed")
+class TestWeatherIconCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = WeatherIconCache(os.path.join(self.tmp_dir, "icons"))
+        # Downloads block until the test releases them, and are counted
+        self.release = threading.Event()
+        self.downloads = []
+        response = Mock(status_code=200, content=b"png")
+
+        def get(url, timeout):
+            self.downloads.append(url)
+            self.release.wait(5)
+            return response
+
+        session = Mock()
+        session.get.side_effect = get
+        patcher = patch.object(icon_cache, "get_session", return_value=session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.release.set()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_fetch_leaves_only_the_icon_behind(self):
+        self.release.set()
+        self.assertTrue(self.cache.fetch("01d"))
+        self.assertEqual(os.listdir(self.cache.icon_dir), ["01d@2x.png"])
+
+    def test_prefetch_and_fetch_async_share_one_download(self):
+        ready = threading.Event()
+        self.cache.prefetch(["01d"])
+        self.cache.fetch_async("01d", on_ready=ready.set)
+        self.release.set()
+
+        self.assertTrue(ready.wait(5))
+        self.assertEqual(len(self.downloads), 1)
+        self.assertEqual(os.listdir(self.cache.icon_dir), ["01d@2x.png"])
+
+
+if __name__ == "__main__":
+    unittest.main()
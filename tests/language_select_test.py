@@ -0,0 +1,33 @@
+import unittest
+from unittest.mock import patch
+
+from features import language_select
+from features.language_select import TRANSLATION, translate_condition
+
+
+class TestTranslateCondition(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.object(language_select, "selected_language", "es")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_condition_in_the_selected_language(self):
+        self.assertEqual(translate_condition(800, "clear sky"), "cielo claro")
+
+    def test_missing_translation_falls_back_to_english(self):
+        with patch.dict(TRANSLATION["es"]):
+            del TRANSLATION["es"]["condition_500"]
+            self.assertEqual(translate_condition(500, "API text"), "light rain")
+
+    def test_unknown_condition_falls_back_to_the_api_text(self):
+        self.assertEqual(translate_condition(999, "API text"), "API text")
+        self.assertEqual(translate_condition(None), "")
+
+    def test_unknown_language_uses_english(self):
+        with patch.object(language_select, "selected_language", "fr"):
+            self.assertEqual(translate_condition(800, "ciel dégagé"), "clear sky")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import importlib.util
+import unittest
+from datetime import date
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+if HAS_NUMPY:
+    import numpy as np
+    from data.api_handlers.meteo_columns import MeteoColumns
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestMeteoColumns(unittest.TestCase):
+
+    def setUp(self):
+        # Five days from 2025-07-01, 2025-07-03 missing
+        time = np.arange("2025-07-01", "2025-07-06", dtype="datetime64[D]")
+        temp_max = np.array([20.5, 21.25, np.nan, 23.0, 24.0], dtype=np.float32)
+        self.columns = MeteoColumns(time, {"temperature_2m_max": temp_max}, city="Lima")
+
+    def test_index_of(self):
+        self.assertEqual(self.columns.index_of(date(2025, 7, 1)), 0)
+        self.assertEqual(self.columns.index_of("2025-07-05"), 4)
+        self.assertIsNone(self.columns.index_of(date(2025, 6, 30)))
+        self.assertIsNone(self.columns.index_of(date(2025, 7, 6)))
+
+    def test_between_is_inclusive_and_returns_views(self):
+        span = self.columns.between(date(2025, 7, 2), date(2025, 7, 4))
+
+        self.assertEqual(span.dates(), [date(2025, 7, 2), date(2025, 7, 3), date(2025, 7, 4)])
+        self.assertEqual(span.city, "Lima")
+        self.assertTrue(np.shares_memory(span["temperature_2m_max"], self.columns["temperature_2m_max"]))
+        self.assertEqual(len(self.columns.between(date(2025, 6, 1), date(2025, 6, 30))), 0)
+        self.assertEqual(len(self.columns.between(date(2025, 6, 1), date(2025, 12, 31))), 5)
+
+    def test_value_is_a_python_float_or_none_for_nan(self):
+        self.assertEqual(self.columns.value("temperature_2m_max", 1), 21.25)
+        self.assertIsInstance(self.columns.value("temperature_2m_max", 1), float)
+        self.assertEqual(self.columns.value("temperature_2m_max", 1, places=1), 21.2)
+        self.assertIsNone(self.columns.value("temperature_2m_max", 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import importlib.util
+import unittest
+from datetime import date
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+if HAS_NUMPY:
+    import numpy as np
+    from data.api_handlers.meteo_query import ARCHIVE_URL, FORECAST_URL, MeteoQuery
+
+
+class StubVariable:
+
+    def __init__(self, values):
+        self.values = np.array(values, dtype=np.float32)
+
+    def ValuesAsNumpy(self):
+        return self.values
+
+    def ValuesInt64Length(self):
+        return 0
+
+
+class StubSection:
+    """Daily() section of a FlatBuffers response, days from 2025-07-01"""
+
+    def __init__(self, *variables):
+        self.variables = [StubVariable(values) for values in variables]
+
+    def VariablesLength(self):
+        return len(self.variables)
+
+    def Variables(self, i):
+        return self.variables[i]
+
+    def Interval(self):
+        return 86400
+
+    def Time(self):
+        return int(np.datetime64("2025-07-01", "s").astype(np.int64))
+
+    def TimeEnd(self):
+        return self.Time() + 86400 * len(self.variables[0].values)
+
+
+class StubResponse:
+
+    def __init__(self, daily):
+        self.daily = daily
+
+    def Daily(self):
+        return self.daily
+
+    def Hourly(self):
+        return None
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestMeteoQuery(unittest.TestCase):
+
+    def test_forecast_params(self):
+        query = MeteoQuery.forecast(daily=["temperature_2m_max", "weather_code", "temperature_2m_max"],
+                                    hourly=["wind_speed_10m"], forecast_days=3)
+
+        self.assertEqual(query.url, FORECAST_URL)
+        self.assertEqual(query.params(), {
+            "daily": ["temperature_2m_max", "weather_code"],
+            "hourly": ["wind_speed_10m"],
+            "forecast_days": 3,
+        })
+
+    def test_archive_params(self):
+        query = MeteoQuery.archive(date(2025, 7, 1), date(2025, 7, 7), daily=["temperature_2m_mean"])
+
+        self.assertEqual(query.url, ARCHIVE_URL)
+        self.assertEqual(query.sections(), ["daily"])
+        self.assertEqual(query.params(), {
+            "daily": ["temperature_2m_mean"],
+            "start_date": "2025-07-01",
+            "end_date": "2025-07-07",
+        })
+
+    def test_needs_at_least_one_variable(self):
+        with self.assertRaises(ValueError):
+            MeteoQuery.forecast()
+
+    def test_decode_maps_variables_in_request_order(self):
+        query = MeteoQuery.forecast(daily=["temperature_2m_max", "temperature_2m_min"])
+        result = query.decode(StubResponse(StubSection([20, 21], [10, 11])), city_name="Lima", lat=-12.04, lon=-77.03)
+
+        daily = result["daily"]
+        self.assertEqual(daily.dates(), [date(2025, 7, 1), date(2025, 7, 2)])
+        self.assertEqual(daily.value("temperature_2m_min", 1), 11)
+        self.assertEqual(daily.coord, {"lat": -12.04, "lon": -77.03})
+
+    def test_decode_rejects_a_variable_count_mismatch(self):
+        query = MeteoQuery.forecast(daily=["temperature_2m_max", "temperature_2m_min"])
+
+        with self.assertRaisesRegex(ValueError, "Expected 2 variables, response has 1"):
+            query.decode(StubResponse(StubSection([20, 21])))
+
+
+if __name__ == "__main__":
+    unittest.main()
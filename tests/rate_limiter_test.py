@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from data.api_handlers import rate_limiter
+from data.api_handlers.rate_limiter import OPENWEATHER, QuotaCounter, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Stands in for time.monotonic/time.sleep, sleeping just moves the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FakeDate(date):
+    """date.today() that a test can move past midnight"""
+    current = date(2025, 7, 1)
+
+    @classmethod
+    def today(cls):
+        return cls.current
+
+
+class ClockTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch.object(rate_limiter, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestTokenBucket(ClockTestCase):
+
+    def test_starts_full_then_refills_at_rate(self):
+        bucket = TokenBucket(rate=2, capacity=4)
+        for _ in range(4):
+            self.assertEqual(bucket.try_acquire(), 0)
+        self.assertAlmostEqual(bucket.try_acquire(), 0.5)
+
+        self.clock.now += 1
+        self.assertEqual(bucket.try_acquire(2), 0)
+        self.assertGreater(bucket.try_acquire(), 0)
+
+    def test_refill_stops_at_capacity(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        bucket.try_acquire(3)
+        self.clock.now += 3600
+        self.assertEqual(bucket.try_acquire(3), 0)
+        self.assertAlmostEqual(bucket.try_acquire(), 1)
+
+    def test_acquire_waits_for_the_refill(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.try_acquire()
+        self.assertTrue(bucket.acquire())
+        self.assertEqual(self.clock.slept, [1])
+
+    def test_acquire_gives_up_when_the_wait_exceeds_timeout(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.try_acquire()
+        self.assertFalse(bucket.acquire(timeout=0.5))
+        # Gave up without sleeping, the slot would only free up after the deadline
+        self.assertEqual(self.clock.slept, [])
+        self.assertTrue(bucket.acquire(timeout=1))
+
+    def test_acquire_returns_when_cancelled(self):
+        bucket = TokenBucket(rate=1 / 3600, capacity=1)
+        bucket.try_acquire()
+        cancel = threading.Event()
+        cancel.set()
+        self.assertFalse(bucket.acquire(cancel=cancel))
+        self.assertEqual(self.clock.slept, [])
+
+
+class TestQuotaCounter(ClockTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "quota.json")
+        FakeDate.current = date(2025, 7, 1)
+        patcher = patch.object(rate_limiter, "date", FakeDate)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_counts_roll_over_at_midnight(self):
+        quota = QuotaCounter(self.path)
+        quota.add("openweather:key", 5)
+        self.assertEqual(quota.used("openweather:key"), 5)
+
+        FakeDate.current = date(2025, 7, 2)
+        self.assertEqual(quota.used("openweather:key"), 0)
+        quota.add("openweather:key")
+        self.assertEqual(quota.snapshot(), {"openweather:key": 1})
+
+    def test_counts_survive_a_restart_on_the_same_day_only(self):
+        quota = QuotaCounter(self.path)
+        quota.add("openweather:key", 3)
+        quota.save()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"date": "2025-07-01", "counts": {"openweather:key": 3}})
+
+        self.assertEqual(QuotaCounter(self.path).used("openweather:key"), 3)
+        FakeDate.current = date(2025, 7, 2)
+        self.assertEqual(QuotaCounter(self.path).used("openweather:key"), 0)
+
+
+class TestRateLimiter(ClockTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        limits = {OPENWEATHER: {"per_minute": 60, "per_day": 3}}
+        self.limiter = RateLimiter(limits, os.path.join(self.tmp_dir, "quota.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_acquire_times_out_when_no_slot_frees_up(self):
+        for _ in range(60):
+            self.assertTrue(self.limiter.acquire(OPENWEATHER, "key", timeout=0))
+        self.assertFalse(self.limiter.acquire(OPENWEATHER, "key", timeout=0.5))
+        # Each key has its own bucket
+        self.assertTrue(self.limiter.acquire(OPENWEATHER, "other-key", timeout=0))
+        # Bulk callers wait instead
+        self.assertTrue(self.limiter.acquire(OPENWEATHER, "key", timeout=None))
+        self.assertEqual(self.clock.slept, [1])
+
+    def test_acquire_fails_once_the_daily_quota_is_spent(self):
+        self.limiter.record(OPENWEATHER, "key", 3)
+        self.assertEqual(self.limiter.remaining(OPENWEATHER, "key"), 0)
+        self.assertFalse(self.limiter.acquire(OPENWEATHER, "key", timeout=None))
+        self.assertEqual(self.clock.slept, [])
+
+
+if __name__ == "__main__":
+    unittest.main()